@@ -0,0 +1,336 @@
+"""
+============================================================
+  async_driver.py
+  Optional asyncio WebDriver backend with a shared
+  keep-alive connection pool to the hub
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Selenium's RemoteConnection is synchronous: every parallel session
+needs its own OS thread, and connections/TLS handshakes to
+hub-cloud.browserstack.com are set up per thread. This backend
+drives many sessions from one event loop:
+
+  HubConnectionPool   bounded pool of HTTP/1.1 keep-alive
+                      connections (TLS via asyncio streams),
+                      shared by every session in the process
+  AsyncWebDriver      the W3C commands our helpers use: get,
+                      find element(s), send keys, click, clear,
+                      attribute, text, displayed, execute script,
+                      current URL, title, quit
+
+Usage:
+    pool   = HubConnectionPool(BS_HUB_URL, max_connections=16)
+    driver = await AsyncWebDriver.start(pool, build_capabilities(cfg))
+    await driver.get(TARGET_URL)
+    await (await driver.find_element(By.ID, "user-name")).send_keys("standard_user")
+
+Smoke run against the local grid (dozens of sessions, one thread):
+    BS_LOCAL_GRID=1 python async_driver.py --sessions 40
+"""
+
+import ssl
+import json
+import time
+import base64
+import asyncio
+import argparse
+from urllib.parse import urlparse, unquote
+
+from selenium.common.exceptions import (
+    WebDriverException, NoSuchElementException, StaleElementReferenceException,
+    TimeoutException, JavascriptException, InvalidSessionIdException,
+    ElementNotInteractableException,
+)
+from selenium.webdriver.common.by import By
+
+from browserstack_config import (
+    BS_HUB_URL, TARGET_URL, BROWSER_MATRIX, PARALLEL_SLOTS, ASYNC_POOL_SIZE, build_capabilities,
+)
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+
+W3C_ERRORS = {
+    "no such element"         : NoSuchElementException,
+    "stale element reference" : StaleElementReferenceException,
+    "timeout"                 : TimeoutException,
+    "script timeout"          : TimeoutException,
+    "javascript error"        : JavascriptException,
+    "invalid session id"      : InvalidSessionIdException,
+    "element not interactable": ElementNotInteractableException,
+}
+
+
+# ─────────────────────────────────────────────────────────────
+#  HTTP/1.1 KEEP-ALIVE CONNECTION POOL
+# ─────────────────────────────────────────────────────────────
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.uses   = 0
+
+    def close(self):
+        self.writer.close()
+
+
+class HubConnectionPool:
+    """At most `max_connections` keep-alive connections to one hub, reused LIFO."""
+
+    def __init__(self, url: str = BS_HUB_URL, max_connections: int = ASYNC_POOL_SIZE):
+        parsed          = urlparse(url)
+        self.scheme     = parsed.scheme
+        self.host       = parsed.hostname
+        self.port       = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.base_path  = parsed.path.rstrip("/")
+        self._auth      = None
+        if parsed.username:
+            creds      = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+            self._auth = "Basic " + base64.b64encode(creds.encode()).decode()
+        self._ssl       = ssl.create_default_context() if self.scheme == "https" else None
+        self._idle      = []
+        self._slots     = asyncio.Semaphore(max_connections)
+        self.stats      = {"opened": 0, "reused": 0, "requests": 0}
+
+    async def _checkout(self) -> _Connection:
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.reader.at_eof():
+                self.stats["reused"] += 1
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+        self.stats["opened"] += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, path: str, payload=None):
+        """Send one JSON request; returns (status, parsed JSON body or None)."""
+        body = json.dumps(payload).encode() if payload is not None else b""
+        status, _, data = await self.send(method, path, body, content_type="application/json; charset=utf-8",
+                                          accept="application/json")
+        return status, (json.loads(data) if data else None)
+
+    async def send(self, method: str, path: str, body: bytes = b"", content_type: str = None,
+                   accept: str = "*/*"):
+        """Send one request over a pooled connection; returns (status, headers, raw body)."""
+        head = [f"{method} {self.base_path}{path} HTTP/1.1",
+                f"Host: {self.host}:{self.port}",
+                "Connection: keep-alive",
+                f"Accept: {accept}",
+                f"Content-Length: {len(body)}"]
+        if body and content_type:
+            head.append(f"Content-Type: {content_type}")
+        if self._auth:
+            head.append(f"Authorization: {self._auth}")
+        raw = ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+        async with self._slots:
+            for attempt in (1, 2):
+                conn = await self._checkout()
+                reused = conn.uses > 0
+                try:
+                    conn.writer.write(raw)
+                    await conn.writer.drain()
+                    status, headers, data = await self._read_response(conn.reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn.close()
+                    if reused and attempt == 1:
+                        continue      # the server dropped an idle keep-alive connection
+                    raise
+                conn.uses += 1
+                self.stats["requests"] += 1
+                if headers.get("connection", "").lower() == "close":
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+                return status, headers, data
+
+    @staticmethod
+    async def _read_response(reader):
+        status_line = await reader.readuntil(b"\r\n")
+        status      = int(status_line.split()[1])
+        headers     = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readuntil(b"\r\n")
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            return status, headers, b"".join(chunks)
+        length = int(headers.get("content-length", "0"))
+        return status, headers, await reader.readexactly(length) if length else b""
+
+    async def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+
+# ─────────────────────────────────────────────────────────────
+#  W3C SESSION
+# ─────────────────────────────────────────────────────────────
+def _locator(by: str, value: str):
+    """Same By → W3C strategy mapping Selenium applies."""
+    if by == By.ID:
+        return "css selector", f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return "css selector", f".{value}"
+    if by == By.NAME:
+        return "css selector", f'[name="{value}"]'
+    return by, value
+
+
+class AsyncElement:
+    def __init__(self, driver, element_id: str):
+        self.driver = driver
+        self.id     = element_id
+
+    def _path(self, suffix: str) -> str:
+        return f"/element/{self.id}/{suffix}"
+
+    async def click(self):
+        await self.driver.command("POST", self._path("click"), {})
+
+    async def clear(self):
+        await self.driver.command("POST", self._path("clear"), {})
+
+    async def send_keys(self, text: str):
+        await self.driver.command("POST", self._path("value"), {"text": text, "value": list(text)})
+
+    async def get_attribute(self, name: str):
+        """Property first (like Selenium's getAttribute atom for value/type/...), attribute otherwise."""
+        value = await self.driver.command("GET", self._path(f"property/{name}"))
+        if value is None:
+            value = await self.driver.command("GET", self._path(f"attribute/{name}"))
+        return value
+
+    async def text(self) -> str:
+        return await self.driver.command("GET", self._path("text"))
+
+    async def is_displayed(self) -> bool:
+        return await self.driver.command("GET", self._path("displayed"))
+
+
+class AsyncWebDriver:
+    """One remote session driven through a shared HubConnectionPool."""
+
+    def __init__(self, pool: HubConnectionPool, session_id: str, capabilities: dict):
+        self.pool         = pool
+        self.session_id   = session_id
+        self.capabilities = capabilities
+
+    @classmethod
+    async def start(cls, pool: HubConnectionPool, capabilities: dict) -> "AsyncWebDriver":
+        status, body = await pool.request("POST", "/session",
+                                          {"capabilities": {"alwaysMatch": capabilities}})
+        value = _check(status, body)
+        return cls(pool, value["sessionId"], value.get("capabilities", {}))
+
+    async def command(self, method: str, path: str, payload=None):
+        status, body = await self.pool.request(method, f"/session/{self.session_id}{path}", payload)
+        return self._unwrap(_check(status, body))
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncElement(self, value[ELEMENT_KEY])
+            return {k: self._unwrap(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(v) for v in value]
+        return value
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver._wrap(v) for v in value]
+        return value
+
+    async def get(self, url: str):
+        await self.command("POST", "/url", {"url": url})
+
+    async def current_url(self) -> str:
+        return await self.command("GET", "/url")
+
+    async def title(self) -> str:
+        return await self.command("GET", "/title")
+
+    async def find_element(self, by: str, value: str) -> AsyncElement:
+        using, selector = _locator(by, value)
+        return await self.command("POST", "/element", {"using": using, "value": selector})
+
+    async def find_elements(self, by: str, value: str) -> list:
+        using, selector = _locator(by, value)
+        return await self.command("POST", "/elements", {"using": using, "value": selector})
+
+    async def execute_script(self, script: str, *args):
+        return await self.command("POST", "/execute/sync", {"script": script, "args": self._wrap(args)})
+
+    async def quit(self):
+        status, body = await self.pool.request("DELETE", f"/session/{self.session_id}")
+        _check(status, body)
+
+
+def _check(status: int, body):
+    value = (body or {}).get("value")
+    if status < 400:
+        return value
+    error   = value.get("error", "") if isinstance(value, dict) else ""
+    message = value.get("message", "") if isinstance(value, dict) else str(value)
+    raise W3C_ERRORS.get(error, WebDriverException)(f"{error}: {message}" if error else message)
+
+
+async def create_async_driver(config: dict, pool: HubConnectionPool) -> AsyncWebDriver:
+    """Async counterpart of browserstack_config.create_driver."""
+    return await AsyncWebDriver.start(pool, build_capabilities(config))
+
+
+# ─────────────────────────────────────────────────────────────
+#  SMOKE RUN — many concurrent logins from a single thread
+# ─────────────────────────────────────────────────────────────
+async def _login_once(config: dict, pool: HubConnectionPool, slots: asyncio.Semaphore) -> float:
+    async with slots:
+        start  = time.monotonic()
+        driver = await create_async_driver(config, pool)
+        try:
+            await driver.get(TARGET_URL)
+            await (await driver.find_element(By.ID, "user-name")).send_keys("standard_user")
+            await (await driver.find_element(By.ID, "password")).send_keys("secret_sauce")
+            await (await driver.find_element(By.ID, "login-button")).click()
+            if "/inventory.html" not in await driver.current_url():
+                raise AssertionError(f"[{config['id']}] login did not reach the dashboard")
+        finally:
+            await driver.quit()
+        return time.monotonic() - start
+
+
+async def _smoke(sessions: int, concurrency: int, connections: int):
+    pool    = HubConnectionPool(BS_HUB_URL, max_connections=connections)
+    slots   = asyncio.Semaphore(concurrency)
+    configs = [BROWSER_MATRIX[i % len(BROWSER_MATRIX)] for i in range(sessions)]
+    start   = time.monotonic()
+    results = await asyncio.gather(*(_login_once(c, pool, slots) for c in configs), return_exceptions=True)
+    await pool.close()
+    failures = [r for r in results if isinstance(r, Exception)]
+    print(f"{sessions} sessions · {concurrency} concurrent · {time.monotonic() - start:.2f}s wall · "
+          f"{len(failures)} failed · pool {pool.stats}")
+    for failure in failures[:5]:
+        print(f"  {failure!r}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive many login sessions from one event loop.")
+    parser.add_argument("--sessions", type=int, default=len(BROWSER_MATRIX))
+    parser.add_argument("--concurrency", type=int, default=PARALLEL_SLOTS)
+    parser.add_argument("--connections", type=int, default=ASYNC_POOL_SIZE)
+    args = parser.parse_args()
+    asyncio.run(_smoke(args.sessions, args.concurrency, args.connections))
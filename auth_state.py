@@ -0,0 +1,87 @@
+"""
+============================================================
+  auth_state.py
+  Captured login state, injected instead of a UI login
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Post-login tests (inventory, title, logout, ...) don't exercise
+the login form, yet each used to type both fields, click and wait
+for the redirect. After one real login per config we capture the
+cookies + localStorage + sessionStorage; later tests add them to
+a fresh page and open /inventory.html directly.
+
+If the site rejects the injected state (expired cookie, server
+change) we land back on the login page: the state is dropped and
+the caller falls back to a real UI login, which recaptures it.
+"""
+
+import time
+import threading
+
+CAPTURE_STORAGE_SCRIPT = """/* captureStorage */
+function dump(store) { var out = {}; for (var i = 0; i < store.length; i++) {
+  var k = store.key(i); out[k] = store.getItem(k); } return out; }
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};"""
+
+RESTORE_STORAGE_SCRIPT = """/* restoreStorage */
+var state = arguments[0], k;
+for (k in state.local)   { window.localStorage.setItem(k, state.local[k]); }
+for (k in state.session) { window.sessionStorage.setItem(k, state.session[k]); }"""
+
+
+class AuthStateCache:
+    """Authenticated browser state per `config["id"]`, shared by the whole run."""
+
+    def __init__(self, target_url: str, dashboard_path: str):
+        self.target_url     = target_url
+        self.dashboard_path = dashboard_path
+        self._states        = {}
+        self._lock          = threading.Lock()
+        self.stats          = {"injected": 0, "captured": 0, "rejected": 0}
+
+    def capture(self, driver, config: dict):
+        """Call right after a successful UI login, while on the dashboard."""
+        state = {
+            "cookies": driver.get_cookies(),
+            "storage": driver.execute_script(CAPTURE_STORAGE_SCRIPT),
+        }
+        with self._lock:
+            self._states[config["id"]] = state
+            self.stats["captured"] += 1
+
+    def invalidate(self, config: dict):
+        with self._lock:
+            self._states.pop(config["id"], None)
+
+    def _usable_state(self, config: dict):
+        with self._lock:
+            state = self._states.get(config["id"])
+        if state is None:
+            return None
+        now = time.time()
+        if any(c.get("expiry") is not None and c["expiry"] <= now for c in state["cookies"]):
+            self.invalidate(config)
+            return None
+        return state
+
+    def inject(self, driver, config: dict) -> bool:
+        """
+        Restore the captured state on a page of the target origin and open
+        the dashboard. Returns False (and drops the state) if that fails.
+        """
+        state = self._usable_state(config)
+        if state is None:
+            return False
+        for cookie in state["cookies"]:
+            driver.add_cookie(cookie)
+        driver.execute_script(RESTORE_STORAGE_SCRIPT, state["storage"])
+        driver.get(self.target_url + self.dashboard_path)
+        if self.dashboard_path in driver.current_url:
+            with self._lock:
+                self.stats["injected"] += 1
+            return True
+        with self._lock:
+            self.stats["rejected"] += 1
+        self.invalidate(config)
+        return False
@@ -0,0 +1,433 @@
+"""
+============================================================
+  bench_harness.py
+  Overhead of the harness itself, against a stubbed driver
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Command latency and the run timeline say where a BrowserStack
+run spends its time; this says what the framework costs on its
+own, so a harness change can't quietly add seconds per test once
+the matrix is large. Everything runs against the zero-latency
+local grid (local_grid.py), whose cost per command is constant
+across matrix sizes.
+
+For each matrix size (BENCH_SIZES, 11 → 1000 configs) a
+browserstack.yml is synthesised: the real `browsers:` entries,
+then distinct desktop configs (chrome / firefox / edge × four
+OSes × descending versions) up to the size. Measured:
+
+  in process
+    expand        browser_matrix.expand, per config
+    capabilities  build_capabilities, per config
+    create/quit   create_driver (session, instrumentation, wait
+                  engine) and driver.quit(), per session
+  pytest (child process, clean BS_* environment, own cwd)
+    configure     pytest_configure, incl. the matrix re-expansion
+    collection    collection + ordering, per collected item
+                  (--collect-only over the whole suite)
+    setup / call / teardown
+                  per test, for BENCH_TESTS on every config, with
+                  the time per fixture for setup
+    makereport    each harness pytest_runtest_makereport
+                  implementation, per test
+    report        pytest_sessionfinish + pytest_terminal_summary
+                  (JSON / HTML / JUnit reports, trace), per test
+
+Each figure is the best of BENCH_REPEATS runs. Milliseconds only
+mean something on the machine that measured them, so the per-unit
+figures are also expressed in calibration units: divided by the
+time of a fixed pure-Python workload (calibrate(): JSON encoding
+and hashing of report-sized records, the kind of work the harness
+does) run in the same process, the median of runs spread over
+the whole benchmark. The committed BENCH_BASELINE holds
+those normalised figures; one more than BENCH_THRESHOLD (fraction)
+plus BENCH_NOISE_MS (converted to units) above its baseline fails
+the run on any machine. Re-record it with --update-baseline after
+an intended change.
+
+Usage:
+    python bench_harness.py                       # 11, 100, 1000 configs
+    python bench_harness.py --sizes 11,100 --repeats 1
+    python bench_harness.py --update-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import platform
+import argparse
+import statistics
+import tempfile
+import subprocess
+from pathlib import Path
+from contextlib import contextmanager
+
+# Every stage talks to the in-process stand-in grid, never to BrowserStack.
+STUB_ENV = {"BS_LOCAL_GRID": "1", "BS_LOCAL_GRID_LATENCY_MS": "0", "BS_LOCAL_GRID_SESSION_MS": "0"}
+os.environ.update(STUB_ENV)
+
+import yaml
+import pytest
+
+from browserstack_config import (
+    MATRIX_FILE, BENCH_SIZES, BENCH_REPEATS, BENCH_TESTS, BENCH_BASELINE, BENCH_THRESHOLD, BENCH_NOISE_MS,
+    BENCH_REPORT, build_capabilities, create_driver,
+)
+from browser_matrix import expand
+
+REPO        = Path(__file__).resolve().parent
+TEST_MODULE = REPO / "test_crossbrowser_login.py"
+
+SYNTHETIC_BROWSERS = ("chrome", "firefox", "edge")
+SYNTHETIC_OSES     = (("Windows", "10"), ("Windows", "11"), ("OS X", "Ventura"), ("OS X", "Sonoma"))
+
+# Per-unit figures (ms) compared against the baseline.
+COMPARED = (
+    "expand_ms_per_config", "capabilities_ms_per_config", "create_driver_ms", "quit_ms",
+    "configure_ms", "collection_ms_per_item", "setup_ms_per_test", "call_ms_per_test",
+    "teardown_ms_per_test", "makereport_ms_per_test", "report_ms_per_test",
+)
+
+
+# ─────────────────────────────────────────────────────────────
+#  MATRIX
+# ─────────────────────────────────────────────────────────────
+def matrix_spec(size: int, source: str = MATRIX_FILE) -> dict:
+    """browserstack.yml with exactly `size` configs: the real entries, then synthetic desktop ones."""
+    with open(source, encoding="utf-8") as handle:
+        spec = yaml.safe_load(handle)
+    entries = list(spec.get("browsers") or [])[:size]
+    index   = 0
+    while len(entries) < size:
+        os_name, os_version = SYNTHETIC_OSES[(index // len(SYNTHETIC_BROWSERS)) % len(SYNTHETIC_OSES)]
+        entries.append({
+            "id"             : f"bench_{index:04d}",
+            "browser"        : SYNTHETIC_BROWSERS[index % len(SYNTHETIC_BROWSERS)],
+            "browser_version": f"{120 - index // (len(SYNTHETIC_BROWSERS) * len(SYNTHETIC_OSES))}.0",
+            "os"             : os_name,
+            "os_version"     : os_version,
+        })
+        index += 1
+    return {**spec, "browsers": entries}
+
+
+def calibration_work():
+    """Fixed CPU-bound workload: encode and hash 20,000 report-sized records."""
+    digest = hashlib.sha256()
+    for n in range(20000):
+        record = {"nodeid": f"test_crossbrowser_login.py::Test::test_{n % 50}[cfg_{n % 11}]",
+                  "when": "call", "outcome": "passed", "duration": n * 0.001, "properties": [["n", n]]}
+        digest.update(json.dumps(record, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def calibrate(repeats: int) -> list:
+    """Milliseconds of at least five calibration_work() runs on this machine."""
+    times = []
+    for _ in range(max(5, repeats)):
+        started = time.perf_counter()
+        calibration_work()
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def best_of(repeats: int, run) -> float:
+    """Fastest wall time (seconds) of `repeats` calls."""
+    times = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+# ─────────────────────────────────────────────────────────────
+#  IN-PROCESS STAGES
+# ─────────────────────────────────────────────────────────────
+def bench_in_process(spec: dict, repeats: int) -> dict:
+    configs = list(expand(spec))
+    count   = len(configs)
+    created = quit = float("inf")
+    for _ in range(max(1, repeats)):
+        create_s = quit_s = 0.0
+        for config in configs:
+            started = time.perf_counter()
+            driver  = create_driver(config)
+            opened  = time.perf_counter()
+            driver.quit()
+            create_s += opened - started
+            quit_s   += time.perf_counter() - opened
+        created, quit = min(created, create_s), min(quit, quit_s)
+    return {
+        "configs"                   : count,
+        "expand_ms_per_config"      : best_of(repeats, lambda: list(expand(spec))) * 1000 / count,
+        "capabilities_ms_per_config": best_of(repeats, lambda: [build_capabilities(c) for c in configs])
+                                      * 1000 / count,
+        "create_driver_ms"          : created * 1000 / count,
+        "quit_ms"                   : quit * 1000 / count,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+#  PYTEST STAGES (child process)
+# ─────────────────────────────────────────────────────────────
+class PhaseTimer:
+    """pytest plugin for the child run: seconds per phase, fixture and harness hook, dumped to `path`."""
+
+    def __init__(self, path):
+        self.path       = Path(path)
+        self.phases     = {}
+        self.fixtures   = {}
+        self.hooks      = {}
+        self.items      = 0
+        self.tests      = 0
+        self.configured = None
+
+    @contextmanager
+    def timed(self, bucket: dict, key: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            bucket[key] = bucket.get(key, 0.0) + time.perf_counter() - started
+
+    def timed_impl(self, function, key: str, hookwrapper: bool):
+        """Wrap one hook implementation; a hookwrapper is timed before and after its yield."""
+        if not hookwrapper:
+            def timed(*args):
+                with self.timed(self.hooks, key):
+                    return function(*args)
+            return timed
+
+        def timed_wrapper(*args):
+            with self.timed(self.hooks, key):
+                inner = function(*args)
+                first = next(inner)
+            outcome = yield first
+            with self.timed(self.hooks, key):
+                try:
+                    inner.send(outcome)
+                except StopIteration:
+                    return
+            raise RuntimeError(f"{key} did not stop after its yield")
+        return timed_wrapper
+
+    # pytest_configure is historic (no wrappers): time it up to the session start that follows.
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_configure(self, config):
+        self.configured = time.perf_counter()
+
+    def pytest_sessionstart(self, session):
+        self.phases["configure"] = time.perf_counter() - self.configured
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_collection(self, session):
+        with self.timed(self.phases, "collection"):
+            yield
+
+    def pytest_collection_finish(self, session):
+        self.items = len(session.items)
+        for impl in session.config.pluginmanager.hook.pytest_runtest_makereport.get_hookimpls():
+            source = getattr(impl.plugin, "__file__", None)
+            if source and Path(source).resolve().parent == REPO and not impl.wrapper:
+                impl.function = self.timed_impl(impl.function, Path(source).stem, impl.hookwrapper)
+                self.hooks.setdefault(Path(source).stem, 0.0)
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        with self.timed(self.phases, "setup"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_call(self, item):
+        self.tests += 1
+        with self.timed(self.phases, "call"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_runtest_teardown(self, item, nextitem):
+        with self.timed(self.phases, "teardown"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        with self.timed(self.fixtures, fixturedef.argname):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        with self.timed(self.phases, "sessionfinish"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True, tryfirst=True)
+    def pytest_terminal_summary(self, terminalreporter, exitstatus, config):
+        with self.timed(self.phases, "terminal_summary"):
+            yield
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_unconfigure(self, config):
+        self.path.write_text(json.dumps({"items": self.items, "tests": self.tests, "phases": self.phases,
+                                         "fixtures": self.fixtures, "makereport": self.hooks}))
+
+
+def run_pytest(matrix_path: Path, workdir: Path, *args) -> dict:
+    """One child pytest run over the synthesised matrix; PhaseTimer output plus process wall time."""
+    timings = workdir / "timings.json"
+    env = {k: v for k, v in os.environ.items() if not k.startswith("BS_") and k != "PYTEST_ADDOPTS"}
+    env.update(STUB_ENV, BS_MATRIX_FILE=str(matrix_path),
+               PYTHONPATH=os.pathsep.join(filter(None, (str(REPO), env.get("PYTHONPATH")))))
+    code = ("import sys, pytest, bench_harness; "
+            f"sys.exit(pytest.main(sys.argv[1:], plugins=[bench_harness.PhaseTimer({str(timings)!r})]))")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", code, "-c", str(REPO / "pytest.ini"), "--rootdir", str(REPO),
+         "-p", "no:cacheprovider", "-q", *args, str(TEST_MODULE)],
+        cwd=workdir, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"pytest {' '.join(args)} exited {proc.returncode}:\n{proc.stdout[-2000:]}{proc.stderr[-2000:]}")
+    result = json.loads(timings.read_text())
+    result["process_s"] = wall
+    return result
+
+
+def bench_pytest(spec: dict, repeats: int, tests: str) -> dict:
+    best = {}
+    with tempfile.TemporaryDirectory(prefix="bench_harness_") as tmp:
+        matrix_path = Path(tmp) / "browserstack.yml"
+        matrix_path.write_text(yaml.safe_dump(spec, sort_keys=False))
+        for attempt in range(max(1, repeats)):
+            for stage, args in (("collect", ("--collect-only",)),
+                                ("run", ("-k", tests, "--junitxml=junit.xml",
+                                         "--html=report.html", "--self-contained-html"))):
+                workdir = Path(tmp) / f"{stage}_{attempt}"
+                workdir.mkdir()
+                result = run_pytest(matrix_path, workdir, *args)
+                if stage not in best or result["process_s"] < best[stage]["process_s"]:
+                    best[stage] = result
+    collect, run = best["collect"], best["run"]
+    tests_run    = max(1, run["tests"])
+    phases       = run["phases"]
+    return {
+        "items"                 : collect["items"],
+        "tests"                 : run["tests"],
+        "collect_process_s"     : collect["process_s"],
+        "run_process_s"         : run["process_s"],
+        "configure_ms"          : collect["phases"].get("configure", 0.0) * 1000,
+        "collection_ms_per_item": collect["phases"].get("collection", 0.0) * 1000 / max(1, collect["items"]),
+        "setup_ms_per_test"     : phases.get("setup", 0.0) * 1000 / tests_run,
+        "call_ms_per_test"      : phases.get("call", 0.0) * 1000 / tests_run,
+        "teardown_ms_per_test"  : phases.get("teardown", 0.0) * 1000 / tests_run,
+        "makereport_ms_per_test": sum(run["makereport"].values()) * 1000 / tests_run,
+        "report_ms_per_test"    : (phases.get("sessionfinish", 0.0) + phases.get("terminal_summary", 0.0))
+                                  * 1000 / tests_run,
+        "report_s"              : phases.get("sessionfinish", 0.0) + phases.get("terminal_summary", 0.0),
+        "makereport_ms_by_impl" : {k: v * 1000 / tests_run for k, v in sorted(run["makereport"].items())},
+        "fixture_setup_ms"      : {k: v * 1000 / tests_run for k, v in
+                                   sorted(run["fixtures"].items(), key=lambda kv: -kv[1])[:8]},
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+#  REPORT & BASELINE
+# ─────────────────────────────────────────────────────────────
+def rounded(value):
+    if isinstance(value, dict):
+        return {k: rounded(v) for k, v in value.items()}
+    return round(value, 4) if isinstance(value, float) else value
+
+
+def benchmark(sizes: list, repeats: int, tests: str) -> dict:
+    report = {"python": platform.python_version(), "platform": platform.platform(),
+              "repeats": repeats, "tests": tests, "sizes": {}}
+    calibration = []
+    for size in sizes:
+        calibration.extend(calibrate(repeats))
+        spec = matrix_spec(size)
+        report["sizes"][str(size)] = rounded({**bench_in_process(spec, repeats),
+                                              **bench_pytest(spec, repeats, tests)})
+    calibration.extend(calibrate(repeats))
+    # The median over runs spread across the benchmark: one fast or slow spell can't skew it.
+    report["calibration_ms"] = round(statistics.median(calibration), 4)
+    report["normalised"]     = normalised(report)
+    return report
+
+
+def normalised(report: dict) -> dict:
+    """{size: {figure: ms / calibration_ms}} for the COMPARED figures."""
+    return {size: {name: round(metrics[name] / report["calibration_ms"], 6) for name in COMPARED}
+            for size, metrics in report["sizes"].items()}
+
+
+def compare(report: dict, baseline: dict, threshold: float, noise_ms: float) -> list:
+    """['1000: setup_ms_per_test 0.210 > baseline 0.100 units (+110%)', ...], in calibration units."""
+    regressions = []
+    noise       = noise_ms / report["calibration_ms"]
+    for size, metrics in report["normalised"].items():
+        base = baseline.get("sizes", {}).get(size, {})
+        for name in COMPARED:
+            if name in base and name in metrics and metrics[name] > base[name] * (1 + threshold) + noise:
+                change = metrics[name] / base[name] - 1 if base[name] else float("inf")
+                regressions.append(f"{size}: {name} {metrics[name]:.3f} > baseline {base[name]:.3f} units "
+                                   f"({change:+.0%})")
+    return regressions
+
+
+def baseline_of(report: dict) -> dict:
+    """The committed form: calibration units only, plus where they were recorded (for reference)."""
+    return {"units": "calibration", "recorded_on": {"python": report["python"], "platform": report["platform"],
+                                                    "calibration_ms": report["calibration_ms"]},
+            "sizes": report["normalised"]}
+
+
+def print_report(report: dict, baseline: dict):
+    sizes = list(report["sizes"])
+    print(f"calibration {report['calibration_ms']:.1f} ms; deltas are against the baseline in calibration units")
+    print(f"{'ms':<28}" + "".join(f"{size + ' cfg':>22}" for size in sizes))
+    for name in COMPARED:
+        cells = []
+        for size in sizes:
+            value = report["sizes"][size][name]
+            base  = baseline.get("sizes", {}).get(size, {}).get(name)
+            delta = f" ({report['normalised'][size][name] / base - 1:+.0%})" if base else ""
+            cells.append(f"{value:.3f}{delta}")
+        print(f"{name:<28}" + "".join(f"{cell:>22}" for cell in cells))
+    for size in sizes:
+        metrics = report["sizes"][size]
+        hooks   = " · ".join(f"{k} {v:.3f}" for k, v in metrics["makereport_ms_by_impl"].items())
+        print(f"{size} configs: {metrics['items']} items, {metrics['tests']} tests · collect "
+              f"{metrics['collect_process_s']:.1f}s · run {metrics['run_process_s']:.1f}s · reports "
+              f"{metrics['report_s']:.2f}s · makereport {hooks or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the harness's own overhead against the local grid.")
+    parser.add_argument("--sizes", default=BENCH_SIZES, help="comma list of matrix sizes (configs)")
+    parser.add_argument("--repeats", type=int, default=BENCH_REPEATS, help="best of N runs per figure")
+    parser.add_argument("-k", "--tests", default=BENCH_TESTS, help="-k expression run on every config")
+    parser.add_argument("--baseline", default=BENCH_BASELINE)
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD, help="allowed fraction above baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run as the baseline")
+    parser.add_argument("-o", "--output", default=BENCH_REPORT)
+    args = parser.parse_args()
+
+    sizes    = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report   = benchmark(sizes, args.repeats, args.tests)
+    baseline = json.loads(Path(args.baseline).read_text()) if Path(args.baseline).exists() else {}
+    report["regressions"] = [] if args.update_baseline else compare(report, baseline, args.threshold,
+                                                                     BENCH_NOISE_MS)
+    print_report(report, baseline)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.update_baseline:
+        Path(args.baseline).write_text(json.dumps(baseline_of(report), indent=2) + "\n")
+        print(f"baseline updated: {args.baseline}")
+    elif not baseline:
+        sys.exit(f"FAILED: no baseline at {args.baseline} (record one with --update-baseline)")
+    elif report["regressions"]:
+        sys.exit("FAILED: " + "; ".join(report["regressions"]))
@@ -0,0 +1,262 @@
+"""
+============================================================
+  browser_matrix.py
+  Declarative browser matrix expansion from browserstack.yml
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+BROWSER_MATRIX is built from browserstack.yml, so the file the
+BrowserStack SDK reads and the pytest parametrisation cannot
+drift apart. Keys the SDK doesn't know stay out of that file:
+they live in a harness-only one (browser_matrix.yml).
+
+  browsers   (browserstack.yml) explicit entries, always
+             included. `id` and `label` are derived
+             (chrome_win11, "Chrome (Latest) · Windows 11").
+  overrides  (browser_matrix.yml) derived id → {id, label} to
+             use instead (iphone_15 → iphone15).
+  matrices   (browser_matrix.yml) named blocks expanded as
+             cartesian products, only when selected
+             (MATRIX_SETS / --matrix, "all" for every block):
+
+      - name: desktop-versions
+        browser: [chrome, edge]
+        browser_version: latest..latest-3     # or 118..121, or a list
+        os: {Windows: [10, 11], OS X: [Ventura, Sonoma]}
+        exclude:
+          - {browser: edge, os: OS X}
+      - name: phones
+        device: {iPhone 15: "17", Samsung Galaxy S23: "13.0"}
+        browser: [safari, chrome]
+        exclude:
+          - {device: "Samsung*", browser: safari}    # fnmatch patterns
+
+Expansion is a generator. Each block's product is walked with
+itertools.product, and every combination is checked against the
+block's exclusions and the browser / OS / mobile-only filters
+before a config dict is built. Only the configs that will run are
+ever held, however large the declared matrix. A combination
+already produced by an earlier entry is yielded once.
+
+OS filters match the OS name, its version, the short id form or
+the family: windows, macos, ios, android (e.g. "win11",
+"ventura", "android").
+"""
+
+import os
+import re
+import fnmatch
+import itertools
+
+import yaml
+
+AXES          = ("browser", "browser_version", "os", "os_version", "device")
+RANGE_PATTERN = re.compile(r"^\s*(\S+?)\s*\.\.\s*(\S+)\s*$")
+LATEST        = re.compile(r"^latest(?:-(\d+))?$")
+OS_DISPLAY    = {"OS X": "macOS"}
+
+
+def as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def slug(text) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", str(text).lower()).strip("_")
+
+
+# ─────────────────────────────────────────────────────────────
+#  AXES
+# ─────────────────────────────────────────────────────────────
+def expand_versions(spec) -> list:
+    """'latest..latest-2' → latest, latest-1, latest-2; '118..120' → 118.0 … 120.0; lists pass through."""
+    if isinstance(spec, list):
+        return [v for item in spec for v in expand_versions(item)]
+    text  = str(spec)
+    match = RANGE_PATTERN.match(text)
+    if not match:
+        return [text]
+    low, high = match.groups()
+    latest    = LATEST.match(low), LATEST.match(high)
+    if all(latest):
+        first, last = sorted(int(m.group(1) or 0) for m in latest)
+        return [f"latest-{n}" if n else "latest" for n in range(first, last + 1)]
+    if low.isdigit() and high.isdigit():
+        first, last = sorted((int(low), int(high)))
+        return [f"{n}.0" for n in range(last, first - 1, -1)]
+    raise ValueError(f"unsupported version range {text!r} (use latest..latest-N or 118..121)")
+
+
+def pairs(block: dict, key: str, version_key: str) -> list:
+    """[(os, os_version)] or [(device, os_version)] from a mapping or two list axes."""
+    value = block.get(key)
+    if isinstance(value, dict):
+        return [(str(name), str(v)) for name, versions in value.items() for v in as_list(versions)]
+    return [(str(name), str(v)) for name in as_list(value) for v in as_list(block.get(version_key))]
+
+
+def excluded(config: dict, rules: list) -> bool:
+    """True when every key of any rule matches the config (case-insensitive fnmatch)."""
+    for rule in rules:
+        if all(key in config and any(fnmatch.fnmatch(str(config[key]).lower(), str(p).lower())
+                                     for p in as_list(patterns) or [""])
+               for key, patterns in rule.items()):
+            return True
+    return False
+
+
+# ─────────────────────────────────────────────────────────────
+#  CONFIG ENTRIES
+# ─────────────────────────────────────────────────────────────
+def os_family(config: dict) -> str:
+    if config.get("real_mobile"):
+        return "ios" if config["device"].startswith(("iPhone", "iPad")) else "android"
+    return "macos" if config["os"] == "OS X" else slug(config["os"])
+
+
+def os_tags(config: dict) -> set:
+    family = os_family(config)
+    tags   = {family, slug(config["os_version"]), f"{family}{slug(config['os_version'])}"}
+    if config.get("real_mobile"):
+        if config["device"].startswith("iPad"):
+            tags.add("ipados")
+    else:
+        tags |= {config["os"].lower(), short_os(config)}
+    return tags
+
+
+def short_os(config: dict) -> str:
+    """win11 / ventura: the OS part of a desktop config id."""
+    if config["os"] == "Windows":
+        return f"win{slug(config['os_version'])}"
+    return slug(config["os_version"])
+
+
+def version_label(version: str) -> str:
+    if version.startswith("latest"):
+        return f"({version.title()})"
+    return version[:-2] if version.endswith(".0") else version
+
+
+def desktop_config(browser, version, os_name, os_version, versioned=False, **given) -> dict:
+    config = {"browser": str(browser), "browser_version": str(version), "os": str(os_name),
+              "os_version": str(os_version)}
+    config_id = f"{config['browser']}_{short_os(config)}"
+    if versioned:
+        config_id += f"_{version_label(config['browser_version']).strip('()').lower()}"
+    label = (f"{config['browser'].title()} {version_label(config['browser_version'])} · "
+             f"{OS_DISPLAY.get(config['os'], config['os'])} {config['os_version']}")
+    return {"id": str(given.get("id", config_id)), "label": str(given.get("label", label)), **config}
+
+
+def mobile_config(device, os_version, browser, versioned=False, **given) -> dict:
+    config = {"device": str(device), "os_version": str(os_version), "browser": str(browser),
+              "real_mobile": True}
+    config_id = slug(device) + (f"_{slug(os_version)}_{slug(browser)}" if versioned else "")
+    family = ("iPadOS" if config["device"].startswith("iPad") else
+              "iOS" if config["device"].startswith("iPhone") else "Android")
+    label  = (f"{config['browser'].title()} · {config['device']} · "
+              f"{family} {version_label(config['os_version'])}")
+    return {"id": str(given.get("id", config_id)), "label": str(given.get("label", label)), **config}
+
+
+def entry_config(entry: dict, overrides: dict = None) -> dict:
+    """A `browsers:` entry of browserstack.yml → BROWSER_MATRIX dict, with its override applied."""
+    extra = {k: entry[k] for k in ("id", "label") if k in entry}   # synthetic specs (bench_harness.py)
+    if entry.get("real_mobile") or entry.get("device"):
+        config = mobile_config(entry["device"], entry["os_version"], entry["browser"], **extra)
+    else:
+        config = desktop_config(entry["browser"], entry.get("browser_version", "latest"), entry["os"],
+                                entry["os_version"], **extra)
+    given = (overrides or {}).get(config["id"], {})
+    return {**config, **{k: str(given[k]) for k in ("id", "label") if k in given}}
+
+
+def block_configs(block: dict):
+    """Lazily yield (config, excluded?) for every combination of a `matrices:` block."""
+    rules    = block.get("exclude", [])
+    browsers = as_list(block.get("browser"))
+    if "device" in block:
+        for (device, os_version), browser in itertools.product(pairs(block, "device", "os_version"), browsers):
+            probe = {"device": device, "os_version": os_version, "browser": browser}
+            yield (None if excluded(probe, rules) else
+                   mobile_config(device, os_version, browser, versioned=True))
+        return
+    versions = expand_versions(block.get("browser_version", "latest"))
+    for browser, version, (os_name, os_version) in itertools.product(browsers, versions,
+                                                                     pairs(block, "os", "os_version")):
+        probe = {"browser": browser, "browser_version": version, "os": os_name, "os_version": os_version}
+        yield (None if excluded(probe, rules) else
+               desktop_config(browser, version, os_name, os_version, versioned=True))
+
+
+# ─────────────────────────────────────────────────────────────
+#  EXPANSION
+# ─────────────────────────────────────────────────────────────
+def selected(config: dict, browsers: set, oses: set, mobile_only: bool) -> bool:
+    if mobile_only and not config.get("real_mobile"):
+        return False
+    if browsers and config["browser"].lower() not in browsers:
+        return False
+    return not oses or bool(oses & os_tags(config))
+
+
+def expand(spec: dict, sets=(), browsers=(), oses=(), mobile_only=False, harness: dict = None):
+    """
+    Yield the BROWSER_MATRIX entries of a parsed browserstack.yml, filtered,
+    without duplicates; `harness` is the parsed browser_matrix.yml.
+    """
+    harness = harness or {}
+    blocks  = {block["name"]: block for block in harness.get("matrices") or []}
+    wanted  = as_list(sets)
+    unknown = set(wanted) - set(blocks) - {"all"}
+    if unknown:
+        raise ValueError(f"unknown matrix set(s) {sorted(unknown)}; defined: {sorted(blocks)}")
+    chosen   = list(blocks.values()) if "all" in wanted else [blocks[name] for name in wanted]
+    browsers = {b.lower() for b in as_list(browsers)}
+    oses     = {slug(o) for o in as_list(oses)} | {o.lower() for o in as_list(oses)}
+    seen     = set()
+    sources  = itertools.chain((entry_config(e, harness.get("overrides")) for e in spec.get("browsers") or []),
+                               *(block_configs(block) for block in chosen))
+    for config in sources:
+        if config is None or not selected(config, browsers, oses, mobile_only):
+            continue
+        key = tuple(config.get(axis) for axis in AXES)
+        if key in seen:
+            continue
+        seen.add(key)
+        yield config
+
+
+def read_harness(path: str) -> dict:
+    """The parsed harness-only file; {} when `path` is empty or missing."""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return yaml.safe_load(handle) or {}
+
+
+def load_matrix(path: str, sets=(), browsers=(), oses=(), mobile_only=False, harness_path: str = None) -> list:
+    with open(path, encoding="utf-8") as handle:
+        spec = yaml.safe_load(handle)
+    return list(expand(spec, sets, browsers, oses, mobile_only, read_harness(harness_path)))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print the expanded browser matrix.")
+    parser.add_argument("path", nargs="?", default="browserstack.yml")
+    parser.add_argument("--harness", default="browser_matrix.yml", help="harness-only overrides and matrices")
+    parser.add_argument("--matrix", default="", help="comma list of matrices: blocks, or 'all'")
+    parser.add_argument("--browsers", default="")
+    parser.add_argument("--os", default="")
+    parser.add_argument("--mobile-only", action="store_true")
+    args = parser.parse_args()
+    configs = load_matrix(args.path, args.matrix, args.browsers, args.os, args.mobile_only, args.harness)
+    for cfg in configs:
+        print(f"{cfg['id']:<32} {cfg['label']}")
+    print(f"{len(configs)} configs")
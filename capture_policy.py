@@ -0,0 +1,82 @@
+"""
+============================================================
+  capture_policy.py
+  Which artifact capture level a test's session runs with
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Levels (CAPTURE_LEVELS in browserstack_config.py), cheapest first:
+
+  lean    no video, network, Selenium or verbose console logs
+  video   video and screenshots only
+  full    everything (the old always-on settings)
+
+A test's level, first match wins:
+
+  1. a rerun (pytest-rerunfailures execution_count > 1) with
+     CAPTURE_RERUN on → full
+  2. an explicit `@pytest.mark.capture("video")` marker
+  3. the richest level CAPTURE_MARKERS maps one of its markers to
+     ("ui=video,visual=full")
+  4. CAPTURE_MODE
+
+A rerun never turns a failure green: conftest_bs.keep_first_failure
+reports the first attempt's failure for a rerun that passes.
+
+The pool keeps sessions of a non-default level apart (their
+config carries a "capture" key, see session_pool.pool_key), so a
+lean test never borrows a recording session or vice versa.
+"""
+
+from browserstack_config import CAPTURE_LEVELS, CAPTURE_MODE, CAPTURE_MARKERS, CAPTURE_RERUN
+
+LEVEL_ORDER = ("lean", "video", "full")
+DASHBOARD_SESSION_URL = "https://automate.browserstack.com/dashboard/v2/sessions/{}"
+
+
+def check_level(level: str) -> str:
+    if level not in CAPTURE_LEVELS:
+        raise ValueError(f"unknown capture level {level!r}; expected one of {sorted(CAPTURE_LEVELS)}")
+    return level
+
+
+def marker_levels(spec: str = CAPTURE_MARKERS) -> dict:
+    """'ui=video,visual=full' → {"ui": "video", "visual": "full"}."""
+    levels = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        marker, _, level = entry.partition("=")
+        levels[marker.strip()] = check_level(level.strip() or "full")
+    return levels
+
+
+MARKER_LEVELS = marker_levels()
+
+
+def is_rerun(item) -> bool:
+    return getattr(item, "execution_count", 1) > 1
+
+
+def capture_level(item, default: str = CAPTURE_MODE, markers: dict = MARKER_LEVELS) -> str:
+    if CAPTURE_RERUN and is_rerun(item):
+        return "full"
+    explicit = item.get_closest_marker("capture")
+    if explicit is not None and explicit.args:
+        return check_level(explicit.args[0])
+    wanted = [level for name, level in markers.items() if item.get_closest_marker(name)]
+    return max([default] + wanted, key=LEVEL_ORDER.index)
+
+
+def capture_config(config: dict, level: str) -> dict:
+    """The BROWSER_MATRIX entry as-is at the default level, else a copy tagged with the level."""
+    return config if level == CAPTURE_MODE else {**config, "capture": level}
+
+
+def session_config(item):
+    """An item's BROWSER_MATRIX entry as the session pool sees it, tagged with its capture level."""
+    callspec = getattr(item, "callspec", None)
+    config   = callspec.params.get("browser") if callspec else None
+    return None if config is None else capture_config(config, capture_level(item))
+
+
+def session_url(session_id: str) -> str:
+    return DASHBOARD_SESSION_URL.format(session_id)
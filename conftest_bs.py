@@ -4,8 +4,59 @@ Pytest shared hooks and fixtures for BrowserStack cross-browser test suite.
 PRODIGY INFOTECH — Task-04
 """
 
+import json
+import time
+from pathlib import Path
+
 import pytest
 
+from browserstack_config import (
+    BROWSER_MATRIX, PARALLEL_SLOTS, PARALLELS_PER_PLATFORM, LATENCY_REPORT,
+    PERF_BASELINE, PERF_THRESHOLD, PERF_UPDATE_BASELINE, PERF_REPORT,
+    RESULTS_STREAM, STREAM_REPORT, RESULTS_DB, BUILD_NAME, TEST_ORDERING, STATUS_MODE, STATUS_FILE,
+    MATRIX_REDUCTION, REDUCTION_SEED, SKIP_CACHE, SKIP_CACHE_DB, SKIP_CACHE_TTL, VISUAL_OUTPUT, CORPUS_REPORT,
+    MATRIX_FILE, MATRIX_HARNESS_FILE, MATRIX_SETS, MATRIX_BROWSERS, MATRIX_OS, MATRIX_MOBILE_ONLY,
+    TIMELINE_REPORT, CAPTURE_RERUN,
+    TARGET_URL, LOCAL_GRID,
+)
+from browser_matrix import load_matrix
+from scheduler import MatrixScheduler, SlotScheduling
+from waits import wait_stats
+from teardown import TEARDOWN
+from instrumentation import RECORDER
+from run_timeline import TIMELINE, export as export_timeline
+from login_perf import PerfBaseline
+from result_stream import ResultStream
+from stream_report import render
+from results_store import ResultsStore
+from durations import DurationModel, lpt_order, group_totals, predict_makespan
+from sharding import parse_shard, shard_slots, partition
+from matrix_reduction import reduce_items, coverage
+from skip_cache import SkipCache, page_fingerprint, pair_fingerprint
+from capture_policy import is_rerun
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--shard", default=None, metavar="i/N",
+        help="run only shard i of N (duration-balanced, identical on every machine); "
+             "combine the shards afterwards with merge_shards.py",
+    )
+    parser.addoption(
+        "--no-cache", action="store_true", default=False,
+        help="run every test even when BS_SKIP_CACHE has a cached pass for it (passes are still recorded)",
+    )
+    group = parser.getgroup("browser matrix", "filters applied to browserstack.yml before collection")
+    group.addoption("--matrix", dest="matrix_sets", default=None, metavar="SETS",
+                    help="also expand these `matrices:` blocks (comma list, or 'all'); overrides BS_MATRIX_SETS")
+    group.addoption("--browsers", default=None, metavar="LIST",
+                    help="only these browsers, e.g. chrome,safari; overrides BS_BROWSERS")
+    group.addoption("--os", dest="os_filter", default=None, metavar="LIST",
+                    help="only these OSes (name, version or family: win11, ventura, macos, ios, android); "
+                         "overrides BS_OS")
+    group.addoption("--mobile-only", action="store_true", default=False,
+                    help="only real mobile devices (same as BS_MOBILE_ONLY=1)")
+
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "positive: Happy-path login tests")
@@ -13,20 +64,109 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "ui: UI/layout/responsiveness tests")
     config.addinivalue_line("markers", "security: Security validation tests")
     config.addinivalue_line("markers", "form: Form submission behaviour tests")
+    config.addinivalue_line("markers", "perf: Login performance tests (BS_PERF_MODE=1)")
+    config.addinivalue_line("markers", "visual: Screenshot comparison with baselines (BS_VISUAL_MODE=1)")
+    config.addinivalue_line("markers", "corpus: Payload corpus run through the login form (BS_CORPUS_MODE=1)")
+    config.addinivalue_line("markers", "engine_agnostic: Same result on every engine; reducible (BS_MATRIX_REDUCTION)")
+    config.addinivalue_line("markers", "engine_sensitive: Always runs on the full matrix")
+    config.addinivalue_line("markers", "capture(level): Artifact capture level for this test (lean/video/full)")
+    config.bs_reduction = None   # coverage-versus-cost summary when BS_MATRIX_REDUCTION is on
+    config.bs_timeline  = None   # run_timeline.summarise() output, set at the end of the run
+    TIMELINE.enabled    = bool(TIMELINE_REPORT)
+
+    # Command-line matrix filters re-expand BROWSER_MATRIX in place, before
+    # the test module (and its parametrisation) is imported.
+    options = [config.getoption(name) for name in ("matrix_sets", "browsers", "os_filter", "mobile_only")]
+    if any(options):
+        sets, browsers, oses, mobile_only = options
+        try:
+            BROWSER_MATRIX[:] = load_matrix(MATRIX_FILE,
+                                            MATRIX_SETS if sets is None else sets,
+                                            MATRIX_BROWSERS if browsers is None else browsers,
+                                            MATRIX_OS if oses is None else oses,
+                                            mobile_only or MATRIX_MOBILE_ONLY,
+                                            MATRIX_HARNESS_FILE)
+        except ValueError as exc:
+            raise pytest.UsageError(str(exc))
+    if not BROWSER_MATRIX:
+        raise pytest.UsageError("no browser configs match the matrix filters")
+
+    # Sharded runs split the account's parallel slots between the shards.
+    config.bs_shard = None
+    config.bs_slots = PARALLEL_SLOTS
+    if config.getoption("shard"):
+        try:
+            config.bs_shard = parse_shard(config.getoption("shard"))
+        except ValueError as exc:
+            raise pytest.UsageError(str(exc))
+        config.bs_slots = shard_slots(PARALLEL_SLOTS, *config.bs_shard)
+    # Read once: ordering, sharding and the prediction all use the same history.
+    config.bs_durations = DurationModel.from_history()
+
+    # Slot ledger for this process. Under xdist every worker is one slot
+    # (the controller's SlotScheduling enforces the global/platform caps),
+    # plus an even share of the slots -n leaves unused, for pre-warming
+    # (the remainder goes to the lowest-numbered workers).
+    if hasattr(config, "workerinput"):
+        workers = config.workerinput.get("workercount", 1)
+        spare   = max(0, config.bs_slots - workers)
+        index   = int(config.workerinput.get("workerid", "gw0")[2:])
+        config.bs_scheduler = MatrixScheduler(slots=1 + spare // workers + (index < spare % workers))
+    else:
+        config.bs_scheduler = MatrixScheduler(slots=config.bs_slots)
+    config.bs_pool_stats = {}     # SessionPool.stats, summed over workers
+    config.bs_prediction = None   # (predicted makespan seconds, slots), set once items are ordered
+    if STATUS_MODE == "defer" and not hasattr(config, "workerinput"):
+        Path(STATUS_FILE).unlink(missing_ok=True)   # the file holds this run's statuses only
+
+    # Fingerprint skip cache (skip_cache.py); workers share the SQLite file.
+    config.bs_cache      = None
+    config.bs_cache_hits = None
+    if SKIP_CACHE:
+        Path(SKIP_CACHE_DB).parent.mkdir(parents=True, exist_ok=True)
+        config.bs_cache = SkipCache(SKIP_CACHE_DB, SKIP_CACHE_TTL)
 
+    # Live result stream; the controller (or a serial run) starts it fresh.
+    config.bs_stream = None
+    if RESULTS_STREAM:
+        worker = config.workerinput["workerid"] if hasattr(config, "workerinput") else "main"
+        config.bs_stream = ResultStream(RESULTS_STREAM, worker=worker)
+        if worker == "main":
+            config.bs_stream.start_run([cfg["id"] for cfg in BROWSER_MATRIX], shard=config.bs_shard,
+                                       history=config.bs_durations.fingerprint())
 
+
+@pytest.hookimpl(optionalhook=True)
 def pytest_html_report_title(report):
     report.title = "Prodigy Infotech — Task-04 Cross-Browser Test Report"
 
 
+def html_environment() -> dict:
+    return {
+        "Project"     : "Task-04 BrowserStack Cross-Browser Testing",
+        "Organization": "Prodigy Infotech",
+        "Target"      : TARGET_URL,
+        "Grid"        : "Local stand-in grid (BS_LOCAL_GRID)" if LOCAL_GRID else "BrowserStack Selenium Grid",
+        "Browsers"    : "Chrome, Firefox, Safari, Edge",
+        "Devices"     : "Desktop + Mobile (Real Device Cloud)",
+        "Parallelism" : f"{PARALLEL_SLOTS} slots, {PARALLELS_PER_PLATFORM} per platform",
+    }
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_metadata(metadata):
+    """pytest-html 4 builds its Environment table from pytest-metadata, at session start."""
+    metadata.update(html_environment())
+
+
+@pytest.hookimpl(optionalhook=True)
 def pytest_html_env(report, environment):
-    environment["Project"]      = "Task-04 BrowserStack Cross-Browser Testing"
-    environment["Organization"] = "Prodigy Infotech"
-    environment["Target"]       = "https://www.saucedemo.com"
-    environment["Grid"]         = "BrowserStack Selenium Grid"
-    environment["Browsers"]     = "Chrome, Firefox, Safari, Edge"
-    environment["Devices"]      = "Desktop + Mobile (Real Device Cloud)"
-    environment["Parallelism"]  = "11 sessions in parallel"
+    environment.update(html_environment())
+    bottlenecks = RECORDER.bottlenecks()
+    if bottlenecks:
+        environment["Slowest Commands (p95)"] = ", ".join(
+            f"{cfg}/{cmd} {stat['p95_ms']:.0f} ms" for cfg, cmd, stat in bottlenecks
+        )
 
 
 # ── Capture pass/fail for BrowserStack session tagging ────────
@@ -34,4 +174,416 @@ def pytest_html_env(report, environment):
 def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
+    if getattr(item, "bs_capture_rerun", False):
+        keep_first_failure(item, rep)
     setattr(item, f"rep_{rep.when}", rep)
+    fingerprint = getattr(item, "bs_fingerprint", None)
+    if fingerprint and (rep.when == "call" or rep.failed):
+        item.config.bs_cache.record(item.nodeid, fingerprint, passed=rep.passed)
+    if item.config.bs_stream is not None:
+        item.config.bs_stream.record(item, rep, browser_config(item))
+
+
+def keep_first_failure(item, rep):
+    """
+    The automatic full-capture rerun is evidence, not a second chance:
+    a test that failed on its first attempt stays failed even when the
+    rerun passes (that report carries the first attempt's failure).
+    """
+    if rep.failed and not is_rerun(item):
+        item.bs_first_failure = rep
+    first = getattr(item, "bs_first_failure", None)
+    if first is not None and is_rerun(item) and rep.when == "call" and rep.passed:
+        rep.outcome  = "failed"
+        rep.longrepr = first.longrepr
+        rep.bs_kept_failure = True   # the rerun's own session still passed
+        rep.sections.append(("full-capture rerun", f"passed; the {first.when} failure of the first attempt stands"))
+
+
+# ── What this process runs next (session_pool.scheduled_items) ──
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    item.bs_nextitem = nextitem
+
+
+# ── Run timeline: test phases on the slot and config lanes ──
+def _timed_phase(item, phase: str):
+    cfg = browser_config(item)
+    return TIMELINE.timed(item.name, phase, cfg["id"] if cfg else "", nodeid=item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    with _timed_phase(item, "setup"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    with _timed_phase(item, "test"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    with _timed_phase(item, "teardown"):
+        yield
+
+
+# ── Gather perf / visual results (user_properties travel from xdist workers) ──
+PERF_RESULTS   = {}   # config id → {"stats": ..., "logins": [...]}
+VISUAL_RESULTS = {}   # (config id, state) → visual_diff.VisualResult fields
+CORPUS_RESULTS = {}   # config id → payload_corpus.summarise() output
+ELEMENT_CACHE  = {}   # nodeid → login_page.ElementCache stats for that test
+CAPTURE_RERUNS = {}   # nodeid → {"config": ..., "attempts": [...]} for tests re-run with full capture
+
+
+def pytest_runtest_logreport(report):
+    for name, value in report.user_properties:
+        if name == "login_perf":
+            PERF_RESULTS[value["config"]] = value
+        elif name == "visual":
+            VISUAL_RESULTS[(value["config"], value["state"])] = value
+        elif name == "corpus":
+            CORPUS_RESULTS[value["config"]] = value
+        elif name == "element_cache" and report.when == "teardown":
+            ELEMENT_CACHE[report.nodeid] = value
+        elif name == "capture" and report.when == "teardown":
+            CAPTURE_RERUNS[report.nodeid] = value
+
+
+# ── Keep pooled sessions warm: run each config's tests back to back ──
+def browser_config(item):
+    """Return the BROWSER_MATRIX entry an item is parametrised with, if any."""
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser") if callspec else None
+
+
+def pytest_collection_modifyitems(config, items):
+    model = config.bs_durations
+    if CAPTURE_RERUN and config.pluginmanager.hasplugin("rerunfailures") and not config.getoption("reruns", None):
+        # Lean sessions keep no video or logs: a failure gets one rerun with full capture.
+        for item in items:
+            if browser_config(item) is not None and not item.get_closest_marker("flaky"):
+                item.add_marker(pytest.mark.flaky(reruns=1))
+                item.bs_capture_rerun = True
+    if MATRIX_REDUCTION != "off":
+        kept, dropped = reduce_items(items, MATRIX_REDUCTION, REDUCTION_SEED, browser_config)
+        config.bs_reduction = coverage(kept, dropped, browser_config, model, MATRIX_REDUCTION, REDUCTION_SEED)
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = kept
+    if config.bs_shard is not None:
+        index, total = config.bs_shard
+        shards   = partition([item.nodeid for item in items], total, model)
+        kept     = [item for item in items if shards[item.nodeid] == index]
+        dropped  = [item for item in items if shards[item.nodeid] != index]
+        if dropped:
+            config.hook.pytest_deselected(items=dropped)
+            items[:] = kept
+    if config.bs_cache is not None:
+        mark_cached_passes(config, items)
+    if TEST_ORDERING == "lpt":
+        # Longest config groups first, so slow real devices don't form the tail.
+        items[:] = lpt_order(items, model)
+    else:
+        order = {cfg["id"]: i for i, cfg in enumerate(BROWSER_MATRIX)}
+
+        def config_rank(item):
+            cfg = browser_config(item)
+            return order.get(cfg["id"], len(order)) if cfg else -1
+
+        items.sort(key=config_rank)   # stable: test order within a config is kept
+    skipped_first(items)
+    if not hasattr(config, "workerinput"):
+        config.bs_prediction = (predict_makespan(list(group_totals((i.nodeid for i in items), model).values()), 1), 1)
+
+
+def skipped_first(items):
+    """
+    Move statically skipped items to the front of their config group, so
+    a group ends on an item that uses a session. Under xdist a worker
+    only sees one item ahead; this way that item is the next config's
+    first test while the last session-using one runs (pre-warming).
+    """
+    first = {}
+    for index, item in enumerate(items):
+        first.setdefault((browser_config(item) or {}).get("id"), index)
+    items.sort(key=lambda item: (first[(browser_config(item) or {}).get("id")], not statically_skipped(item)))
+
+
+def statically_skipped(item) -> bool:
+    """A skip marker, or a skipif with a true non-string condition (string conditions count as not skipped)."""
+    if item.get_closest_marker("skip"):
+        return True
+    return any(
+        any(cond for cond in mark.args if not isinstance(cond, str)) or mark.kwargs.get("condition") is True
+        for mark in item.iter_markers("skipif")
+    )
+
+
+def mark_cached_passes(config, items):
+    """Fingerprint every browser item; skip those with a cached pass unless --no-cache."""
+    page = page_fingerprint()
+    if page is None:
+        return
+    config.bs_cache_hits = 0
+    for item in items:
+        cfg = browser_config(item)
+        if cfg is None or item.get_closest_marker("perf"):
+            continue
+        item.bs_fingerprint = pair_fingerprint(item, cfg, page)
+        if not config.getoption("no_cache") and config.bs_cache.hit(item.nodeid, item.bs_fingerprint):
+            item.add_marker(pytest.mark.skip(reason=f"cached pass ({item.bs_fingerprint[:12]})"))
+            config.bs_cache_hits += 1
+
+
+# ── Predicted vs actual makespan ─────────────────────────────
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    """Controller side: predict once, from the first worker's (already ordered) collection."""
+    config = node.config
+    if config.bs_prediction is None:
+        sched = getattr(config.pluginmanager.getplugin("dsession"), "sched", None)
+        slots = min(sched.numnodes, config.bs_slots) if sched is not None else 1
+        totals = group_totals(ids, config.bs_durations)
+        config.bs_prediction = (predict_makespan(list(totals.values()), slots), slots)
+
+
+def pytest_sessionstart(session):
+    session.config.bs_started  = time.monotonic()
+    session.config.bs_finished = None
+
+
+# ── Slot-aware xdist scheduling & metrics ────────────────────
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption("dist") == "load":
+        return SlotScheduling(config, log)
+    return None
+
+
+# ── Drain background quits / status updates before the run ends ──
+def pytest_sessionfinish(session, exitstatus):
+    TEARDOWN.flush()
+    session.config.bs_finished = time.monotonic()
+    stream = session.config.bs_stream
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["bs_command_latency"] = RECORDER.samples()
+        session.config.workeroutput["bs_reduction"]       = session.config.bs_reduction
+        session.config.workeroutput["bs_cache_hits"]      = session.config.bs_cache_hits
+        session.config.workeroutput["bs_timeline"]        = TIMELINE.spans()
+        session.config.workeroutput["bs_pool_stats"]      = session.config.bs_pool_stats
+        if stream is not None:
+            stream.close()
+        if session.config.bs_cache is not None:
+            session.config.bs_cache.close()
+        return
+    if session.config.bs_cache is not None:
+        session.config.bs_cache.prune()
+        session.config.bs_cache.close()
+    if stream is not None:
+        stream.end_run(exitstatus)
+        stream.close()
+        if STREAM_REPORT:
+            render(RESULTS_STREAM, STREAM_REPORT)
+        if RESULTS_DB and session.config.bs_shard is None:   # shards are stored once, by merge_shards.py
+            store = ResultsStore(RESULTS_DB)
+            store.ingest_stream(RESULTS_STREAM, BUILD_NAME)
+            store.close()
+    if LATENCY_REPORT and RECORDER.samples():
+        RECORDER.export(LATENCY_REPORT)
+    if TIMELINE_REPORT and TIMELINE.spans():
+        session.config.bs_timeline = export_timeline(TIMELINE_REPORT, TIMELINE.spans())
+    if VISUAL_RESULTS:
+        path = Path(VISUAL_OUTPUT) / "results.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps([VISUAL_RESULTS[key] for key in sorted(VISUAL_RESULTS)], indent=2))
+    if CORPUS_RESULTS:
+        path = Path(CORPUS_REPORT)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(CORPUS_RESULTS, indent=2, sort_keys=True, ensure_ascii=False))
+    if PERF_RESULTS:
+        path = Path(PERF_REPORT)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(PERF_RESULTS, indent=2, sort_keys=True))
+        if PERF_UPDATE_BASELINE:
+            PerfBaseline(PERF_BASELINE, PERF_THRESHOLD).update(
+                {cfg_id: result["stats"] for cfg_id, result in PERF_RESULTS.items()}
+            )
+
+
+# ── Collect each xdist worker's command timings on the controller ──
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    output = getattr(node, "workeroutput", {})
+    RECORDER.extend(output.get("bs_command_latency", []))
+    TIMELINE.extend(output.get("bs_timeline", []))
+    for key, value in output.get("bs_pool_stats", {}).items():
+        node.config.bs_pool_stats[key] = node.config.bs_pool_stats.get(key, 0) + value
+    if node.config.bs_reduction is None:
+        node.config.bs_reduction = output.get("bs_reduction")   # identical on every worker
+    if node.config.bs_cache_hits is None:
+        node.config.bs_cache_hits = output.get("bs_cache_hits")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    for what, exc in TEARDOWN.errors:
+        terminalreporter.write_line(f"teardown: {what} failed: {exc!r}", yellow=True)
+    if hasattr(config, "workerinput"):
+        return
+    dsession = config.pluginmanager.getplugin("dsession")
+    sched    = getattr(dsession, "sched", None)
+    metrics  = sched.metrics() if isinstance(sched, SlotScheduling) else config.bs_scheduler.metrics()
+    terminalreporter.write_sep("-", "BrowserStack slots")
+    if config.bs_shard is not None:
+        terminalreporter.write_line(
+            f"shard {config.bs_shard[0]}/{config.bs_shard[1]} · {config.bs_slots} of {PARALLEL_SLOTS} slots"
+        )
+    terminalreporter.write_line(
+        f"slots {metrics['peak_slots']}/{metrics['slots']} peak · "
+        f"utilisation {metrics['utilisation']:.0%} · "
+        f"peak queue depth {metrics['peak_queue_depth']}"
+    )
+    pool = config.bs_pool_stats
+    if pool:
+        terminalreporter.write_line(
+            f"sessions {pool['created']} created · {pool['reused']} reuses · "
+            f"{pool['prewarmed']} pre-warmed ({pool['prewarm_unused']} unused) · {pool['retired']} retired"
+        )
+    if config.bs_finished is not None and config.bs_prediction is not None:
+        predicted, slots = config.bs_prediction
+        actual = config.bs_finished - config.bs_started
+        terminalreporter.write_line(
+            f"makespan predicted {predicted:.1f}s on {slots} slot(s) · actual {actual:.1f}s "
+            f"({TEST_ORDERING} ordering)"
+        )
+
+    if config.bs_cache_hits is not None:
+        terminalreporter.write_line(
+            f"skip cache: {config.bs_cache_hits} (test, config) pairs skipped as cached passes"
+            + (" (--no-cache: all run)" if config.getoption("no_cache") else "")
+        )
+
+    reduction = config.bs_reduction
+    if reduction:
+        saved = reduction["pairs_full"] - reduction["pairs_run"]
+        terminalreporter.write_sep("-", f"matrix reduction ({reduction['mode']}, seed {reduction['seed']})")
+        terminalreporter.write_line(
+            f"ran {reduction['pairs_run']}/{reduction['pairs_full']} (test, config) pairs · "
+            f"{saved} skipped · ~{reduction['seconds_saved']:.0f}s of ~{reduction['seconds_full']:.0f}s saved"
+        )
+        engines = set(reduction["engines"])
+        partial = {t: r for t, r in reduction["reduced_tests"].items() if set(r["engines"]) != engines}
+        terminalreporter.write_line(
+            f"{len(reduction['reduced_tests'])} engine-agnostic tests still cover "
+            f"{'/'.join(reduction['engines'])}" + (f"; {len(partial)} lost an engine" if partial else "")
+        )
+        for test, result in partial.items():
+            terminalreporter.write_line(f"  {test}: {', '.join(result['engines']) or 'no engine'}", yellow=True)
+
+    bottlenecks = RECORDER.bottlenecks(top=5)
+    if bottlenecks:
+        terminalreporter.write_sep("-", "slowest WebDriver commands (p95)")
+        for cfg_id, command, stat in bottlenecks:
+            terminalreporter.write_line(
+                f"{cfg_id:<16} {command:<40} n={stat['count']:<4} p50={stat['p50_ms']:.1f}ms "
+                f"p95={stat['p95_ms']:.1f}ms p99={stat['p99_ms']:.1f}ms"
+            )
+        if LATENCY_REPORT:
+            terminalreporter.write_line(f"full histograms: {LATENCY_REPORT}")
+
+    if PERF_RESULTS:
+        terminalreporter.write_sep("-", "login performance (click → inventory)")
+        for cfg_id, result in sorted(PERF_RESULTS.items()):
+            stats = result["stats"]
+            terminalreporter.write_line(
+                f"{cfg_id:<16} n={stats['n']:<3} p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms "
+                f"p99={stats['p99_ms']:.0f}ms {'REGRESSED' if result['regressions'] else ''}"
+            )
+        if PERF_UPDATE_BASELINE:
+            terminalreporter.write_line(f"baseline updated: {PERF_BASELINE}")
+
+    if VISUAL_RESULTS:
+        results = sorted(VISUAL_RESULTS.values(), key=lambda r: -r["score"])
+        failed  = [r for r in results if not r["passed"]]
+        terminalreporter.write_sep("-", "visual regression")
+        terminalreporter.write_line(
+            f"{len(results)} captures · {len(failed)} differ · "
+            f"{sum(r['elapsed_ms'] for r in results):.0f} ms comparing · details: {VISUAL_OUTPUT}/results.json"
+        )
+        for r in failed[:10]:
+            terminalreporter.write_line(f"{r['config']:<16} {r['state']:<8} {r['reason']}", red=True)
+
+    timeline = terminalreporter.config.bs_timeline
+    if timeline:
+        sessions = timeline["sessions"]
+        critical = timeline["critical_path"]
+        terminalreporter.write_sep("-", "run timeline")
+        terminalreporter.write_line(
+            f"wall {timeline['wall_s']:.1f}s · {timeline['slots']} slot(s) · "
+            f"utilisation {timeline['utilisation']:.0%} · {timeline['idle_slot_s']:.1f} slot-s idle · "
+            f"{sessions['count']} sessions, peak {sessions['peak_live']} live (mean {sessions['mean_live']})"
+        )
+        terminalreporter.write_line(
+            f"session creation {sessions['creation_total_s']:.1f}s (max {sessions['creation_max_s']:.1f}s) · "
+            f"slot waits {sessions['slot_wait_total_s']:.1f}s"
+        )
+        for slot, row in timeline["by_slot"].items():
+            spent = ", ".join(f"{kind} {seconds:.1f}s" for kind, seconds in
+                              sorted(row["self_time_s"].items(), key=lambda kv: -kv[1])[:4])
+            terminalreporter.write_line(
+                f"{slot:<6} busy {row['busy_s']:.1f}s ({row['utilisation']:.0%}) · {row['tests']} tests · {spent}"
+            )
+        terminalreporter.write_line(
+            f"critical path: {critical['slot']} finished at {critical['finished_at_s']:.1f}s · "
+            f"longest config {critical['longest_config']} {critical['longest_config_s']:.1f}s"
+        )
+        terminalreporter.write_line(f"trace: {TIMELINE_REPORT} (open in ui.perfetto.dev)")
+
+    if ELEMENT_CACHE:
+        totals = {key: sum(stats[key] for stats in ELEMENT_CACHE.values())
+                  for key in ("hits", "misses", "stale", "invalidations")}
+        lookups = totals["hits"] + totals["misses"]
+        terminalreporter.write_sep("-", "element cache")
+        terminalreporter.write_line(
+            f"{totals['hits']}/{lookups} element lookups served from cache "
+            f"({totals['hits'] / lookups:.0%} find_element round trips avoided) · "
+            f"{totals['stale']} stale recoveries · {totals['invalidations']} navigations"
+            if lookups else "no element lookups"
+        )
+        for nodeid, stats in sorted(ELEMENT_CACHE.items(), key=lambda kv: -kv[1]["hits"])[:5]:
+            terminalreporter.write_line(f"  {stats['hits']:>3} hits {stats['misses']:>3} misses  {nodeid}")
+
+    if CAPTURE_RERUNS:
+        terminalreporter.write_sep("-", "full-capture reruns")
+        for nodeid, record in sorted(CAPTURE_RERUNS.items()):
+            terminalreporter.write_line(nodeid)
+            for attempt in record["attempts"]:
+                terminalreporter.write_line(
+                    f"  #{attempt['attempt']} {attempt['capture']:<5} {attempt['outcome']:<6} {attempt['url']}",
+                    red=attempt["outcome"] == "failed",
+                )
+
+    if CORPUS_RESULTS:
+        terminalreporter.write_sep("-", "payload corpus")
+        for cfg_id, result in sorted(CORPUS_RESULTS.items()):
+            failed = result["cases"] - result["passed"]
+            terminalreporter.write_line(
+                f"{cfg_id:<16} {result['passed']}/{result['cases']} as expected in "
+                f"{result['script_calls']} script calls"
+                + "".join(f" · {name} {c['passed']}/{c['cases']}"
+                          for name, c in result["categories"].items() if c["passed"] < c["cases"]),
+                red=bool(failed),
+            )
+        terminalreporter.write_line(f"details: {CORPUS_REPORT}")
+
+    # Slowest explicit waits (per config / condition), worker-local under xdist
+    waits = [(stat["max"], cfg_id, label, stat)
+             for cfg_id, labels in wait_stats().items() for label, stat in labels.items()]
+    if waits:
+        terminalreporter.write_sep("-", "slowest explicit waits")
+        for _, cfg_id, label, stat in sorted(waits, reverse=True)[:5]:
+            terminalreporter.write_line(
+                f"{cfg_id:<16} {label:<40} n={stat['count']:<4} mean={stat['mean']:.3f}s max={stat['max']:.3f}s"
+            )
@@ -0,0 +1,98 @@
+"""
+============================================================
+  dom_snapshot.py
+  One-round-trip DOM snapshot for UI assertions
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Every WebDriver call is an HTTP round trip to the hub (and on
+real devices, on to the phone). Instead of find_element +
+get_attribute + is_displayed + execute_script per property, a
+test declares the locators it cares about and gets visibility,
+attributes, computed styles, focus and viewport metrics back
+from a single `execute_script`.
+
+    snap = take_snapshot(driver, {"password": (By.ID, "password")},
+                         attributes=("type",))
+    assert snap["password"].attributes["type"] == "password"
+"""
+
+from dataclasses import dataclass, field
+
+from selenium.webdriver.common.by import By
+
+DEFAULT_ATTRIBUTES = ("type", "placeholder", "value")
+DEFAULT_STYLES     = ("color", "background-color", "display", "visibility")
+
+# ES5 on purpose: it also runs on the oldest Safari/iPadOS in the matrix.
+SNAPSHOT_SCRIPT = """/* domSnapshot */
+var spec = arguments[0], attrs = arguments[1], styles = arguments[2];
+var doc = document.documentElement, active = document.activeElement;
+var out = {elements: {}, activeElementId: active ? active.id : "",
+           viewport: {scrollWidth: doc.scrollWidth, clientWidth: doc.clientWidth,
+                      scrollHeight: doc.scrollHeight, clientHeight: doc.clientHeight,
+                      innerWidth: window.innerWidth, devicePixelRatio: window.devicePixelRatio}};
+for (var name in spec) {
+  var el = document.querySelector(spec[name]);
+  if (!el) { out.elements[name] = null; continue; }
+  var cs = window.getComputedStyle(el), rect = el.getBoundingClientRect(), a = {}, s = {}, i;
+  for (i = 0; i < attrs.length; i++) {
+    var v = attrs[i] in el && typeof el[attrs[i]] !== "object" && typeof el[attrs[i]] !== "function"
+          ? el[attrs[i]] : el.getAttribute(attrs[i]);
+    a[attrs[i]] = v === undefined ? null : v;
+  }
+  for (i = 0; i < styles.length; i++) { s[styles[i]] = cs.getPropertyValue(styles[i]); }
+  out.elements[name] = {
+    visible: cs.display !== "none" && cs.visibility !== "hidden" && cs.opacity !== "0"
+             && rect.width > 0 && rect.height > 0,
+    text: (el.innerText || el.textContent || "").trim(),
+    attributes: a, styles: s, focused: el === active
+  };
+}
+return out;"""
+
+
+def to_css(by: str, value: str) -> str:
+    """Translate a (By, value) locator to the CSS selector querySelector needs."""
+    if by == By.ID:
+        return f'[id="{value}"]'
+    if by == By.CLASS_NAME:
+        return f".{value}"
+    if by == By.NAME:
+        return f'[name="{value}"]'
+    if by == By.TAG_NAME:
+        return value
+    if by == By.CSS_SELECTOR:
+        return value
+    raise ValueError(f"Snapshot locators must be CSS-expressible, got {by!r}")
+
+
+@dataclass
+class ElementState:
+    present   : bool
+    visible   : bool = False
+    text      : str  = ""
+    attributes: dict = field(default_factory=dict)
+    styles    : dict = field(default_factory=dict)
+    focused   : bool = False
+
+
+@dataclass
+class PageSnapshot:
+    elements         : dict
+    viewport         : dict
+    active_element_id: str
+
+    def __getitem__(self, name: str) -> ElementState:
+        return self.elements[name]
+
+
+def take_snapshot(driver, locators: dict, attributes=DEFAULT_ATTRIBUTES, styles=DEFAULT_STYLES) -> PageSnapshot:
+    """Collect the state of every named locator in one `execute_script` round trip."""
+    spec = {name: to_css(by, value) for name, (by, value) in locators.items()}
+    raw  = driver.execute_script(SNAPSHOT_SCRIPT, spec, list(attributes), list(styles))
+    elements = {
+        name: ElementState(present=True, **state) if state else ElementState(present=False)
+        for name, state in raw["elements"].items()
+    }
+    return PageSnapshot(elements, raw["viewport"], raw["activeElementId"] or "")
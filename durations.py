@@ -0,0 +1,128 @@
+"""
+============================================================
+  durations.py
+  Duration-aware ordering of the (test, config) matrix
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Tests of one config stay contiguous (their pooled session stays
+warm), so the unit of scheduling is a config group. Groups are
+ordered longest-processing-time first: the slow real devices
+start while there are still short desktop groups left to fill
+the other slots at the end. Within a group, long tests run first
+too, so a group split across two slots balances as well.
+
+Estimates per test node id, most specific first:
+  1. its mean duration over the last HISTORY_BUILDS builds
+  2. the mean of the same test on the other configs, scaled by
+     how slow this config is relative to all configs
+  3. this config's mean test duration
+  4. DEFAULT_TEST_SECONDS (× MOBILE_FACTOR for real devices)
+
+predict_makespan() replays greedy list scheduling of the groups
+onto N slots; the prediction is reported next to the actual wall
+time in the terminal summary.
+
+fingerprint() identifies the history a model was built from, so
+`--shard` jobs can prove they partitioned on the same one.
+"""
+
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import heapq
+
+from browserstack_config import (
+    BROWSER_MATRIX, RESULTS_DB, HISTORY_BUILDS, DEFAULT_TEST_SECONDS, MOBILE_FACTOR,
+)
+
+_PARAM = re.compile(r"\[([^\]]+)\]$")
+
+
+def split_nodeid(nodeid: str):
+    """'file::Class::test_x[cfg]' → ('file::Class::test_x', 'cfg')."""
+    m = _PARAM.search(nodeid)
+    return (nodeid[:m.start()], m.group(1)) if m else (nodeid, "")
+
+
+class DurationModel:
+    """Per-node-id duration estimates from the results history, with fallbacks."""
+
+    def __init__(self, by_nodeid: dict = None):
+        self.by_nodeid = by_nodeid or {}
+        by_test, by_config = {}, {}
+        for nodeid, seconds in self.by_nodeid.items():
+            test, config = split_nodeid(nodeid)
+            by_test.setdefault(test, []).append(seconds)
+            by_config.setdefault(config, []).append(seconds)
+        self.by_test    = {k: sum(v) / len(v) for k, v in by_test.items()}
+        self.by_config  = {k: sum(v) / len(v) for k, v in by_config.items()}
+        self.overall    = (sum(self.by_nodeid.values()) / len(self.by_nodeid)) if self.by_nodeid else None
+        self.mobile_ids = {c["id"] for c in BROWSER_MATRIX if c.get("real_mobile")}
+
+    @classmethod
+    def from_history(cls, path=RESULTS_DB, last: int = HISTORY_BUILDS) -> "DurationModel":
+        """Mean setup+call duration per node id over the last builds (skips count, at ~0 s)."""
+        if not path or not os.path.exists(path):
+            return cls()
+        db = sqlite3.connect(path)
+        try:
+            rows = db.execute("""
+                SELECT nodeid, AVG(duration) FROM results
+                WHERE build_id >= (SELECT MIN(id) FROM (SELECT id FROM builds ORDER BY id DESC LIMIT ?))
+                GROUP BY nodeid""", (last,)).fetchall()
+        except sqlite3.Error:
+            rows = []
+        finally:
+            db.close()
+        return cls(dict(rows))
+
+    def fingerprint(self) -> str:
+        """Short hash of the per-node-id durations ("" for an empty history)."""
+        if not self.by_nodeid:
+            return ""
+        rows = sorted((nodeid, round(seconds, 4)) for nodeid, seconds in self.by_nodeid.items())
+        return hashlib.sha256(json.dumps(rows).encode("utf-8")).hexdigest()[:12]
+
+    def estimate(self, nodeid: str) -> float:
+        if nodeid in self.by_nodeid:
+            return self.by_nodeid[nodeid]
+        test, config = split_nodeid(nodeid)
+        config_factor = self.by_config[config] / self.overall if config in self.by_config else None
+        if test in self.by_test:
+            return self.by_test[test] * (config_factor or 1.0)
+        if config in self.by_config:
+            return self.by_config[config]
+        return DEFAULT_TEST_SECONDS * (MOBILE_FACTOR if config in self.mobile_ids else 1.0)
+
+
+def lpt_order(items: list, model: DurationModel, group=lambda item: split_nodeid(item.nodeid)[1]) -> list:
+    """Config groups longest first, tests longest first inside each group (ties keep collection order)."""
+    groups = {}
+    for index, item in enumerate(items):
+        groups.setdefault(group(item), []).append((index, item))
+    totals = {key: sum(model.estimate(item.nodeid) for _, item in members) for key, members in groups.items()}
+    ordered = []
+    for key in sorted(groups, key=lambda k: -totals[k]):
+        members = sorted(groups[key], key=lambda pair: (-model.estimate(pair[1].nodeid), pair[0]))
+        ordered.extend(item for _, item in members)
+    return ordered
+
+
+def group_totals(nodeids, model: DurationModel) -> dict:
+    """{config id: estimated seconds}, in first-seen order of `nodeids`."""
+    totals = {}
+    for nodeid in nodeids:
+        config = split_nodeid(nodeid)[1]
+        totals[config] = totals.get(config, 0.0) + model.estimate(nodeid)
+    return totals
+
+
+def predict_makespan(totals: list, slots: int) -> float:
+    """Greedy list scheduling of group totals (in the given order) onto `slots` slots."""
+    loads = [0.0] * max(1, slots)
+    for seconds in totals:
+        heapq.heapreplace(loads, loads[0] + seconds)
+    return max(loads)
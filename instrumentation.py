@@ -0,0 +1,157 @@
+"""
+============================================================
+  instrumentation.py
+  Per-command WebDriver latency, tagged by test and config
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Every command a RemoteWebDriver sends goes through its
+`execute(command, params)` method. create_driver swaps that
+method for a CommandTimer, which times the round trip and records
+it with the browser config id and the test currently holding the
+session (set by the `browser` fixture). Session creation is timed
+by create_driver itself and recorded as `newSession`.
+
+Samples are aggregated into histograms with p50/p95/p99 per
+config × command, exported as JSON at the end of the run, and
+summarised in the pytest-html environment block. Under xdist,
+workers hand their samples to the controller through
+`workeroutput`, so the JSON always covers the whole run.
+"""
+
+import json
+import math
+import time
+import threading
+from pathlib import Path
+
+from run_timeline import TIMELINE
+
+# Histogram bucket upper bounds, milliseconds (last bucket is open-ended)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+NAVIGATION = {"get", "goBack", "goForward", "refresh"}
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0 for an empty list)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank    = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarise(samples: list) -> dict:
+    """count / mean / p50 / p95 / p99 / max (ms) plus bucket counts for a list of seconds."""
+    ms        = [s * 1000 for s in samples]
+    histogram = {f"<={b}ms": 0 for b in BUCKETS_MS}
+    histogram[f">{BUCKETS_MS[-1]}ms"] = 0
+    for value in ms:
+        bound = next((b for b in BUCKETS_MS if value <= b), None)
+        histogram[f"<={bound}ms" if bound is not None else f">{BUCKETS_MS[-1]}ms"] += 1
+    return {
+        "count"    : len(ms),
+        "mean_ms"  : round(sum(ms) / len(ms), 2) if ms else 0.0,
+        "p50_ms"   : round(percentile(ms, 50), 2),
+        "p95_ms"   : round(percentile(ms, 95), 2),
+        "p99_ms"   : round(percentile(ms, 99), 2),
+        "max_ms"   : round(max(ms), 2) if ms else 0.0,
+        "histogram": histogram,
+    }
+
+
+class LatencyRecorder:
+    """Thread-safe store of (config id, test node id, command, seconds) samples."""
+
+    def __init__(self):
+        self._samples = []
+        self._lock    = threading.Lock()
+
+    def record(self, config_id: str, nodeid: str, command: str, seconds: float):
+        with self._lock:
+            self._samples.append((config_id, nodeid, command, seconds))
+
+    def extend(self, samples):
+        with self._lock:
+            self._samples.extend(tuple(s) for s in samples)
+
+    def samples(self) -> list:
+        with self._lock:
+            return list(self._samples)
+
+    def report(self) -> dict:
+        """{by_config: {cfg: {cmd: summary}}, by_command: {cmd: summary}, by_test: {nodeid: {...}}}"""
+        by_config, by_command, by_test = {}, {}, {}
+        for config_id, nodeid, command, seconds in self.samples():
+            by_config.setdefault(config_id, {}).setdefault(command, []).append(seconds)
+            by_command.setdefault(command, []).append(seconds)
+            if nodeid:
+                by_test.setdefault(nodeid, []).append(seconds)
+        return {
+            "by_config" : {cfg: {cmd: summarise(s) for cmd, s in sorted(cmds.items())}
+                           for cfg, cmds in sorted(by_config.items())},
+            "by_command": {cmd: summarise(s) for cmd, s in sorted(by_command.items())},
+            "by_test"   : {nodeid: {"commands": len(s), "total_ms": round(sum(s) * 1000, 2)}
+                           for nodeid, s in sorted(by_test.items())},
+        }
+
+    def export(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+    def bottlenecks(self, top: int = 3) -> list:
+        """The `top` config × command pairs by p95, as (config, command, summary)."""
+        rows = [(cfg, cmd, stat) for cfg, cmds in self.report()["by_config"].items()
+                for cmd, stat in cmds.items()]
+        return sorted(rows, key=lambda row: row[2]["p95_ms"], reverse=True)[:top]
+
+
+RECORDER = LatencyRecorder()
+
+
+class CommandTimer:
+    """Replaces `driver.execute`; times each command and records it under the current test."""
+
+    def __init__(self, execute, config_id: str, recorder: LatencyRecorder = RECORDER):
+        self._execute  = execute
+        self.config_id = config_id
+        self.recorder  = recorder
+        self.nodeid    = ""       # test currently using the session ("" = setup/pre-warm/teardown)
+        self.listeners = []       # callables(command) run after every command (login_page.py)
+
+    def __call__(self, driver_command: str, params: dict = None):
+        wall  = time.time()
+        start = time.perf_counter()
+        try:
+            return self._execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.recorder.record(self.config_id, self.nodeid, driver_command, elapsed)
+            TIMELINE.span(driver_command, "navigation" if driver_command in NAVIGATION else "command",
+                          self.config_id, wall, wall + elapsed)
+            for listener in self.listeners:
+                listener(driver_command)
+
+
+def instrument(driver, config: dict, recorder: LatencyRecorder = RECORDER):
+    """Route every command of `driver` through a CommandTimer."""
+    driver.execute = CommandTimer(driver.execute, config["id"], recorder)
+    return driver
+
+
+def on_command(driver, listener) -> bool:
+    """Call `listener(command)` after each command of an instrumented driver (False if not instrumented)."""
+    timer = driver.__dict__.get("execute")
+    if isinstance(timer, CommandTimer):
+        timer.listeners.append(listener)
+        return True
+    return False
+
+
+def tag_test(driver, nodeid: str):
+    """Attribute the driver's following commands to `nodeid` ("" to clear)."""
+    timer = driver.__dict__.get("execute")
+    if isinstance(timer, CommandTimer):
+        timer.nodeid = nodeid
@@ -0,0 +1,240 @@
+"""
+============================================================
+  load_test.py
+  HTTP-level load generation from the login scenarios
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+The browser tests drive one session per config. This replays
+the same login scenarios as concurrent HTTP traffic to check the
+login path under load rather than across browsers.
+
+SauceDemo checks credentials in its client bundle, so on the wire
+a scenario is what a cold-cache browser requests:
+
+  1. GET /  plus every script / stylesheet the page links
+  2. if the credentials are accepted (saucedemo.login_accepted
+     mirrors the client check): GET /inventory.html plus its assets
+
+Virtual users arrive at a constant rate that ramps up linearly,
+each running the next scenario in turn on one asyncio event loop.
+Requests share a bounded pool of keep-alive connections
+(async_driver.HubConnectionPool). Arrivals beyond --max-in-flight
+are dropped and counted; that is the overload signal.
+
+Reported: throughput (scenarios/s, requests/s), latency
+percentiles per scenario and per request kind, error rates,
+status codes and a per-second timeline. --max-error-rate and
+--max-p95-ms turn the run into a pass/fail check.
+
+Usage:
+    python load_test.py --rate 50 --ramp-up 10 --duration 60
+    BS_LOCAL_GRID=1 python load_test.py --rate 200 --duration 10   # against the local stub
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from browserstack_config import (
+    TARGET_URL, LOAD_RATE, LOAD_RAMP_UP, LOAD_DURATION, LOAD_CONNECTIONS, LOAD_TIMEOUT, LOAD_REPORT,
+)
+from async_driver import HubConnectionPool
+from instrumentation import summarise
+from saucedemo import login_accepted, DASHBOARD_PATH
+from skip_cache import ASSET_PATTERN
+
+# Same credentials as the browser scenarios in test_crossbrowser_login.py.
+SCENARIOS = [
+    ("valid_user",     "standard_user",                  "secret_sauce"),
+    ("locked_user",    "locked_out_user",                "secret_sauce"),
+    ("problem_user",   "problem_user",                   "secret_sauce"),
+    ("wrong_password", "standard_user",                  "bad_password!"),
+    ("sql_injection",  "' OR 1=1 --",                    "' OR '1'='1"),
+    ("xss_payload",    "<script>alert('xss')</script>",  "secret_sauce"),
+]
+
+NETWORK_ERRORS = (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, OSError, ValueError)
+
+
+class LoadStats:
+    """Latencies (seconds) and errors per scenario and per request kind."""
+
+    def __init__(self):
+        self.started   = time.monotonic()
+        self.scenarios = {}      # name → {"latencies": [...], "errors": 0}
+        self.requests  = {}      # kind → {"latencies": [...], "errors": 0}
+        self.statuses  = {}      # HTTP status (or exception name) → count
+        self.timeline  = {}      # second → {"completed": n, "errors": n}
+        self.arrivals  = 0
+        self.dropped   = 0
+
+    def request(self, kind: str, seconds: float, outcome, ok: bool):
+        entry = self.requests.setdefault(kind, {"latencies": [], "errors": 0})
+        entry["latencies"].append(seconds)
+        entry["errors"] += not ok
+        self.statuses[str(outcome)] = self.statuses.get(str(outcome), 0) + 1
+
+    def scenario(self, name: str, seconds: float, ok: bool):
+        entry = self.scenarios.setdefault(name, {"latencies": [], "errors": 0})
+        entry["latencies"].append(seconds)
+        entry["errors"] += not ok
+        second = self.timeline.setdefault(int(time.monotonic() - self.started), {"completed": 0, "errors": 0})
+        second["completed"] += 1
+        second["errors"]    += not ok
+
+    def report(self, target: str, pool_stats: dict) -> dict:
+        wall      = time.monotonic() - self.started
+        completed = sum(len(e["latencies"]) for e in self.scenarios.values())
+        errors    = sum(e["errors"] for e in self.scenarios.values())
+        requests  = sum(len(e["latencies"]) for e in self.requests.values())
+
+        def table(entries):
+            return {name: {**summarise(e["latencies"]), "errors": e["errors"],
+                           "error_rate": round(e["errors"] / len(e["latencies"]), 4) if e["latencies"] else 0.0}
+                    for name, e in sorted(entries.items())}
+
+        return {
+            "target"       : target,
+            "wall_seconds" : round(wall, 2),
+            "arrivals"     : self.arrivals,
+            "dropped"      : self.dropped,
+            "completed"    : completed,
+            "error_rate"   : round(errors / completed, 4) if completed else 0.0,
+            "scenarios_per_second": round(completed / wall, 2) if wall else 0.0,
+            "requests_per_second" : round(requests / wall, 2) if wall else 0.0,
+            "all_scenarios": summarise([s for e in self.scenarios.values() for s in e["latencies"]]),
+            "by_scenario"  : table(self.scenarios),
+            "by_request"   : table(self.requests),
+            "statuses"     : dict(sorted(self.statuses.items())),
+            "timeline"     : [{"second": s, **v} for s, v in sorted(self.timeline.items())],
+            "pool"         : pool_stats,
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+#  SCENARIO
+# ─────────────────────────────────────────────────────────────
+def local_path(pool: HubConnectionPool, target: str, ref: str):
+    """Path on the target host for a page or asset reference (None if it lives elsewhere)."""
+    url = urlparse(urljoin(target, ref))
+    if url.hostname != pool.host:
+        return None
+    path = url.path or "/"
+    if pool.base_path and path.startswith(pool.base_path):
+        path = path[len(pool.base_path):] or "/"
+    return path + (f"?{url.query}" if url.query else "")
+
+
+async def fetch(pool, path: str, kind: str, stats: LoadStats, timeout: float):
+    """One GET; returns the body, or None (recorded as an error) on a failure."""
+    started = time.perf_counter()
+    try:
+        status, _, body = await asyncio.wait_for(pool.send("GET", path), timeout)
+    except NETWORK_ERRORS as exc:
+        stats.request(kind, time.perf_counter() - started, type(exc).__name__, ok=False)
+        return None
+    stats.request(kind, time.perf_counter() - started, status, ok=status < 400)
+    return body if status < 400 else None
+
+
+async def load_page(pool, target: str, path: str, kind: str, stats: LoadStats, timeout: float) -> bool:
+    """A page and, in parallel like a browser, every asset it links."""
+    html = await fetch(pool, path, kind, stats, timeout)
+    if html is None:
+        return False
+    assets = [local_path(pool, target, script or sheet)
+              for script, sheet in ASSET_PATTERN.findall(html.decode("utf-8", "replace"))]
+    results = await asyncio.gather(*(fetch(pool, a, "asset", stats, timeout) for a in assets if a))
+    return all(body is not None for body in results)
+
+
+async def run_scenario(pool, target: str, scenario: tuple, stats: LoadStats, timeout: float):
+    name, username, password = scenario
+    started = time.perf_counter()
+    ok = await load_page(pool, target, local_path(pool, target, target), "login_page", stats, timeout)
+    if ok and login_accepted(username, password):
+        ok = await load_page(pool, target, local_path(pool, target, DASHBOARD_PATH), "inventory", stats, timeout)
+    stats.scenario(name, time.perf_counter() - started, ok)
+
+
+# ─────────────────────────────────────────────────────────────
+#  ARRIVALS
+# ─────────────────────────────────────────────────────────────
+async def generate_load(target=TARGET_URL, rate=LOAD_RATE, ramp_up=LOAD_RAMP_UP, duration=LOAD_DURATION,
+                        connections=LOAD_CONNECTIONS, timeout=LOAD_TIMEOUT, max_in_flight=1000) -> dict:
+    """Run the arrival loop for `duration` seconds, wait for stragglers, return the report."""
+    pool     = HubConnectionPool(target, max_connections=connections)
+    stats    = LoadStats()
+    in_flight = set()
+    loop     = asyncio.get_running_loop()
+    start    = last = loop.time()
+    due      = 0.0
+    try:
+        while (now := loop.time()) - start < duration:
+            current = rate * min(1.0, (now - start) / ramp_up) if ramp_up > 0 else rate
+            due    += current * (now - last)
+            last    = now
+            while due >= 1.0:
+                due -= 1.0
+                stats.arrivals += 1
+                if len(in_flight) >= max_in_flight:
+                    stats.dropped += 1
+                    continue
+                scenario = SCENARIOS[stats.arrivals % len(SCENARIOS)]
+                task = asyncio.create_task(run_scenario(pool, target, scenario, stats, timeout))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+            await asyncio.sleep(0.005)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        await pool.close()
+    return stats.report(target, dict(pool.stats))
+
+
+def print_report(report: dict):
+    print(f"target {report['target']} · {report['wall_seconds']}s · {report['arrivals']} arrivals · "
+          f"{report['dropped']} dropped")
+    print(f"throughput {report['scenarios_per_second']} scenarios/s · {report['requests_per_second']} requests/s · "
+          f"error rate {report['error_rate']:.2%}")
+    for title, rows in (("scenario", report["by_scenario"]), ("request", report["by_request"])):
+        print(f"  {title:<16} {'n':>6} {'err%':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  (ms)")
+        for name, row in rows.items():
+            print(f"  {name:<16} {row['count']:>6} {row['error_rate']:>7.2%} {row['p50_ms']:>8.1f} "
+                  f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}")
+    print(f"  statuses {report['statuses']} · pool {report['pool']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the login scenarios as concurrent HTTP load.")
+    parser.add_argument("--target", default=TARGET_URL)
+    parser.add_argument("--rate", type=float, default=LOAD_RATE, help="scenarios started per second")
+    parser.add_argument("--ramp-up", type=float, default=LOAD_RAMP_UP, help="seconds to reach --rate")
+    parser.add_argument("--duration", type=float, default=LOAD_DURATION, help="seconds of arrivals")
+    parser.add_argument("--connections", type=int, default=LOAD_CONNECTIONS)
+    parser.add_argument("--timeout", type=float, default=LOAD_TIMEOUT, help="per request, seconds")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--max-error-rate", type=float, default=None, help="fail above this fraction")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="fail above this scenario p95")
+    parser.add_argument("-o", "--output", default=LOAD_REPORT)
+    args = parser.parse_args()
+
+    report = asyncio.run(generate_load(args.target, args.rate, args.ramp_up, args.duration,
+                                       args.connections, args.timeout, args.max_in_flight))
+    print_report(report)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    failures = []
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {report['error_rate']:.2%} > {args.max_error_rate:.2%}")
+    if args.max_p95_ms is not None and report["all_scenarios"]["p95_ms"] > args.max_p95_ms:
+        failures.append(f"scenario p95 {report['all_scenarios']['p95_ms']:.0f} ms > {args.max_p95_ms:.0f} ms")
+    if failures:
+        sys.exit("FAILED: " + "; ".join(failures))
@@ -0,0 +1,959 @@
+"""
+============================================================
+  local_grid.py
+  Offline stand-in for the BrowserStack hub + SauceDemo login
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+An in-process HTTP server that speaks the subset of the W3C
+WebDriver protocol our helpers use and "renders" a stub of the
+SauceDemo login flow:
+
+  /wd/hub/session/...   WebDriver endpoints (sessions, navigation,
+                        element lookup, keys, clicks, cookies,
+                        attributes, CSS values, execute script,
+                        screenshots painted from the stub layout)
+  /, /inventory.html    Static HTML stub of the two pages, plus the
+                        /static/ assets they reference
+  /automate/sessions/   REST status updates (PUT <id>.json)
+
+Nothing is executed as real JavaScript: scripts sent through
+`execute_script` are dispatched on their leading `/* name */`
+tag (the convention Selenium's own atoms use) or on their exact
+text, see SCRIPTS. Unknown scripts fail loudly with a JavaScript
+error so a missing emulation never passes silently.
+
+Latency is injected per command and per session start, so the
+harness's own overhead (pooling, parallelism, waits) can be
+benchmarked on a laptop with no network:
+
+  BS_LOCAL_GRID_LATENCY_MS   delay before every WebDriver command
+  BS_LOCAL_GRID_SESSION_MS   extra delay when a session starts
+  BS_LOCAL_GRID_GLITCH_MS    login delay for performance_glitch_user
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import zlib
+import base64
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, unquote
+
+from saucedemo import USERS, ERR_NOT_LOGGED_IN, DASHBOARD_PATH, login_error
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+HUB_PREFIX     = "/wd/hub"
+SESSION_COOKIE = "session-username"
+
+# W3C special keys (selenium.webdriver.common.keys.Keys)
+KEY_BACKSPACE = "\ue003"
+KEY_TAB       = "\ue004"
+KEY_RETURN    = "\ue006"
+KEY_ENTER     = "\ue007"
+
+
+# ─────────────────────────────────────────────────────────────
+#  STATIC STUB PAGES (served over plain HTTP)
+# ─────────────────────────────────────────────────────────────
+LOGIN_HTML = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Swag Labs</title>
+<link rel="stylesheet" href="/static/css/main.css">
+<script src="/static/js/main.js" defer></script></head>
+<body><div class="login_logo">Swag Labs</div>
+<form id="login_form">
+  <input id="user-name" name="user-name" class="input_error form_input" placeholder="Username" type="text" data-test="username">
+  <input id="password" name="password" class="input_error form_input" placeholder="Password" type="password" data-test="password">
+  <input id="login-button" name="login-button" class="submit-button btn_action" type="submit" value="Login" data-test="login-button">
+</form></body></html>
+"""
+
+INVENTORY_HTML = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Swag Labs</title>
+<link rel="stylesheet" href="/static/css/main.css"></head>
+<body><button id="react-burger-menu-btn">Open Menu</button>
+<nav class="bm-item-list"><a id="logout_sidebar_link" href="/">Logout</a></nav>
+<div class="inventory_list"><div class="inventory_item">Sauce Labs Backpack</div></div>
+</body></html>
+"""
+
+STATIC_ASSETS = {
+    "/static/css/main.css": ("text/css", ".login_logo{font-size:24px}.error-message-container{color:#132322}"),
+    "/static/js/main.js"  : ("application/javascript", "/* SauceDemo stub bundle */"),
+}
+
+
+# ─────────────────────────────────────────────────────────────
+#  SIMULATED DOM
+# ─────────────────────────────────────────────────────────────
+class Element:
+    """A flat stand-in for a DOM node: tag, attributes, text, visibility, style."""
+
+    def __init__(self, tag, text="", displayed=True, focusable=False, style=None, **attrs):
+        self.tag       = tag
+        self.attrs     = {k.replace("_", "-"): v for k, v in attrs.items()}
+        self.text      = text
+        self.displayed = displayed
+        self.focusable = focusable
+        self.style     = {"display": "block", "visibility": "visible",
+                          "color": "rgba(72, 76, 85, 1)", **(style or {})}
+        self.value     = self.attrs.get("value", "")
+        self.on_click  = None
+
+    @property
+    def id(self) -> str:
+        return self.attrs.get("id", "")
+
+    @property
+    def classes(self) -> list:
+        return self.attrs.get("class", "").split()
+
+    def attribute(self, name):
+        if name == "value" and self.tag in ("input", "textarea"):
+            return self.value
+        return self.attrs.get(name)
+
+
+class Document:
+    """One loaded page. Element references are only valid for their document."""
+
+    def __init__(self, url: str, title: str, elements: list):
+        self.url         = url
+        self.title       = title
+        self.elements    = elements
+        self.generation  = uuid.uuid4().hex[:8]
+        self.time_origin = time.time() * 1000     # epoch ms, like performance.timeOrigin
+
+    def ref(self, element: Element) -> str:
+        return f"{self.generation}-{self.elements.index(element)}"
+
+    def by_id(self, element_id: str):
+        return next((e for e in self.elements if e.id == element_id), None)
+
+
+# ── CSS selector subset: tag, #id, .class, [attr], [attr=value] ──
+_SELECTOR_TOKEN = re.compile(r"""
+      \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[(?P<attr>[\w-]+)(?:\s*=\s*(?P<q>["']?)(?P<val>.*?)(?P=q))?\]
+    | (?P<tag>[a-zA-Z][\w-]*)
+""", re.VERBOSE)
+
+
+def css_matches(element: Element, selector: str) -> bool:
+    """Match a single compound selector (descendant combinators use the last part)."""
+    compound = selector.strip().split()[-1] if selector.strip() else ""
+    pos = 0
+    while pos < len(compound):
+        m = _SELECTOR_TOKEN.match(compound, pos)
+        if not m:
+            return False
+        pos = m.end()
+        if m.group("id") is not None and element.id != m.group("id"):
+            return False
+        if m.group("cls") is not None and m.group("cls") not in element.classes:
+            return False
+        if m.group("tag") is not None and element.tag != m.group("tag").lower():
+            return False
+        if m.group("attr") is not None:
+            actual = element.attribute(m.group("attr"))
+            if actual is None or (m.group("val") is not None and actual != m.group("val")):
+                return False
+    return bool(compound)
+
+
+def locate(document: Document, using: str, value: str) -> list:
+    if using == "css selector":
+        return [e for e in document.elements if css_matches(e, value)]
+    if using == "tag name":
+        return [e for e in document.elements if e.tag == value.lower()]
+    if using == "link text":
+        return [e for e in document.elements if e.tag == "a" and e.text == value]
+    if using == "partial link text":
+        return [e for e in document.elements if e.tag == "a" and value in e.text]
+    if using == "xpath":
+        m = re.fullmatch(r"//(\*|[\w-]+)\[@([\w-]+)=['\"](.*)['\"]\]", value.strip())
+        if m:
+            tag, attr, val = m.groups()
+            return [e for e in document.elements
+                    if (tag == "*" or e.tag == tag) and e.attribute(attr) == val]
+    raise GridError("invalid selector", f"Unsupported locator for the local grid: {using}={value!r}")
+
+
+# ─────────────────────────────────────────────────────────────
+#  BROWSER SESSION
+# ─────────────────────────────────────────────────────────────
+class GridError(Exception):
+    """A W3C error response: `error` code, message and HTTP status."""
+
+    STATUS = {
+        "invalid argument": 400, "invalid selector": 400, "no such element": 404,
+        "stale element reference": 404, "invalid session id": 404,
+        "element not interactable": 400, "no such cookie": 404, "unknown command": 404, "javascript error": 500,
+        "unknown error": 500,
+    }
+
+    def __init__(self, error: str, message: str):
+        super().__init__(message)
+        self.error  = error
+        self.status = self.STATUS.get(error, 500)
+
+
+class BrowserSession:
+    """State of one fake browser: current document, cookies, storage, focus."""
+
+    def __init__(self, grid, capabilities: dict):
+        self.grid            = grid
+        self.id              = uuid.uuid4().hex
+        self.capabilities    = capabilities
+        self.lock            = threading.RLock()
+        self.implicit_wait   = 0.0
+        self.cookies         = {}
+        self.local_storage   = {}
+        self.session_storage = {}
+        self.focused         = None
+        self.pending         = None     # (due monotonic time, path) for delayed navigations
+        self.render_observer = None     # window.__bsPerf of login_perf's perfMark, until a full navigation
+        bs_options           = capabilities.get("bstack:options", {})
+        self.mobile          = str(bs_options.get("realMobile", "")).lower() == "true"
+        self.viewport_width  = 390 if self.mobile else 1280
+        self.pixel_ratio     = 3 if self.mobile else 1      # window.devicePixelRatio; screenshots are in device px
+        self.document        = Document("about:blank", "", [])
+
+    # ── Navigation ───────────────────────────────────────────
+    def navigate(self, url: str):
+        parsed = urlparse(url)
+        base   = urlparse(self.grid.base_url)
+        if parsed.netloc and parsed.netloc != base.netloc:
+            self.document = Document(url, "", [])
+            return
+        self.pending = None
+        self.focused = None
+        self.render_observer = None
+        path = parsed.path or "/"
+        if path == DASHBOARD_PATH:
+            if self.cookies.get(SESSION_COOKIE, {}).get("value") in USERS:
+                self.document = self._inventory_document()
+            else:
+                self.document = self._login_document(error=ERR_NOT_LOGGED_IN)
+        else:
+            self.document = self._login_document()
+
+    def tick(self):
+        """Apply a delayed navigation once it is due (performance_glitch_user)."""
+        if self.pending and time.monotonic() >= self.pending[0]:
+            self.route(self.pending[1])
+
+    def route(self, path: str):
+        """Client-side route change, like saucedemo's: same window, same time origin."""
+        origin, observer = self.document.time_origin, self.render_observer
+        self.navigate(self.grid.base_url + path)
+        self.document.time_origin, self.render_observer = origin, observer
+        if observer and not observer["ready"] and any("inventory_list" in e.classes for e in self.document.elements):
+            observer["ready"] = self.performance_now()
+
+    def performance_now(self) -> float:
+        return time.time() * 1000 - self.document.time_origin
+
+    # ── Pages ────────────────────────────────────────────────
+    def _login_document(self, error: str = "") -> Document:
+        username = Element("input", id="user-name", name="user-name", type="text",
+                           placeholder="Username", data_test="username",
+                           **{"class": "input_error form_input"}, focusable=True)
+        password = Element("input", id="password", name="password", type="password",
+                           placeholder="Password", data_test="password",
+                           **{"class": "input_error form_input"}, focusable=True)
+        button   = Element("input", id="login-button", name="login-button", type="submit",
+                           value="Login", data_test="login-button",
+                           **{"class": "submit-button btn_action"}, focusable=True,
+                           style={"background-color": "rgba(61, 220, 145, 1)"})
+        logo     = Element("div", text="Swag Labs", **{"class": "login_logo"})
+        elements = [logo, username, password, button]
+        if error:
+            elements += self._error_elements(error)
+        button.on_click = self._submit_login
+        return Document(self.grid.base_url + "/", "Swag Labs", elements)
+
+    @staticmethod
+    def _error_elements(message: str) -> list:
+        container = Element("div", **{"class": "error-message-container error"})
+        heading   = Element("h3", text=message, data_test="error",
+                            style={"color": "rgba(255, 255, 255, 1)",
+                                   "background-color": "rgba(226, 35, 26, 1)"})
+        close     = Element("button", **{"class": "error-button"}, data_test="error-button")
+        return [container, heading, close]
+
+    def _inventory_document(self) -> Document:
+        menu_btn = Element("button", text="Open Menu", id="react-burger-menu-btn", focusable=True)
+        logout   = Element("a", text="Logout", id="logout_sidebar_link",
+                           **{"class": "bm-item menu-item"}, displayed=False, focusable=True)
+        items    = Element("div", **{"class": "inventory_list"})
+        item     = Element("div", text="Sauce Labs Backpack", **{"class": "inventory_item"})
+
+        def open_menu():
+            logout.displayed = True
+
+        def do_logout():
+            self.cookies.pop(SESSION_COOKIE, None)
+            self.navigate(self.grid.base_url + "/")
+
+        menu_btn.on_click = open_menu
+        logout.on_click   = do_logout
+        return Document(self.grid.base_url + DASHBOARD_PATH, "Swag Labs",
+                        [menu_btn, logout, items, item])
+
+    # ── Behaviour ────────────────────────────────────────────
+    def _submit_login(self):
+        doc      = self.document
+        username = doc.by_id("user-name").value
+        password = doc.by_id("password").value
+        error    = login_error(username, password)
+        if error:
+            self._dismiss_error()
+            doc.elements += self._error_elements(error)
+            for field in (doc.by_id("user-name"), doc.by_id("password")):
+                field.attrs["class"] += " error"
+            return
+        self.cookies[SESSION_COOKIE] = {"name": SESSION_COOKIE, "value": username, "path": "/"}
+        if username == "performance_glitch_user" and self.grid.glitch_delay:
+            self.pending = (time.monotonic() + self.grid.glitch_delay, DASHBOARD_PATH)
+        else:
+            self.route(DASHBOARD_PATH)
+
+    def _dismiss_error(self):
+        doc = self.document
+        doc.elements = [e for e in doc.elements
+                        if "error-message-container" not in e.classes
+                        and e.attrs.get("data-test") not in ("error", "error-button")]
+        for field in (doc.by_id("user-name"), doc.by_id("password")):
+            field.attrs["class"] = field.attrs["class"].replace(" error", "")
+
+    def click(self, element: Element):
+        if not element.displayed:
+            raise GridError("element not interactable", "Element is not displayed")
+        if element.focusable:
+            self.focused = element
+        if element.on_click:
+            element.on_click()
+
+    def send_keys(self, element: Element, text: str):
+        self.focused = element
+        for char in text:
+            target = self.focused
+            if char == KEY_TAB:
+                self._focus_next()
+            elif char in (KEY_RETURN, KEY_ENTER):
+                if target is not None and target.tag == "input" and self.document.by_id("login-button"):
+                    self._submit_login()
+                    return
+                if target is not None and target.on_click:
+                    target.on_click()
+            elif char == KEY_BACKSPACE:
+                if target is not None:
+                    target.value = target.value[:-1]
+            elif "\ue000" <= char <= "\uf8ff":
+                continue   # other modifier / function keys have no effect here
+            elif target is not None and target.tag in ("input", "textarea"):
+                target.value += char
+
+    def _focus_next(self):
+        order = [e for e in self.document.elements if e.focusable and e.displayed]
+        if not order:
+            return
+        if self.focused in order:
+            self.focused = order[(order.index(self.focused) + 1) % len(order)]
+        else:
+            self.focused = order[0]
+
+    # ── Element references ───────────────────────────────────
+    def element(self, ref: str) -> Element:
+        generation, _, index = ref.partition("-")
+        if generation != self.document.generation:
+            raise GridError("stale element reference", "Element belongs to a previous document")
+        try:
+            return self.document.elements[int(index)]
+        except (ValueError, IndexError):
+            raise GridError("no such element", f"Unknown element reference {ref}")
+
+    def find(self, using: str, value: str) -> list:
+        """Honour the implicit wait: poll until something matches or time runs out."""
+        deadline = time.monotonic() + self.implicit_wait
+        while True:
+            self.tick()
+            found = locate(self.document, using, value)
+            if found or time.monotonic() >= deadline:
+                return found
+            time.sleep(0.05)
+
+
+# ─────────────────────────────────────────────────────────────
+#  SCREENSHOTS
+# ─────────────────────────────────────────────────────────────
+_RGBA       = re.compile(r"rgba?\((\d+),\s*(\d+),\s*(\d+)")
+TAG_COLOURS = {"input": (237, 237, 237), "div": (19, 35, 34), "h3": (226, 35, 26), "button": (71, 76, 85),
+               "a": (24, 88, 58)}
+PAGE_COLOUR = (255, 255, 255)
+STATUS_BAR  = 44     # CSS px; real devices show a clock there, so it changes between captures
+
+
+def _png(width: int, height: int, rows: list) -> bytes:
+    """Encode RGB rows (bytes of width*3) as a PNG with the standard library only."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    raw = b"".join(b"\x00" + row for row in rows)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+
+
+def render_screenshot(session) -> bytes:
+    """
+    Paint the current document the way the stub lays it out (one 40 px
+    band per element, see _rect) on a viewport-sized canvas, scaled by
+    the device pixel ratio like a real capture. Real devices get a
+    status bar whose clock changes every second.
+    """
+    ratio = session.pixel_ratio
+    width, height = session.viewport_width * ratio, (844 if session.mobile else 800) * ratio
+    blank = bytes(PAGE_COLOUR) * width
+    rows  = [blank] * height
+    bar   = STATUS_BAR * ratio if session.mobile else 0
+    for index, element in enumerate(session.document.elements):
+        if not element.displayed:
+            continue
+        m      = _RGBA.match(element.style.get("background-color", ""))
+        colour = tuple(int(c) for c in m.groups()) if m else TAG_COLOURS.get(element.tag, (200, 200, 200))
+        band   = bytes(colour) * min(300 * ratio, width) + blank[min(300 * ratio, width) * 3:]
+        top    = 40 * ratio * index + bar
+        rows[top:top + 40 * ratio] = [band] * len(rows[top:top + 40 * ratio])
+    if bar:
+        clock = (int(time.time()) % 60) * 5 * ratio
+        rows[:bar] = [bytes((240, 240, 240)) * clock + bytes((20, 20, 20)) * (width - clock)] * bar
+    return _png(width, height, rows)
+
+
+# ─────────────────────────────────────────────────────────────
+#  EXECUTE SCRIPT EMULATION
+# ─────────────────────────────────────────────────────────────
+SCRIPTS = {}
+
+
+def script(*keys):
+    """Register a handler(session, args) for a `/* tag */` name or an exact script text."""
+    def register(fn):
+        for key in keys:
+            SCRIPTS[" ".join(key.split())] = fn
+        return fn
+    return register
+
+
+@script("devicePixelRatio")
+def _device_pixel_ratio(session, args):
+    return session.pixel_ratio
+
+
+@script("getAttribute")
+def _get_attribute(session, args):
+    element, name = args
+    return element.attribute(name)
+
+
+@script("isDisplayed")
+def _is_displayed(session, args):
+    return args[0].displayed
+
+
+@script("return document.documentElement.scrollWidth",
+        "return document.documentElement.clientWidth")
+def _viewport_width(session, args):
+    return session.viewport_width
+
+
+@script("return document.activeElement.id")
+def _active_element_id(session, args):
+    return session.focused.id if session.focused else ""
+
+
+@script("window.localStorage.clear(); window.sessionStorage.clear();")
+def _clear_storage(session, args):
+    session.local_storage.clear()
+    session.session_storage.clear()
+
+
+@script("domSnapshot")
+def _dom_snapshot(session, args):
+    spec, attributes, styles = args
+    elements = {}
+    for name, selector in spec.items():
+        found = locate(session.document, "css selector", selector)
+        if not found:
+            elements[name] = None
+            continue
+        el = found[0]
+        elements[name] = {
+            "visible"   : el.displayed,
+            "text"      : el.text,
+            "attributes": {a: el.attribute(a) for a in attributes},
+            "styles"    : {s: el.style.get(s, "") for s in styles},
+            "focused"   : el is session.focused,
+        }
+    width = session.viewport_width
+    return {
+        "elements"       : elements,
+        "activeElementId": session.focused.id if session.focused else "",
+        "viewport"       : {"scrollWidth": width, "clientWidth": width,
+                            "scrollHeight": 800, "clientHeight": 800,
+                            "innerWidth": width, "devicePixelRatio": 3 if session.mobile else 1},
+    }
+
+
+@script("captureStorage")
+def _capture_storage(session, args):
+    return {"local": dict(session.local_storage), "session": dict(session.session_storage)}
+
+
+@script("restoreStorage")
+def _restore_storage(session, args):
+    session.local_storage.update(args[0].get("local", {}))
+    session.session_storage.update(args[0].get("session", {}))
+
+
+@script("perfMark")
+def _perf_mark(session, args):
+    session.session_storage["bs-perf-click"] = str(int(time.time() * 1000))
+    session.render_observer = {"click": session.performance_now(), "ready": 0}
+
+
+@script("perfTiming")
+def _perf_timing(session, args):
+    """Plausible Navigation/Resource/Paint entries; the stub documents load instantly."""
+    return {
+        "timeOrigin": session.document.time_origin,
+        "now"       : time.time() * 1000,
+        "navigation": {"responseStart": 4.0, "domInteractive": 9.0, "domContentLoaded": 10.0,
+                       "loadEventEnd": 12.0, "transferSize": 2048, "type": "navigate"},
+        "resources" : [{"name": session.grid.base_url + path, "type": "link" if path.endswith(".css") else "script",
+                        "duration": 2.0, "transferSize": len(body)} for path, (_, body) in STATIC_ASSETS.items()],
+        "paint"     : {"first-paint": 8.0, "first-contentful-paint": 8.5},
+        "clickMark" : float(session.session_storage.get("bs-perf-click", 0)),
+        "inPage"    : session.render_observer,
+    }
+
+
+@script("loginCorpus")
+def _login_corpus(session, args):
+    """Submit each [username, password] case; stops once a case leaves the login page."""
+    results = []
+    for username, password in args[0]:
+        if session.document.by_id("login-button") is None:
+            break
+        session.document.by_id("user-name").value = username
+        session.document.by_id("password").value  = password
+        session._submit_login()
+        error = next((e.text for e in session.document.elements if e.attrs.get("data-test") == "error"), "")
+        results.append([error, session.document.url])
+        if session.document.by_id("login-button") is not None:
+            session._dismiss_error()
+            session.document.by_id("user-name").value = ""
+            session.document.by_id("password").value  = ""
+    return results
+
+
+def run_script(session: BrowserSession, source: str, args: list):
+    if source.startswith("browserstack_executor:"):
+        return None   # dashboard annotations / status: nothing to do offline
+    tag = re.match(r"\s*/\*\s*([\w.-]+)\s*\*/", source)
+    handler = SCRIPTS.get(tag.group(1)) if tag else None
+    if handler is None:
+        handler = SCRIPTS.get(" ".join(source.split()))
+    if handler is None:
+        raise GridError("javascript error", f"The local grid cannot evaluate this script: {source[:120]!r}")
+    return handler(session, args)
+
+
+# ─────────────────────────────────────────────────────────────
+#  WEBDRIVER COMMAND ROUTING
+# ─────────────────────────────────────────────────────────────
+ROUTES = []
+
+
+def route(method: str, pattern: str):
+    def register(fn):
+        ROUTES.append((method, re.compile(pattern + "$"), fn))
+        return fn
+    return register
+
+
+@route("GET", "/status")
+def _status(grid, body):
+    return {"ready": True, "message": "local stand-in grid"}
+
+
+@route("POST", "/session")
+def _new_session(grid, body):
+    caps = body.get("capabilities", {}).get("alwaysMatch", {})
+    if grid.session_latency:
+        time.sleep(grid.session_latency)
+    session = BrowserSession(grid, caps)
+    with grid.lock:
+        grid.sessions[session.id] = session
+    return {"sessionId": session.id, "capabilities": {**caps, "acceptInsecureCerts": False}}
+
+
+@route("DELETE", "/session/(?P<sid>[^/]+)")
+def _delete_session(grid, body, session):
+    with grid.lock:
+        grid.sessions.pop(session.id, None)
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/timeouts")
+def _set_timeouts(grid, body, session):
+    if body.get("implicit") is not None:
+        session.implicit_wait = body["implicit"] / 1000.0
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/timeouts")
+def _get_timeouts(grid, body, session):
+    return {"implicit": int(session.implicit_wait * 1000), "pageLoad": 300000, "script": 30000}
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/url")
+def _navigate(grid, body, session):
+    session.navigate(body["url"])
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/url")
+def _current_url(grid, body, session):
+    return session.document.url
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/title")
+def _title(grid, body, session):
+    return session.document.title
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/refresh")
+def _refresh(grid, body, session):
+    session.navigate(session.document.url)
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/source")
+def _source(grid, body, session):
+    return INVENTORY_HTML if session.document.url.endswith(DASHBOARD_PATH) else LOGIN_HTML
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/window/rect")
+def _window_rect(grid, body, session):
+    return {"x": 0, "y": 0, "width": session.viewport_width, "height": 844 if session.mobile else 800}
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element")
+def _find_element(grid, body, session):
+    found = session.find(body["using"], body["value"])
+    if not found:
+        raise GridError("no such element", f"Unable to locate element: {body['value']}")
+    return {ELEMENT_KEY: session.document.ref(found[0])}
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/elements")
+def _find_elements(grid, body, session):
+    return [{ELEMENT_KEY: session.document.ref(e)} for e in session.find(body["using"], body["value"])]
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/element")
+def _find_child(grid, body, session, element):
+    return _find_element(grid, body, session)
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/elements")
+def _find_children(grid, body, session, element):
+    return _find_elements(grid, body, session)
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/active")
+def _active_element(grid, body, session):
+    if session.focused is None:
+        raise GridError("no such element", "No element has focus")
+    return {ELEMENT_KEY: session.document.ref(session.focused)}
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/click")
+def _click(grid, body, session, element):
+    session.click(element)
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/clear")
+def _clear(grid, body, session, element):
+    element.value = ""
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/value")
+def _send_keys(grid, body, session, element):
+    session.send_keys(element, body.get("text", "".join(body.get("value", []))))
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/text")
+def _text(grid, body, session, element):
+    return element.text if element.displayed else ""
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/name")
+def _tag_name(grid, body, session, element):
+    return element.tag
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/attribute/(?P<name>[^/]+)")
+def _attribute(grid, body, session, element, name):
+    return element.attrs.get(name)
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/property/(?P<name>[^/]+)")
+def _property(grid, body, session, element, name):
+    return element.attribute(name)
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/css/(?P<name>[^/]+)")
+def _css_value(grid, body, session, element, name):
+    return element.style.get(name, "")
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/displayed")
+def _displayed(grid, body, session, element):
+    return element.displayed
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/enabled")
+def _enabled(grid, body, session, element):
+    return True
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/selected")
+def _selected(grid, body, session, element):
+    return False
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/element/(?P<eid>[^/]+)/rect")
+def _rect(grid, body, session, element):
+    index = session.document.elements.index(element)
+    return {"x": 0, "y": 40 * index, "width": min(300, session.viewport_width), "height": 40}
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/screenshot")
+def _screenshot(grid, body, session):
+    return base64.b64encode(render_screenshot(session)).decode("ascii")
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/execute/(?:sync|async)")
+def _execute(grid, body, session):
+    return run_script(session, body["script"], _deserialise(body.get("args", []), session))
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/cookie")
+def _get_cookies(grid, body, session):
+    return list(session.cookies.values())
+
+
+@route("GET", "/session/(?P<sid>[^/]+)/cookie/(?P<name>[^/]+)")
+def _get_cookie(grid, body, session, name):
+    if name not in session.cookies:
+        raise GridError("no such cookie", f"No cookie named {name}")
+    return session.cookies[name]
+
+
+@route("POST", "/session/(?P<sid>[^/]+)/cookie")
+def _add_cookie(grid, body, session):
+    cookie = body["cookie"]
+    session.cookies[cookie["name"]] = {"path": "/", **cookie}
+
+
+@route("DELETE", "/session/(?P<sid>[^/]+)/cookie")
+def _delete_cookies(grid, body, session):
+    session.cookies.clear()
+
+
+@route("DELETE", "/session/(?P<sid>[^/]+)/cookie/(?P<name>[^/]+)")
+def _delete_cookie(grid, body, session, name):
+    session.cookies.pop(name, None)
+
+
+# ─────────────────────────────────────────────────────────────
+#  HTTP SERVER
+# ─────────────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version        = "HTTP/1.1"   # keep-alive, like the real hub
+    disable_nagle_algorithm = True         # headers and body go out as separate writes
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, value):
+        self._send(status, json.dumps({"value": value}).encode(), "application/json; charset=utf-8")
+
+    def _webdriver(self, method: str):
+        grid   = self.server.grid
+        path   = unquote(urlparse(self.path).path)[len(HUB_PREFIX):].rstrip("/") or "/"
+        length = int(self.headers.get("Content-Length") or 0)
+        raw    = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            return self._send_json(400, {"error": "invalid argument", "message": "Malformed JSON", "stacktrace": ""})
+
+        if grid.command_latency:
+            time.sleep(grid.command_latency)
+        try:
+            value = grid.dispatch(method, path, body)
+        except GridError as exc:
+            return self._send_json(exc.status, {"error": exc.error, "message": str(exc), "stacktrace": ""})
+        self._send_json(200, value)
+
+    def _static(self):
+        grid = self.server.grid
+        path = urlparse(self.path).path or "/"
+        with grid.lock:
+            grid.page_hits += 1
+        if path in ("/", "/index.html"):
+            return self._send(200, LOGIN_HTML.encode(), "text/html; charset=utf-8")
+        if path == DASHBOARD_PATH:
+            return self._send(200, INVENTORY_HTML.encode(), "text/html; charset=utf-8")
+        if path in STATIC_ASSETS:
+            content_type, content = STATIC_ASSETS[path]
+            return self._send(200, content.encode(), content_type)
+        self._send(404, b"Not Found", "text/plain")
+
+    def do_GET(self):
+        if self.path.startswith(HUB_PREFIX):
+            return self._webdriver("GET")
+        self._static()
+
+    def do_POST(self):
+        if self.path.startswith(HUB_PREFIX):
+            return self._webdriver("POST")
+        self._send(405, b"Method Not Allowed", "text/plain")
+
+    def do_PUT(self):
+        # BrowserStack REST API stand-in: PUT /automate/sessions/<id>.json
+        m = re.fullmatch(r"/automate/sessions/([^/]+)\.json", urlparse(self.path).path)
+        if not m:
+            return self._send(404, b"Not Found", "text/plain")
+        length = int(self.headers.get("Content-Length") or 0)
+        body   = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.grid.lock:
+            self.server.grid.session_status[m.group(1)] = body
+        self._send(200, json.dumps({"automation_session": {"hashed_id": m.group(1), **body}}).encode(),
+                   "application/json")
+
+    def do_DELETE(self):
+        if self.path.startswith(HUB_PREFIX):
+            return self._webdriver("DELETE")
+        self._send(405, b"Method Not Allowed", "text/plain")
+
+
+class LocalGrid:
+    """
+    The stand-in hub. `hub_url` replaces BS_HUB_URL and `base_url`
+    replaces TARGET_URL when the suite runs with BS_LOCAL_GRID=1.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0,
+                 command_latency=0.0, session_latency=0.0, glitch_delay=0.0):
+        self.command_latency = command_latency
+        self.session_latency = session_latency
+        self.glitch_delay    = glitch_delay
+        self.sessions        = {}
+        self.session_status  = {}     # REST-reported status per session id
+        self.lock            = threading.Lock()
+        self.commands        = 0
+        self.page_hits       = 0
+        self._server         = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.grid    = self
+        self._thread         = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def hub_url(self) -> str:
+        return self.base_url + HUB_PREFIX
+
+    def start(self) -> "LocalGrid":
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="local-grid", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def dispatch(self, method: str, path: str, body: dict):
+        with self.lock:
+            self.commands += 1
+        for route_method, pattern, handler in ROUTES:
+            m = pattern.match(path)
+            if not m or route_method != method:
+                continue
+            params = m.groupdict()
+            if "sid" not in params:
+                return handler(self, body)
+            session = self.sessions.get(params.pop("sid"))
+            if session is None:
+                raise GridError("invalid session id", "Session does not exist or has been deleted")
+            with session.lock:
+                session.tick()
+                if "eid" in params:
+                    params["element"] = session.element(params.pop("eid"))
+                return _serialise(handler(self, body, session, **params), session)
+        raise GridError("unknown command", f"Unknown command: {method} {path}")
+
+
+def _serialise(value, session: BrowserSession):
+    """Turn Element objects in a handler's return value into W3C element references."""
+    if isinstance(value, Element):
+        return {ELEMENT_KEY: session.document.ref(value)}
+    if isinstance(value, list):
+        return [_serialise(v, session) for v in value]
+    if isinstance(value, dict):
+        return {k: _serialise(v, session) for k, v in value.items()}
+    return value
+
+
+def _deserialise(value, session: BrowserSession):
+    if isinstance(value, dict) and ELEMENT_KEY in value:
+        return session.element(value[ELEMENT_KEY])
+    if isinstance(value, list):
+        return [_deserialise(v, session) for v in value]
+    if isinstance(value, dict):
+        return {k: _deserialise(v, session) for k, v in value.items()}
+    return value
+
+
+_GRID = None
+
+
+def start_local_grid() -> LocalGrid:
+    """Start (once per process) the stand-in grid configured from the environment."""
+    global _GRID
+    if _GRID is None:
+        _GRID = LocalGrid(
+            port            = int(os.environ.get("BS_LOCAL_GRID_PORT", "0")),
+            command_latency = float(os.environ.get("BS_LOCAL_GRID_LATENCY_MS", "0")) / 1000.0,
+            session_latency = float(os.environ.get("BS_LOCAL_GRID_SESSION_MS", "0")) / 1000.0,
+            glitch_delay    = float(os.environ.get("BS_LOCAL_GRID_GLITCH_MS", "500")) / 1000.0,
+        ).start()
+    return _GRID
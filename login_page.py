@@ -0,0 +1,152 @@
+"""
+============================================================
+  login_page.py
+  Login page object with a per-document WebElement cache
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+`fill_login`, `submit_login`, `error_text` and `element_visible`
+used to locate user-name, password and login-button afresh on
+every call: one find_element round trip each, several per test,
+which on a real device adds up. LoginPage goes through an
+ElementCache instead:
+
+  • WebElements are kept per driver, keyed by (by, value), and
+    are only valid for the document they were found in
+  • navigation commands (get, back, forward, refresh, window and
+    frame switches) seen on the instrumented command stream drop
+    the whole cache: the next lookup is a fresh find_element
+  • navigations the harness can't see (a click that logs in, a
+    script that reloads) surface as a stale element reference on
+    the next use; the cache is dropped, the element is located
+    again and the action retried once
+  • missing elements are never cached, so an error banner that
+    appears later is still found
+
+Hits, misses (remote lookups) and stale recoveries are counted
+per test; the `browser` fixture records them as the test's
+`element_cache` property and conftest_bs.py sums them up.
+"""
+
+import weakref
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+from instrumentation import on_command
+
+NAVIGATION_COMMANDS = {
+    Command.GET, Command.GO_BACK, Command.GO_FORWARD, Command.REFRESH, Command.CLOSE,
+    Command.NEW_WINDOW, Command.SWITCH_TO_WINDOW, Command.SWITCH_TO_FRAME, Command.SWITCH_TO_PARENT_FRAME,
+}
+STALE = (StaleElementReferenceException, NoSuchElementException)   # some drivers report old refs as missing
+
+
+class ElementCache:
+    """WebElements of the driver's current document, keyed by locator."""
+
+    def __init__(self, driver):
+        self.driver   = driver
+        self.elements = {}        # (by, value) → WebElement
+        self.watching = on_command(driver, self._observe)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "invalidations": 0}
+
+    def _observe(self, command: str):
+        if command in NAVIGATION_COMMANDS:
+            self.invalidate()
+
+    def invalidate(self):
+        if self.elements:
+            self.elements.clear()
+            self.stats["invalidations"] += 1
+
+    def find(self, by: str, value: str):
+        """The element for a locator; raises NoSuchElementException like find_element."""
+        element = self.elements.get((by, value))
+        if element is not None:
+            self.stats["hits"] += 1
+            return element
+        self.stats["misses"] += 1
+        element = self.elements[(by, value)] = self.driver.find_element(by, value)
+        return element
+
+    def first(self, by: str, value: str):
+        """The element for a locator, or None when the page has none (not cached)."""
+        element = self.elements.get((by, value))
+        if element is not None:
+            self.stats["hits"] += 1
+            return element
+        self.stats["misses"] += 1
+        found = self.driver.find_elements(by, value)
+        if found:
+            self.elements[(by, value)] = found[0]
+        return found[0] if found else None
+
+    def use(self, by: str, value: str, action, optional=False):
+        """
+        Run `action(element)`; on a stale reference drop the cache, locate
+        again and retry once. With `optional`, a missing element gives None.
+        """
+        lookup = self.first if optional else self.find
+        element = lookup(by, value)
+        if element is None:
+            return None
+        try:
+            return action(element)
+        except STALE:
+            self.stats["stale"] += 1
+            self.invalidate()
+            element = lookup(by, value)
+            return None if element is None else action(element)
+
+
+_CACHES = weakref.WeakKeyDictionary()
+
+
+def element_cache(driver) -> ElementCache:
+    """The driver's ElementCache, created on first use."""
+    cache = _CACHES.get(driver)
+    if cache is None:
+        cache = _CACHES[driver] = ElementCache(driver)
+    return cache
+
+
+class LoginPage:
+    """SauceDemo login page actions over the driver's ElementCache."""
+
+    USERNAME = (By.ID, "user-name")
+    PASSWORD = (By.ID, "password")
+    BUTTON   = (By.ID, "login-button")
+    ERROR    = (By.CSS_SELECTOR, "[data-test='error']")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.cache  = element_cache(driver)
+
+    def fill(self, username: str, password: str):
+        """Clear and populate both login fields."""
+        for locator, text in ((self.USERNAME, username), (self.PASSWORD, password)):
+            self.cache.use(*locator, lambda el, text=text: (el.clear(), el.send_keys(text)))
+
+    def submit(self):
+        self.cache.use(*self.BUTTON, lambda el: el.click())
+
+    def press(self, locator, keys: str):
+        self.cache.use(*locator, lambda el: el.send_keys(keys))
+
+    def tab_from_username(self):
+        """Focus the username field, then press Tab."""
+        self.cache.use(*self.USERNAME, lambda el: (el.click(), el.send_keys(Keys.TAB)))
+
+    def error_text(self) -> str:
+        """Current error banner text, without waiting ('' if none)."""
+        text = self.cache.use(*self.ERROR, lambda el: el.text, optional=True)
+        return text.strip() if text else ""
+
+    def visible(self, by: str, value: str) -> bool:
+        return bool(self.cache.use(by, value, lambda el: el.is_displayed(), optional=True))
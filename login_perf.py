@@ -0,0 +1,160 @@
+"""
+============================================================
+  login_perf.py
+  Target-side login performance: Navigation / Resource /
+  Paint timing and click-to-inventory latency
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Used by the perf mode of the suite (BS_PERF_MODE=1): the
+performance_glitch_user logs in PERF_REPEATS times per config and
+every login is measured *in the browser*, so hub and device
+round trips don't pollute the numbers:
+
+  mark_click(driver)      right before the login button is clicked:
+                          stores Date.now() in sessionStorage and
+                          starts a MutationObserver that records
+                          performance.now() when the inventory
+                          container is added to the page
+  collect_timing(driver)  on /inventory.html, once the inventory
+                          container shows: navigation entry,
+                          resource entries, paint entries and the
+                          click → inventory-ready latency
+
+Click-to-inventory is mark → `loadEventEnd` of the inventory
+navigation when the login triggers a full page load (the observer
+goes away with the old page). For a client-side route change, as on
+saucedemo, it is the observer's render time minus its click time,
+both performance.now() in the same page, so WebDriver polling and
+hub round trips are never part of it.
+
+Per-config percentiles are compared with a JSON baseline; a p50
+or p95 worse than baseline × (1 + PERF_THRESHOLD) is a regression.
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from instrumentation import percentile
+
+PERF_MARK_KEY      = "bs-perf-click"
+INVENTORY_SELECTOR = ".inventory_list"
+
+# ES5. window.__bsPerf lives as long as the page: only a client-side route change keeps it.
+PERF_MARK_SCRIPT = """/* perfMark */
+var w = window, perf = w.performance, state = w.__bsPerf = {click: perf.now(), ready: 0};
+w.sessionStorage.setItem("%s", String(Date.now()));
+function rendered() {
+  if (!state.ready && document.querySelector("%s")) { state.ready = perf.now(); }
+  return state.ready > 0;
+}
+if (w.MutationObserver && !rendered()) {
+  var observer = new w.MutationObserver(function () { if (rendered()) { observer.disconnect(); } });
+  observer.observe(document.documentElement, {childList: true, subtree: true});
+}""" % (PERF_MARK_KEY, INVENTORY_SELECTOR)
+
+# ES5, with a performance.timing fallback for browsers without Navigation Timing L2.
+PERF_TIMING_SCRIPT = """/* perfTiming */
+var perf = window.performance, t = perf.timing, byType = perf.getEntriesByType ?
+    function (type) { return perf.getEntriesByType(type); } : function () { return []; };
+var origin = perf.timeOrigin || t.navigationStart, navEntry = byType("navigation")[0], nav;
+if (navEntry) {
+  nav = {responseStart: navEntry.responseStart, domInteractive: navEntry.domInteractive,
+         domContentLoaded: navEntry.domContentLoadedEventEnd, loadEventEnd: navEntry.loadEventEnd,
+         transferSize: navEntry.transferSize || 0, type: navEntry.type};
+} else {
+  nav = {responseStart: t.responseStart - t.navigationStart, domInteractive: t.domInteractive - t.navigationStart,
+         domContentLoaded: t.domContentLoadedEventEnd - t.navigationStart,
+         loadEventEnd: t.loadEventEnd - t.navigationStart, transferSize: 0, type: "navigate"};
+}
+var resources = [], entries = byType("resource"), paint = {}, i;
+for (i = 0; i < entries.length; i++) {
+  resources.push({name: entries[i].name, type: entries[i].initiatorType,
+                  duration: entries[i].duration, transferSize: entries[i].transferSize || 0});
+}
+entries = byType("paint");
+for (i = 0; i < entries.length; i++) { paint[entries[i].name] = entries[i].startTime; }
+return {timeOrigin: origin, now: Date.now(), navigation: nav, resources: resources, paint: paint,
+        clickMark: Number(window.sessionStorage.getItem("%s") || 0), inPage: window.__bsPerf || null};""" % PERF_MARK_KEY
+
+
+@dataclass
+class LoginTiming:
+    click_to_inventory_ms: float           # None: the page never saw the inventory render
+    full_navigation      : bool
+    navigation           : dict
+    paint                : dict
+    resources            : list = field(default_factory=list)
+
+    @property
+    def resource_bytes(self) -> int:
+        return sum(r["transferSize"] for r in self.resources)
+
+
+def mark_click(driver):
+    """Call immediately before clicking the login button."""
+    driver.execute_script(PERF_MARK_SCRIPT)
+
+
+def collect_timing(driver) -> LoginTiming:
+    """Call once the inventory container is showing."""
+    raw    = driver.execute_script(PERF_TIMING_SCRIPT)
+    mark   = raw["clickMark"]
+    full   = raw["timeOrigin"] >= mark and raw["navigation"]["loadEventEnd"] > 0
+    if full:
+        latency = raw["timeOrigin"] + raw["navigation"]["loadEventEnd"] - mark
+    else:
+        in_page = raw.get("inPage") or {}
+        latency = in_page["ready"] - in_page["click"] if in_page.get("ready") else None
+    return LoginTiming(
+        click_to_inventory_ms = round(latency, 1) if latency is not None else None,
+        full_navigation       = full,
+        navigation            = raw["navigation"],
+        paint                 = raw["paint"],
+        resources             = raw["resources"],
+    )
+
+
+def latency_stats(samples: list) -> dict:
+    """p50/p95/p99/min/max (ms) of a list of millisecond samples."""
+    return {
+        "n"     : len(samples),
+        "p50_ms": round(percentile(samples, 50), 1),
+        "p95_ms": round(percentile(samples, 95), 1),
+        "p99_ms": round(percentile(samples, 99), 1),
+        "min_ms": round(min(samples), 1) if samples else 0.0,
+        "max_ms": round(max(samples), 1) if samples else 0.0,
+    }
+
+
+class PerfBaseline:
+    """{config id: latency_stats} stored as JSON; compared against with a relative threshold."""
+
+    COMPARED = ("p50_ms", "p95_ms")
+
+    def __init__(self, path, threshold: float):
+        self.path      = Path(path)
+        self.threshold = threshold
+        self._lock     = threading.Lock()
+        self.entries   = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def regressions(self, config_id: str, stats: dict) -> list:
+        """Human-readable regressions of `stats` against the baseline ([] if none / no baseline)."""
+        base = self.entries.get(config_id)
+        if not base:
+            return []
+        found = []
+        for key in self.COMPARED:
+            limit = base[key] * (1 + self.threshold)
+            if stats[key] > limit:
+                found.append(f"{key} {stats[key]:.0f} ms > {limit:.0f} ms "
+                             f"(baseline {base[key]:.0f} ms + {self.threshold:.0%})")
+        return found
+
+    def update(self, results: dict):
+        """Merge {config id: stats} into the baseline file."""
+        with self._lock:
+            self.entries.update(results)
+            self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,108 @@
+"""
+============================================================
+  matrix_reduction.py
+  Engine-equivalence reduction of the (test, config) matrix
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+A wrong password is rejected by the server the same way whatever
+browser sent it. Running such a test on all 11 configs buys no
+coverage beyond one run per rendering engine:
+
+  blink   Chrome, Edge, Chrome on Android
+  gecko   Firefox
+  webkit  Safari, and every browser on iOS / iPadOS
+
+Each test is classified, most specific marker first:
+  engine_sensitive   always the full matrix
+  engine_agnostic    reduced
+  AGNOSTIC_MARKERS   reduced (default: `negative`)
+  anything else      full matrix (positive and ui tests)
+
+Reduced tests keep one config per engine:
+  engine   the engine's first desktop config in BROWSER_MATRIX
+  rotate   a config of that engine chosen per test from the seed,
+           so successive days cover every config in turn
+
+coverage() reports the trade-off: pairs and estimated seconds
+saved, and which engines and configs each reduced test still hits.
+"""
+
+import zlib
+
+from browserstack_config import BROWSER_MATRIX, AGNOSTIC_MARKERS
+from durations import split_nodeid
+
+ENGINES = {"chrome": "blink", "edge": "blink", "opera": "blink", "samsung": "blink",
+           "firefox": "gecko", "safari": "webkit"}
+
+
+def rendering_engine(config: dict) -> str:
+    """Rendering engine of a BROWSER_MATRIX entry (all iOS browsers are WebKit)."""
+    if config.get("device", "").startswith(("iPhone", "iPad")) or config.get("os") == "ios":
+        return "webkit"
+    return ENGINES.get(config.get("browser", "").lower(), config.get("browser", "unknown"))
+
+
+def is_engine_agnostic(item, agnostic_markers=AGNOSTIC_MARKERS) -> bool:
+    if item.get_closest_marker("engine_sensitive"):
+        return False
+    if item.get_closest_marker("engine_agnostic"):
+        return True
+    return any(item.get_closest_marker(name) for name in agnostic_markers)
+
+
+def engine_configs(matrix=BROWSER_MATRIX) -> dict:
+    """{engine: [config ids]}, desktop configs first, otherwise in matrix order."""
+    engines = {}
+    for cfg in sorted(matrix, key=lambda c: bool(c.get("real_mobile"))):
+        engines.setdefault(rendering_engine(cfg), []).append(cfg["id"])
+    return engines
+
+
+def chosen_config(test: str, engine: str, engines: dict, mode: str, seed: int) -> str:
+    candidates = engines[engine]
+    if mode == "rotate":
+        return candidates[(seed + zlib.crc32(test.encode())) % len(candidates)]
+    return candidates[0]
+
+
+def reduce_items(items, mode: str, seed: int, config_of) -> tuple:
+    """Split items into (kept, dropped); `config_of(item)` is its BROWSER_MATRIX entry or None."""
+    engines = engine_configs()
+    kept, dropped = [], []
+    for item in items:
+        cfg = config_of(item)
+        if cfg is None or not is_engine_agnostic(item):
+            kept.append(item)
+            continue
+        test = split_nodeid(item.nodeid)[0]
+        if cfg["id"] == chosen_config(test, rendering_engine(cfg), engines, mode, seed):
+            kept.append(item)
+        else:
+            dropped.append(item)
+    return kept, dropped
+
+
+def coverage(kept, dropped, config_of, model, mode: str, seed: int) -> dict:
+    """Coverage-versus-cost summary of a reduction (JSON-serialisable)."""
+    reduced = {split_nodeid(item.nodeid)[0]: {"engines": set(), "configs": set()} for item in dropped}
+    for item in kept:
+        test = split_nodeid(item.nodeid)[0]
+        if test in reduced:
+            cfg = config_of(item)
+            reduced[test]["engines"].add(rendering_engine(cfg))
+            reduced[test]["configs"].add(cfg["id"])
+    full_seconds  = sum(model.estimate(item.nodeid) for item in list(kept) + list(dropped))
+    saved_seconds = sum(model.estimate(item.nodeid) for item in dropped)
+    return {
+        "mode"         : mode,
+        "seed"         : seed,
+        "pairs_full"   : len(kept) + len(dropped),
+        "pairs_run"    : len(kept),
+        "seconds_full" : round(full_seconds, 1),
+        "seconds_saved": round(saved_seconds, 1),
+        "engines"      : sorted(engine_configs()),
+        "reduced_tests": {test: {"engines": sorted(e["engines"]), "configs": sorted(e["configs"])}
+                          for test, e in sorted(reduced.items())},
+    }
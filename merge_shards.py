@@ -0,0 +1,187 @@
+"""
+============================================================
+  merge_shards.py
+  Combine `--shard i/N` runs into one build
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Each shard job uploads its reports directory. This folds them
+back into what a single unsharded run would have produced:
+
+  • one result stream: a single run header (union of configs,
+    earliest start), every shard's results, one end record
+    (latest finish, worst exit status)
+  • the stream report rendered from it
+  • one build in the results history (shard runs skip their own
+    ingest, so the history gets exactly one row per test)
+  • one batch of BrowserStack session statuses, when the shards
+    ran with BS_STATUS_MODE=defer
+
+Missing or duplicated shard numbers are reported, not fatal:
+the merged build then simply lacks that shard's results. Shards
+partitioned on different duration histories are fatal: their
+partitions need not fit together, so tests may have run twice or
+not at all. Share one results.db between the shard jobs.
+
+The merged run id is derived from the shard run ids, so merging
+the same shards again replaces the build instead of adding one.
+
+Usage:
+    python merge_shards.py shard-1/ shard-2/ shard-3/
+    python merge_shards.py shard-*/ -o reports/results.jsonl --no-statuses
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+from browserstack_config import RESULTS_STREAM, STREAM_REPORT, RESULTS_DB, BUILD_NAME, STATUS_FILE
+from result_stream import read_stream
+from stream_report import render
+from results_store import ResultsStore
+from teardown import TeardownQueue
+
+
+def last_run(path: str) -> list:
+    """Records of the last run in a shard's stream (header first)."""
+    records = []
+    for record in read_stream(path):
+        if record.get("type") == "run":
+            records = []
+        records.append(record)
+    return records
+
+
+def merged_exitstatus(statuses: list) -> int:
+    """Worst real failure wins; 5 (no tests collected) only if every shard had nothing to run."""
+    failures = [s for s in statuses if s not in (0, 5)]
+    if failures:
+        return max(failures)
+    return 5 if statuses and all(s == 5 for s in statuses) else 0
+
+
+def merge_streams(paths: list, out_path: str) -> dict:
+    """Write one stream from the shard streams; returns {"shards", "missing", "duplicates", "results"}."""
+    headers, results, ends = [], [], []
+    for path in paths:
+        for record in last_run(path):
+            kind = record.get("type")
+            if kind == "run":
+                headers.append(record)
+            elif kind == "end":
+                ends.append(record)
+            elif kind == "result":
+                results.append(record)
+
+    histories = {h.get("history", "") for h in headers if h.get("shard")}
+    if len(histories) > 1:
+        raise ValueError("shards were partitioned on different duration histories "
+                         f"({', '.join(sorted(h or 'none' for h in histories))}); share one results.db "
+                         "between the shard jobs and rerun them")
+
+    configs = []
+    for header in headers:
+        configs.extend(cfg for cfg in header.get("configs", []) if cfg not in configs)
+    shards = [tuple(h["shard"]) for h in headers if h.get("shard")]
+    total  = max((n for _, n in shards), default=0)
+    seen   = [i for i, _ in shards]
+
+    run_ids = sorted(h.get("run_id", "") for h in headers)
+    lines = [{"type": "run", "run_id": hashlib.sha256(" ".join(run_ids).encode()).hexdigest()[:12],
+              "started": min((h["started"] for h in headers), default=0.0),
+              "configs": configs, "shards": sorted(shards)}]
+    lines.extend(sorted(results, key=lambda record: record.get("ts", 0.0)))
+    if ends:
+        lines.append({"type": "end", "finished": max(e["finished"] for e in ends),
+                      "exitstatus": merged_exitstatus([e["exitstatus"] for e in ends])})
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.writelines(json.dumps(line, separators=(",", ":")) + "\n" for line in lines)
+    os.replace(tmp_path, out_path)
+    return {
+        "shards"    : len(headers),
+        "missing"   : sorted(set(range(1, total + 1)) - set(seen)),
+        "duplicates": sorted({i for i in seen if seen.count(i) > 1}),
+        "results"   : len(results),
+        "finished"  : bool(ends) and len(ends) == len(headers),
+    }
+
+
+def read_statuses(paths: list) -> dict:
+    """{session id: {"status", "reason"}} from the shards' deferred status files."""
+    statuses = {}
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    statuses[record.pop("session")] = record
+    return statuses
+
+
+def merge(shard_dirs: list, output: str = RESULTS_STREAM, report: str = STREAM_REPORT, db: str = RESULTS_DB,
+          build: str = BUILD_NAME, queue: TeardownQueue = None) -> dict:
+    """
+    Merge the shard reports directories: stream, report, one build in the
+    history and, with a `queue`, the deferred statuses. Returns
+    merge_streams()'s summary plus "build", "statuses" and "status_errors";
+    raises ValueError when a stream is missing or the histories differ.
+    """
+    streams = [os.path.join(d, os.path.basename(RESULTS_STREAM)) for d in shard_dirs]
+    absent  = [p for p in streams if not os.path.exists(p)]
+    if absent:
+        raise ValueError(f"no result stream in: {', '.join(absent)}")
+
+    summary = merge_streams(streams, output)
+    if report:
+        render(output, report)
+    summary["build"] = None
+    if db:
+        store = ResultsStore(db)
+        summary["build"] = store.ingest_stream(output, build)
+        store.close()
+
+    statuses = read_statuses([os.path.join(d, os.path.basename(STATUS_FILE)) for d in shard_dirs])
+    summary["statuses"], summary["status_errors"] = len(statuses), []
+    if statuses and queue is not None:
+        queue.send_statuses(statuses)
+        summary["status_errors"] = list(queue.errors)
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge sharded runs into one report, build and status batch.")
+    parser.add_argument("shards", nargs="+", help="shard reports directories")
+    parser.add_argument("-o", "--output", default=RESULTS_STREAM, help="merged result stream")
+    parser.add_argument("--report", default=STREAM_REPORT)
+    parser.add_argument("--db", default=RESULTS_DB)
+    parser.add_argument("--build", default=BUILD_NAME)
+    parser.add_argument("--no-statuses", action="store_true", help="do not send the deferred session statuses")
+    args = parser.parse_args()
+
+    try:
+        summary = merge(args.shards, args.output, args.report, args.db, args.build,
+                        queue=None if args.no_statuses else TeardownQueue(mode="rest"))
+    except ValueError as exc:
+        sys.exit(f"FAILED: {exc}")
+    print(f"{summary['shards']} shard(s), {summary['results']} results → {args.output}")
+    if summary["missing"]:
+        print(f"  missing shard(s): {summary['missing']}")
+    if summary["duplicates"]:
+        print(f"  duplicated shard(s): {summary['duplicates']}")
+    if not summary["finished"]:
+        print("  some shards have no end record (still running or crashed)")
+    if args.report:
+        print(f"report → {args.report}")
+    if summary["build"] is not None:
+        print(f"stored as build {summary['build']}")
+    if summary["statuses"] and not args.no_statuses:
+        for what, exc in summary["status_errors"]:
+            print(f"  status update failed: {what}: {exc!r}")
+        print(f"{summary['statuses'] - len(summary['status_errors'])}/{summary['statuses']} session statuses sent")
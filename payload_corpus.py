@@ -0,0 +1,137 @@
+"""
+============================================================
+  payload_corpus.py
+  Credential / payload corpus run in batches inside one session
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Every negative test pays for a remote session round trip per
+command. Here a corpus of username/password payloads (856 in
+login_payloads.jsonl; nothing in the batching assumes that size)
+is pushed through the real login form in batches of CORPUS_BATCH, one
+`execute_async_script` call per batch: the script fills both
+fields through the native value setter (so React sees the input),
+clicks Login, records the error text and URL, dismisses the
+error and clears the form before the next case.
+
+local_grid.py emulates CORPUS_SCRIPT in Python (its loginCorpus
+handler); test_payload_corpus.py runs the script itself in Node.js
+against a mock form with React's value tracker. It has not been
+run in a real browser yet, so the mode is experimental.
+
+A case that logs in leaves the login page, so the batch stops
+there; the session is reset (cookies, storage, back to the login
+page) and the next batch resumes after that case.
+
+Corpus format (CORPUS_FILE, one JSON object per line):
+  {"username": "...", "password": "...", "category": "sqli",
+   "expect": "error" | "dashboard", "message": "substring"}
+`expect` defaults to "error"; `message`, if given, must appear
+in the error text.
+"""
+
+import json
+from dataclasses import dataclass
+
+from saucedemo import DASHBOARD_PATH
+from browserstack_config import CORPUS_BATCH
+from session_pool import SessionPool
+
+# ES5 + Event; arguments[0] = [[username, password], ...], last argument = done callback.
+CORPUS_SCRIPT = """/* loginCorpus */
+var cases = arguments[0], done = arguments[arguments.length - 1], results = [], i = 0;
+var setter = Object.getOwnPropertyDescriptor(window.HTMLInputElement.prototype, "value").set;
+function fill(id, value) {
+  var field = document.getElementById(id);
+  setter.call(field, value);
+  field.dispatchEvent(new Event("input", {bubbles: true}));
+}
+function next() {
+  var button = document.getElementById("login-button");
+  if (i >= cases.length || !button) { return done(results); }
+  fill("user-name", cases[i][0]);
+  fill("password", cases[i][1]);
+  button.click();
+  setTimeout(function () {
+    var error = document.querySelector("[data-test='error']");
+    results.push([error ? error.textContent : "", window.location.href]);
+    i++;
+    if (document.getElementById("login-button")) {
+      var close = document.querySelector("[data-test='error-button']");
+      if (close) { close.click(); }
+      fill("user-name", "");
+      fill("password", "");
+    }
+    setTimeout(next, 0);
+  }, 0);
+}
+next();"""
+
+
+@dataclass
+class CorpusCase:
+    username: str
+    password: str
+    category: str = "misc"
+    expect  : str = "error"       # "error" (rejected) or "dashboard" (logged in)
+    message : str = ""            # substring the error text must contain
+
+
+@dataclass
+class CaseResult:
+    case : CorpusCase
+    error: str
+    url  : str
+
+    @property
+    def outcome(self) -> str:
+        if self.url.split("?")[0].endswith(DASHBOARD_PATH):
+            return "dashboard"
+        return "error" if self.error else "none"
+
+    @property
+    def passed(self) -> bool:
+        return self.outcome == self.case.expect and self.case.message in self.error
+
+    def describe(self) -> str:
+        return (f"{self.case.category}: {self.case.username!r}/{self.case.password!r} → "
+                f"{self.outcome} {self.error!r} (expected {self.case.expect}"
+                + (f" with {self.case.message!r})" if self.case.message else ")"))
+
+
+def load_corpus(path: str) -> list:
+    with open(path, encoding="utf-8") as handle:
+        return [CorpusCase(**json.loads(line)) for line in handle if line.strip()]
+
+
+def run_corpus(driver, cases: list, batch_size: int = CORPUS_BATCH, reset=SessionPool.reset) -> tuple:
+    """Run every case on the login page `driver` is on; returns ([CaseResult], script calls)."""
+    results, calls, index = [], 0, 0
+    while index < len(cases):
+        batch  = cases[index:index + batch_size]
+        rows   = driver.execute_async_script(CORPUS_SCRIPT, [[c.username, c.password] for c in batch])
+        calls += 1
+        if not rows:
+            raise RuntimeError(f"corpus batch at case {index} returned nothing (not on the login page?)")
+        results.extend(CaseResult(case, error, url) for case, (error, url) in zip(batch, rows))
+        index += len(rows)
+        if results[-1].outcome == "dashboard":
+            reset(driver)      # a case logged in; start the rest from a clean login page
+    return results, calls
+
+
+def summarise(results: list, calls: int) -> dict:
+    """Per-category pass/fail counts, plus the failing cases."""
+    categories = {}
+    for result in results:
+        entry = categories.setdefault(result.case.category, {"cases": 0, "passed": 0, "logged_in": 0})
+        entry["cases"]     += 1
+        entry["passed"]    += result.passed
+        entry["logged_in"] += result.outcome == "dashboard"
+    return {
+        "cases"       : len(results),
+        "passed"      : sum(r.passed for r in results),
+        "script_calls": calls,
+        "categories"  : dict(sorted(categories.items())),
+        "failures"    : [r.describe() for r in results if not r.passed],
+    }
@@ -0,0 +1,108 @@
+"""
+============================================================
+  result_stream.py
+  Append-only JSONL stream of (test, config) results
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+pytest-html builds its report in memory and writes it once the
+run is over. Here every result is appended to a JSONL file the
+moment `pytest_runtest_makereport` produces it, so a report can
+be rendered (stream_report.py) at any point during the run.
+
+One line per record:
+  {"type": "run",    "run_id", "started", "configs": [...],
+                     "shard": [i, N], "history" (sharded runs only)}
+  {"type": "result", "nodeid", "test", "config", "when", "outcome",
+                     "duration", "setup", "worker", "ts", "detail"}
+
+`setup` (call records only) is the passed setup phase's duration,
+which is otherwise not streamed — session acquisition lives there.
+  {"type": "end",    "run_id", "finished", "exitstatus"}
+
+`history` fingerprints the duration history a shard was
+partitioned with (DurationModel.fingerprint); merge_shards.py
+refuses shards whose fingerprints differ.
+
+Each record is a single `os.write` on an O_APPEND descriptor, so
+xdist workers can share the file without interleaving lines.
+"""
+
+import os
+import json
+import time
+import uuid
+
+DETAIL_LIMIT = 2000   # characters of failure text kept per record
+
+
+class ResultStream:
+    """Writer side: one per process, appending to a shared JSONL file."""
+
+    def __init__(self, path, worker: str = "main"):
+        self.path   = path
+        self.worker = worker
+        self._fd    = None
+
+    def start_run(self, configs: list, shard: tuple = None, history: str = "") -> str:
+        """Truncate the stream and write the run header (controller / serial only)."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        run_id = uuid.uuid4().hex[:12]
+        header = {"type": "run", "run_id": run_id, "started": time.time(), "configs": configs}
+        if shard is not None:
+            header["shard"]   = list(shard)
+            header["history"] = history
+        self._write(header)
+        return run_id
+
+    def end_run(self, exitstatus: int):
+        self._write({"type": "end", "finished": time.time(), "exitstatus": int(exitstatus)})
+
+    def record(self, item, report, config=None):
+        """Stream the call phase of every test, plus setup/teardown phases that did not pass."""
+        if report.when != "call" and report.passed:
+            return
+        detail = report.longreprtext[-DETAIL_LIMIT:] if report.failed else ""
+        if report.skipped and isinstance(report.longrepr, tuple):
+            detail = report.longrepr[2]
+        self._write({
+            "type"    : "result",
+            "nodeid"  : report.nodeid,
+            "test"    : getattr(item, "originalname", item.name),
+            "cls"     : item.cls.__name__ if getattr(item, "cls", None) else "",
+            "config"  : config["id"] if config else "",
+            "when"    : report.when,
+            "outcome" : report.outcome,
+            "duration": round(report.duration, 4),
+            "setup"   : round(item.rep_setup.duration, 4) if report.when == "call" and hasattr(item, "rep_setup") else 0.0,
+            "worker"  : self.worker,
+            "ts"      : time.time(),
+            "detail"  : detail,
+        })
+
+    def _write(self, record: dict):
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        os.write(self._fd, (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8"))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def read_stream(path):
+    """
+    Yield records from a stream that may still be growing; a partially
+    written last line is ignored rather than raising.
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.endswith("\n"):
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
@@ -0,0 +1,238 @@
+"""
+============================================================
+  results_store.py
+  Historical results across builds (SQLite)
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+At the end of every run the JSONL result stream is folded into
+one row per (build, test node id) and stored in SQLite next to
+the reports. Indexes on (nodeid, build) and (config, build) keep
+the history queries cheap with hundreds of builds: each query
+first narrows to the last N builds by primary key.
+
+  builds   id, name (BrowserStack buildName), run_id, started,
+           finished, exitstatus
+  results  build_id, nodeid, test, config, outcome, duration
+           (setup + call), attempts (>1 when pytest-rerunfailures
+           retried it)
+
+Flake rate per test = (outcome flips between consecutive builds
++ builds where it only passed on a rerun) / builds it ran in.
+
+CLI:
+    python results_store.py builds
+    python results_store.py slowest-configs --last 20
+    python results_store.py flakiest --last 50 --top 10
+    python results_store.py regressions --since 41
+"""
+
+import time
+import sqlite3
+import argparse
+
+from browserstack_config import RESULTS_DB, RESULTS_STREAM, BUILD_NAME
+from result_stream import read_stream
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id         INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    run_id     TEXT UNIQUE,
+    started    REAL,
+    finished   REAL,
+    exitstatus INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    build_id INTEGER NOT NULL REFERENCES builds(id) ON DELETE CASCADE,
+    nodeid   TEXT NOT NULL,
+    test     TEXT NOT NULL,
+    config   TEXT NOT NULL,
+    outcome  TEXT NOT NULL,
+    duration REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (build_id, nodeid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_nodeid ON results (nodeid, build_id, outcome, attempts);
+CREATE INDEX IF NOT EXISTS results_by_config ON results (config, build_id);
+CREATE INDEX IF NOT EXISTS builds_by_name    ON builds (name, id);
+"""
+
+
+class ResultsStore:
+    """Thin query layer over the results database."""
+
+    def __init__(self, path=RESULTS_DB):
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ── Writing ──────────────────────────────────────────────
+    def ingest_stream(self, stream_path=RESULTS_STREAM, build_name=BUILD_NAME) -> int:
+        """Store the last run found in a result stream; returns its build id (re-ingesting replaces it)."""
+        run, end, rows = {}, {}, {}
+        for record in read_stream(stream_path):
+            if record["type"] == "run":
+                run, end, rows = record, {}, {}
+            elif record["type"] == "end":
+                end = record
+            elif record["type"] == "result":
+                row = rows.setdefault(record["nodeid"], {
+                    "test": record["test"], "config": record["config"],
+                    "outcome": "passed", "duration": 0.0, "attempts": 1,
+                })
+                row["duration"] += record["duration"] + record.get("setup", 0.0)
+                if record["outcome"] == "rerun":
+                    row["attempts"] += 1
+                elif record["outcome"] == "failed":
+                    row["outcome"] = "failed" if record["when"] == "call" else "error"
+                elif record["outcome"] == "skipped" and row["outcome"] == "passed":
+                    row["outcome"] = "skipped"
+
+        with self.db:
+            self.db.execute("DELETE FROM builds WHERE run_id = ?", (run.get("run_id"),))
+            build_id = self.db.execute(
+                "INSERT INTO builds (name, run_id, started, finished, exitstatus) VALUES (?, ?, ?, ?, ?)",
+                (build_name, run.get("run_id"), run.get("started", time.time()),
+                 end.get("finished"), end.get("exitstatus")),
+            ).lastrowid
+            self.db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(build_id, nodeid, r["test"], r["config"], r["outcome"], round(r["duration"], 4), r["attempts"])
+                 for nodeid, r in rows.items()],
+            )
+        # Bounded ANALYZE keeps the planner on the (config, build) index as history grows.
+        self.db.execute("PRAGMA analysis_limit = 1000")
+        self.db.execute("ANALYZE")
+        return build_id
+
+    # ── Queries ──────────────────────────────────────────────
+    def _first_build(self, last: int) -> int:
+        """Lowest build id among the `last` most recent builds."""
+        row = self.db.execute(
+            "SELECT MIN(id) FROM (SELECT id FROM builds ORDER BY id DESC LIMIT ?)", (last,)
+        ).fetchone()
+        return row[0] or 0
+
+    def resolve_build(self, ref) -> int:
+        """Build id from an id, a run_id, or a build name (its latest build)."""
+        ref = str(ref)
+        row = self.db.execute(
+            "SELECT id FROM builds WHERE CAST(id AS TEXT) = ? OR run_id = ? OR name = ? ORDER BY id DESC LIMIT 1",
+            (ref, ref, ref),
+        ).fetchone()
+        if row is None:
+            raise LookupError(f"No build matches {ref!r}")
+        return row[0]
+
+    def builds(self, last: int = 20) -> list:
+        return self.db.execute("""
+            SELECT b.id, b.name, b.run_id, b.started, b.exitstatus, COUNT(r.nodeid) AS results,
+                   ROUND(100.0 * SUM(r.outcome = 'passed') / MAX(SUM(r.outcome != 'skipped'), 1), 1) AS pass_rate
+            FROM builds b LEFT JOIN results r ON r.build_id = b.id
+            WHERE b.id >= ? GROUP BY b.id ORDER BY b.id DESC""", (self._first_build(last),)).fetchall()
+
+    def slowest_configs(self, last: int = 20) -> list:
+        """Average / max test duration and pass rate per config over the last N builds."""
+        return self.db.execute("""
+            SELECT config, COUNT(*) AS runs,
+                   ROUND(AVG(duration), 3) AS avg_duration, ROUND(MAX(duration), 3) AS max_duration,
+                   ROUND(100.0 * SUM(outcome = 'passed') / MAX(SUM(outcome != 'skipped'), 1), 1) AS pass_rate
+            FROM results WHERE build_id >= ? AND outcome != 'skipped'
+            GROUP BY config ORDER BY avg_duration DESC""", (self._first_build(last),)).fetchall()
+
+    def flakiest_tests(self, last: int = 20, top: int = 10, min_runs: int = 3) -> list:
+        """Tests whose outcome flips between builds or that needed reruns, worst first."""
+        return self.db.execute("""
+            WITH recent AS (
+                SELECT nodeid, outcome, attempts,
+                       LAG(outcome) OVER (PARTITION BY nodeid ORDER BY build_id) AS previous
+                FROM results WHERE build_id >= ? AND outcome != 'skipped'
+            )
+            SELECT nodeid, COUNT(*) AS runs,
+                   SUM(previous IS NOT NULL AND previous != outcome) AS flips,
+                   SUM(attempts > 1 AND outcome = 'passed') AS rerun_passes,
+                   ROUND(100.0 * SUM(outcome = 'passed') / COUNT(*), 1) AS pass_rate,
+                   ROUND(1.0 * (SUM(previous IS NOT NULL AND previous != outcome)
+                                + SUM(attempts > 1 AND outcome = 'passed')) / COUNT(*), 3) AS flake_rate
+            FROM recent GROUP BY nodeid HAVING runs >= ? AND flake_rate > 0
+            ORDER BY flake_rate DESC, runs DESC LIMIT ?""",
+            (self._first_build(last), min_runs, top)).fetchall()
+
+    def regressions_since(self, build, slower: float = 1.5, min_delta: float = 0.5) -> dict:
+        """
+        Compare the latest build with `build`: tests that passed then and fail
+        now, and tests whose duration grew by more than the `slower` factor
+        (and by at least `min_delta` seconds, so sub-second noise is ignored).
+        """
+        base   = self.resolve_build(build)
+        latest = self.db.execute("SELECT MAX(id) FROM builds").fetchone()[0]
+        pairs  = """
+            FROM results old JOIN results new ON new.nodeid = old.nodeid
+            WHERE old.build_id = ? AND new.build_id = ?"""
+        failing = self.db.execute(f"""
+            SELECT new.nodeid, old.outcome AS was, new.outcome AS now {pairs}
+              AND old.outcome = 'passed' AND new.outcome IN ('failed', 'error')
+            ORDER BY new.nodeid""", (base, latest)).fetchall()
+        slowed = self.db.execute(f"""
+            SELECT new.nodeid, old.duration AS was, new.duration AS now,
+                   ROUND(new.duration / old.duration, 2) AS factor {pairs}
+              AND old.outcome != 'skipped' AND new.outcome != 'skipped' AND old.duration > 0
+              AND new.duration > old.duration * ? AND new.duration - old.duration >= ?
+            ORDER BY factor DESC""", (base, latest, slower, min_delta)).fetchall()
+        return {"base": base, "latest": latest, "failing": failing, "slower": slowed}
+
+
+# ─────────────────────────────────────────────────────────────
+#  CLI
+# ─────────────────────────────────────────────────────────────
+def _print_rows(rows):
+    if not rows:
+        print("  (none)")
+        return
+    keys   = rows[0].keys()
+    widths = [max(len(k), *(len(str(r[k])) for r in rows)) for k in keys]
+    print("  " + "  ".join(k.ljust(w) for k, w in zip(keys, widths)))
+    for row in rows:
+        print("  " + "  ".join(str(row[k]).ljust(w) for k, w in zip(keys, widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the historical results store.")
+    parser.add_argument("--db", default=RESULTS_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("builds").add_argument("--last", type=int, default=20)
+    commands.add_parser("slowest-configs").add_argument("--last", type=int, default=20)
+    flaky = commands.add_parser("flakiest")
+    flaky.add_argument("--last", type=int, default=20)
+    flaky.add_argument("--top", type=int, default=10)
+    regress = commands.add_parser("regressions")
+    regress.add_argument("--since", required=True, help="build id, run id or build name")
+    regress.add_argument("--slower", type=float, default=1.5)
+    regress.add_argument("--min-delta", type=float, default=0.5, help="seconds")
+    ingest = commands.add_parser("ingest")
+    ingest.add_argument("stream", nargs="?", default=RESULTS_STREAM)
+    ingest.add_argument("--build", default=BUILD_NAME)
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    if args.command == "builds":
+        _print_rows(store.builds(args.last))
+    elif args.command == "slowest-configs":
+        _print_rows(store.slowest_configs(args.last))
+    elif args.command == "flakiest":
+        _print_rows(store.flakiest_tests(args.last, args.top))
+    elif args.command == "regressions":
+        found = store.regressions_since(args.since, args.slower, args.min_delta)
+        print(f"build {found['latest']} vs build {found['base']}")
+        print("newly failing:")
+        _print_rows(found["failing"])
+        print(f"slower than x{args.slower}:")
+        _print_rows(found["slower"])
+    elif args.command == "ingest":
+        print(f"stored as build {store.ingest_stream(args.stream, args.build)}")
+    store.close()
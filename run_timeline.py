@@ -0,0 +1,256 @@
+"""
+============================================================
+  run_timeline.py
+  Run-level trace (Chrome trace events / Perfetto) and slot utilisation
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Command latency (instrumentation.py) says how long each call
+took, not how the run used its parallel slots. This records
+wall-clock spans for the whole run and writes them as Chrome
+trace events (open in ui.perfetto.dev or chrome://tracing):
+
+  Slots    one lane per slot (xdist worker, or `main`): the test
+           phases (setup, test, teardown) and, nested inside
+           them, waits, navigations and WebDriver commands
+  Configs  one lane per BROWSER_MATRIX config: session lifetimes
+           (creation → quit), session creation including the
+           BrowserStack queue, slot waits, background quits and
+           status updates, and which test ran when
+  counter  live sessions over time
+
+Span kinds: queue (waiting for a slot), session, newSession,
+setup, test, teardown, wait, navigation, command.
+
+summarise() turns the spans into the numbers for tuning
+parallelism: wall time, per-slot busy/idle and where the busy
+time went (exclusive time per span kind, so a sleep inside a
+test body shows as `test` self time), peak and mean live
+sessions, time spent creating sessions, and the critical path:
+the slot that finished last, and the longest config, whose tests
+run back to back on one slot and bound the makespan from below.
+
+Under xdist each worker hands its spans to the controller, so
+the trace always covers the whole run.
+"""
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+PHASES = ("setup", "test", "teardown")
+CONFIG_LANE_KINDS = {"queue", "session", "newSession", "setup", "test", "teardown"}
+
+
+class TimelineRecorder:
+    """Thread-safe list of wall-clock spans for this process."""
+
+    def __init__(self):
+        self.enabled = True
+        self.worker  = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self._spans  = []
+        self._lock   = threading.Lock()
+
+    def span(self, name: str, kind: str, config_id: str, start: float, end: float, **args):
+        """Record one span; `start` / `end` are time.time() seconds."""
+        if not self.enabled:
+            return
+        record = {"name": name, "kind": kind, "config": config_id or "", "worker": self.worker,
+                  "main": threading.current_thread() is threading.main_thread(),
+                  "start": start, "end": end, "args": args}
+        with self._lock:
+            self._spans.append(record)
+
+    @contextmanager
+    def timed(self, name: str, kind: str, config_id: str, **args):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.span(name, kind, config_id, start, time.time(), **args)
+
+    def extend(self, spans):
+        with self._lock:
+            self._spans.extend(spans)
+
+    def spans(self) -> list:
+        with self._lock:
+            return list(self._spans)
+
+
+TIMELINE = TimelineRecorder()
+
+
+# ─────────────────────────────────────────────────────────────
+#  SUMMARY
+# ─────────────────────────────────────────────────────────────
+def exclusive_times(spans: list) -> dict:
+    """{kind: seconds} of self time (minus nested children) for one lane's properly nested spans."""
+    totals, stack = {}, []
+
+    def close(entry):
+        own = entry["end"] - entry["start"] - entry["children"]
+        totals[entry["kind"]] = totals.get(entry["kind"], 0.0) + max(0.0, own)
+
+    for span in sorted(spans, key=lambda s: (s["start"], -s["end"])):
+        while stack and stack[-1]["end"] <= span["start"]:
+            close(stack.pop())
+        if stack:
+            stack[-1]["children"] += min(span["end"], stack[-1]["end"]) - span["start"]
+        stack.append({"start": span["start"], "end": span["end"], "kind": span["kind"], "children": 0.0})
+    while stack:
+        close(stack.pop())
+    return totals
+
+
+def peak_concurrency(intervals: list) -> tuple:
+    """(peak, time-weighted mean) number of overlapping (start, end) intervals."""
+    events = sorted([(s, 1) for s, _ in intervals] + [(e, -1) for _, e in intervals])
+    if not events:
+        return 0, 0.0
+    live = peak = 0
+    area, last = 0.0, events[0][0]
+    for at, delta in events:
+        area += live * (at - last)
+        live += delta
+        peak  = max(peak, live)
+        last  = at
+    wall = events[-1][0] - events[0][0]
+    return peak, (area / wall if wall else 0.0)
+
+
+def summarise(spans: list, slots: int = None) -> dict:
+    """Utilisation, idle time, concurrency and critical path of a run (JSON-serialisable)."""
+    if not spans:
+        return {}
+    begin = min(s["start"] for s in spans)
+    end   = max(s["end"] for s in spans)
+    wall  = end - begin
+    lanes = {}
+    for span in spans:
+        if span["main"]:
+            lanes.setdefault(span["worker"], []).append(span)
+
+    slot_rows = {}
+    for worker, lane in sorted(lanes.items()):
+        phases = [s for s in lane if s["kind"] in PHASES]
+        busy   = sum(s["end"] - s["start"] for s in phases)
+        slot_rows[worker] = {
+            "busy_s"     : round(busy, 3),
+            "idle_s"     : round(wall - busy, 3),
+            "utilisation": round(busy / wall, 4) if wall else 0.0,
+            "tests"      : sum(1 for s in phases if s["kind"] == "test"),
+            "finished_at": round(max((s["end"] for s in phases), default=begin) - begin, 3),
+            "self_time_s": {k: round(v, 3) for k, v in sorted(exclusive_times(lane).items())},
+        }
+
+    sessions = [(s["start"], s["end"]) for s in spans if s["kind"] == "session"]
+    peak, mean = peak_concurrency(sessions)
+    creation   = [s["end"] - s["start"] for s in spans if s["kind"] == "newSession"]
+    queueing   = [s["end"] - s["start"] for s in spans if s["kind"] == "queue"]
+
+    per_config = {}
+    for span in spans:
+        if span["kind"] in PHASES and span["config"]:
+            per_config[span["config"]] = per_config.get(span["config"], 0.0) + span["end"] - span["start"]
+    longest  = max(per_config.items(), key=lambda kv: kv[1], default=("", 0.0))
+    critical = max(slot_rows.items(), key=lambda kv: kv[1]["finished_at"], default=("", {}))
+    critical_tests = sorted((s for s in lanes.get(critical[0], []) if s["kind"] == "test"),
+                            key=lambda s: s["start"] - s["end"])[:5]
+
+    lane_count = len(slot_rows)
+    capacity   = (slots or lane_count) * wall
+    busy_total = sum(row["busy_s"] for row in slot_rows.values())
+    return {
+        "wall_s"            : round(wall, 3),
+        "slots"             : slots or lane_count,
+        "slot_lanes"        : lane_count,
+        "utilisation"       : round(busy_total / capacity, 4) if capacity else 0.0,
+        "idle_slot_s"       : round(capacity - busy_total, 3),
+        "by_slot"           : slot_rows,
+        "sessions"          : {"count": len(sessions), "peak_live": peak, "mean_live": round(mean, 2),
+                               "creation_total_s": round(sum(creation), 3),
+                               "creation_max_s": round(max(creation, default=0.0), 3),
+                               "slot_wait_total_s": round(sum(queueing), 3)},
+        "critical_path"     : {
+            "slot"           : critical[0],
+            "finished_at_s"  : critical[1].get("finished_at", 0.0),
+            "longest_tests"  : [{"test": s["name"], "config": s["config"], "s": round(s["end"] - s["start"], 3)}
+                                for s in critical_tests],
+            "longest_config" : longest[0],
+            "longest_config_s": round(longest[1], 3),
+        },
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+#  CHROME TRACE EXPORT
+# ─────────────────────────────────────────────────────────────
+def pack(spans: list) -> list:
+    """[(sub-lane, span)]: spans that overlap without nesting go to further sub-lanes."""
+    lanes, placed = [], []            # per sub-lane: stack of open span ends
+    for span in sorted(spans, key=lambda s: (s["start"], -s["end"])):
+        for index, stack in enumerate(lanes + [[]]):
+            while stack and stack[-1] <= span["start"]:
+                stack.pop()
+            if not stack or span["end"] <= stack[-1]:
+                if index == len(lanes):
+                    lanes.append(stack)
+                stack.append(span["end"])
+                placed.append((index, span))
+                break
+    return placed
+
+
+def trace_events(spans: list) -> list:
+    """Chrome trace `X` / `C` / `M` events: pid 1 = slots, pid 2 = configs."""
+    if not spans:
+        return []
+    origin = min(s["start"] for s in spans)
+
+    def us(seconds: float) -> int:
+        return int(round((seconds - origin) * 1e6))
+
+    groups = {}                       # (pid, lane name) → spans
+    for span in spans:
+        if span["main"]:
+            groups.setdefault((1, span["worker"]), []).append(span)
+        if span["config"] and (span["kind"] in CONFIG_LANE_KINDS or not span["main"]):
+            groups.setdefault((2, span["config"]), []).append(span)
+
+    events, tids = [], {}
+    for (pid, name), members in sorted(groups.items()):
+        for lane, span in pack(members):
+            label  = name if lane == 0 else f"{name} #{lane + 1}"
+            number = tids.setdefault((pid, label), len(tids) + 1)
+            events.append({"name": span["name"], "cat": span["kind"], "ph": "X", "pid": pid, "tid": number,
+                           "ts": us(span["start"]), "dur": max(1, us(span["end"]) - us(span["start"])),
+                           "args": {"config": span["config"], "worker": span["worker"], **span["args"]}})
+
+    changes = sorted([(s["start"], 1) for s in spans if s["kind"] == "session"]
+                     + [(s["end"], -1) for s in spans if s["kind"] == "session"])
+    live = 0
+    for at, delta in changes:
+        live += delta
+        events.append({"name": "live sessions", "ph": "C", "pid": 2, "ts": us(at), "args": {"sessions": live}})
+
+    events.append({"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "Slots"}})
+    events.append({"name": "process_name", "ph": "M", "pid": 2, "args": {"name": "Configs"}})
+    for (pid, label), number in tids.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": number, "args": {"name": label}})
+        events.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": number,
+                       "args": {"sort_index": number}})
+    return events
+
+
+def export(path, spans: list, slots: int = None) -> dict:
+    """Write the trace (with the summary under `summary`); returns the summary."""
+    summary = summarise(spans, slots)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"traceEvents": trace_events(spans), "displayTimeUnit": "ms",
+                                "summary": summary}))
+    return summary
@@ -0,0 +1,46 @@
+"""
+============================================================
+  saucedemo.py
+  SauceDemo's accounts, error messages and login rules
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+SauceDemo checks credentials in its client bundle, so the rules
+are known up front. They live here, not in local_grid.py, because
+both the stand-in grid (to render the outcome) and load_test.py
+(to decide whether a scenario goes on to the inventory page)
+need them.
+"""
+
+PASSWORD = "secret_sauce"
+USERS    = {
+    "standard_user", "locked_out_user", "problem_user",
+    "performance_glitch_user", "error_user", "visual_user",
+}
+LOCKED_USERS = {"locked_out_user"}
+
+ERR_USERNAME_REQUIRED = "Epic sadface: Username is required"
+ERR_PASSWORD_REQUIRED = "Epic sadface: Password is required"
+ERR_NO_MATCH          = "Epic sadface: Username and password do not match any user in this service"
+ERR_LOCKED_OUT        = "Epic sadface: Sorry, this user has been locked out."
+ERR_NOT_LOGGED_IN     = "Epic sadface: You can only access '/inventory.html' when you are logged in."
+
+DASHBOARD_PATH = "/inventory.html"
+
+
+def login_error(username: str, password: str) -> str:
+    """The error banner SauceDemo shows for these credentials ('' when the login goes through)."""
+    if not username:
+        return ERR_USERNAME_REQUIRED
+    if not password:
+        return ERR_PASSWORD_REQUIRED
+    if username not in USERS or password != PASSWORD:
+        return ERR_NO_MATCH
+    if username in LOCKED_USERS:
+        return ERR_LOCKED_OUT
+    return ""
+
+
+def login_accepted(username: str, password: str) -> bool:
+    """True when SauceDemo lets these credentials through to /inventory.html."""
+    return not login_error(username, password)
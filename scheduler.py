@@ -0,0 +1,348 @@
+"""
+============================================================
+  scheduler.py
+  Concurrency-aware scheduling of the (test, config) matrix
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+BrowserStack queues any session beyond the account's parallel
+allowance, and queued sessions eventually hit `idleTimeout`.
+MatrixScheduler keeps us inside the allowance:
+
+  • a global slot budget  (BS_PARALLEL_SLOTS, the plan's parallels)
+  • a per-platform cap    (BS_PARALLELS_PER_PLATFORM, as in
+                           browserstack.yml `parallelsPerPlatform`)
+  • a work queue of (test, BROWSER_MATRIX entry) pairs; workers
+    pull the next runnable pair the moment a slot frees up
+  • live metrics: queue depth, slots in use, time-weighted slot
+    utilisation, per-platform occupancy
+
+It is used three ways:
+  run()               thread workers for in-process matrix runs
+  try_acquire/release the slot ledger SessionPool opens sessions on
+  SlotScheduling      a pytest-xdist scheduler (controller side)
+"""
+
+import re
+import time
+import threading
+from collections import deque
+
+from browserstack_config import PARALLEL_SLOTS, PARALLELS_PER_PLATFORM
+
+
+def platform_key(config: dict) -> str:
+    """One BrowserStack 'platform' = one entry of the browser matrix."""
+    return config["id"]
+
+
+class MatrixScheduler:
+    """Global slot semaphore + per-platform caps + (test, config) work queue."""
+
+    def __init__(self, slots=PARALLEL_SLOTS, per_platform=PARALLELS_PER_PLATFORM, key=platform_key):
+        self.slots        = slots
+        self.per_platform = per_platform
+        self.key          = key
+        self._cond        = threading.Condition()
+        self._queue       = deque()
+        self._in_use      = {}        # platform → slots held
+        self._running     = 0
+        self._completed   = 0
+        self._peak        = 0
+        self._peak_queue  = 0
+        self._started     = time.monotonic()
+        self._last_change = self._started
+        self._busy        = 0.0       # slot-seconds held so far
+
+    # ── Slot ledger ──────────────────────────────────────────
+    def _has_capacity(self, platform: str) -> bool:
+        return (self._running < self.slots
+                and self._in_use.get(platform, 0) < self.per_platform)
+
+    def _account(self, delta: int, platform: str):
+        now = time.monotonic()
+        self._busy += self._running * (now - self._last_change)
+        self._last_change = now
+        self._running += delta
+        self._in_use[platform] = self._in_use.get(platform, 0) + delta
+        if not self._in_use[platform]:
+            del self._in_use[platform]
+        self._peak = max(self._peak, self._running)
+
+    def held(self, config: dict) -> int:
+        """Slots currently held by this config's platform."""
+        with self._cond:
+            return self._in_use.get(self.key(config), 0)
+
+    def try_acquire(self, config: dict) -> bool:
+        """Take a slot for this config's platform without blocking."""
+        with self._cond:
+            platform = self.key(config)
+            if not self._has_capacity(platform):
+                return False
+            self._account(+1, platform)
+            return True
+
+    def acquire(self, config: dict, timeout=None) -> bool:
+        """Block until a slot for this config's platform is free."""
+        with self._cond:
+            platform = self.key(config)
+            if not self._cond.wait_for(lambda: self._has_capacity(platform), timeout):
+                return False
+            self._account(+1, platform)
+            return True
+
+    def release(self, config: dict):
+        with self._cond:
+            self._account(-1, self.key(config))
+            self._completed += 1
+            self._cond.notify_all()
+
+    # ── Work queue ───────────────────────────────────────────
+    def note_queue_depth(self, depth: int):
+        """Count a queue kept outside the ledger (the xdist pending list) in the peak depth."""
+        with self._cond:
+            self._peak_queue = max(self._peak_queue, depth)
+
+    def submit(self, test, config: dict):
+        with self._cond:
+            self._queue.append((test, config))
+            self._peak_queue = max(self._peak_queue, len(self._queue))
+            self._cond.notify_all()
+
+    def _next_runnable(self):
+        """First queued pair whose platform has capacity (FIFO otherwise)."""
+        for index, (test, config) in enumerate(self._queue):
+            if self._has_capacity(self.key(config)):
+                del self._queue[index]
+                return test, config
+        return None
+
+    def run(self, pairs, fn, workers=None) -> list:
+        """
+        Run fn(test, config) for every pair on worker threads, never
+        exceeding the slot budget or a platform's cap. Returns
+        [(test, config, result_or_exception), ...] in completion order.
+        """
+        for test, config in pairs:
+            self.submit(test, config)
+        results = []
+        done    = threading.Lock()
+
+        def worker():
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: not self._queue or self._next_runnable_peek())
+                    if not self._queue:
+                        return
+                    test, config = self._next_runnable()
+                    self._account(+1, self.key(config))
+                try:
+                    outcome = fn(test, config)
+                except Exception as exc:   # reported per pair, never kills the worker
+                    outcome = exc
+                with done:
+                    results.append((test, config, outcome))
+                self.release(config)
+
+        threads = [threading.Thread(target=worker, name=f"matrix-slot-{i}", daemon=True)
+                   for i in range(workers or self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def _next_runnable_peek(self) -> bool:
+        return any(self._has_capacity(self.key(config)) for _, config in self._queue)
+
+    # ── Metrics ──────────────────────────────────────────────
+    def metrics(self) -> dict:
+        """Snapshot of queue depth and slot usage; safe to call from any thread."""
+        with self._cond:
+            now     = time.monotonic()
+            busy    = self._busy + self._running * (now - self._last_change)
+            elapsed = max(now - self._started, 1e-9)
+            return {
+                "queue_depth"     : len(self._queue),
+                "peak_queue_depth": self._peak_queue,
+                "slots"           : self.slots,
+                "slots_in_use"    : self._running,
+                "peak_slots"      : self._peak,
+                "utilisation"     : round(busy / (self.slots * elapsed), 3),
+                "per_platform"    : dict(self._in_use),
+                "completed"       : self._completed,
+            }
+
+
+# ─────────────────────────────────────────────────────────────
+#  PYTEST-XDIST INTEGRATION (controller side)
+# ─────────────────────────────────────────────────────────────
+_PARAM_ID = re.compile(r"\[([^\]]+)\]$")
+
+
+def nodeid_platform(nodeid: str) -> str:
+    """'...::test_x[chrome_win11]' → 'chrome_win11' ('' if not parametrised)."""
+    m = _PARAM_ID.search(nodeid)
+    return m.group(1) if m else ""
+
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:   # pytest-xdist not installed: serial runs only
+    LoadScheduling = object
+
+
+class PlatformQueues:
+    """
+    The xdist pending list, kept as one deque of item indices per
+    platform (in first-seen order, so the collection order is kept).
+    Supports what LoadScheduling does with `pending` (truth, len,
+    iteration, extend, insert) plus O(1) per-platform takes.
+    """
+
+    def __init__(self, collection: list, indices=()):
+        self.collection = collection
+        self.platform   = {}              # item index → platform, parsed once
+        self.queues     = {}              # platform → deque of item indices
+        self.extend(indices)
+
+    def _platform(self, index: int) -> str:
+        platform = self.platform.get(index)
+        if platform is None:
+            platform = self.platform[index] = nodeid_platform(self.collection[index])
+        return platform
+
+    def extend(self, indices):
+        for index in indices:
+            self.queues.setdefault(self._platform(index), deque()).append(index)
+
+    def append(self, index: int):
+        self.extend((index,))
+
+    def insert(self, position: int, index: int):
+        """Re-queued items (e.g. a crashed node's) go to the front of their platform."""
+        self.queues.setdefault(self._platform(index), deque()).appendleft(index)
+
+    def platforms(self) -> list:
+        return list(self.queues)
+
+    def take(self, platform: str, count: int) -> list:
+        queue = self.queues.get(platform)
+        taken = []
+        while queue and len(taken) < count:
+            taken.append(queue.popleft())
+        if queue is not None and not queue:
+            del self.queues[platform]
+        return taken
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.queues.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.queues)
+
+    def __iter__(self):
+        for queue in self.queues.values():
+            yield from queue
+
+
+class SlotScheduling(LoadScheduling):
+    """
+    xdist scheduling where every worker node is one slot.
+
+    A node keeps pulling pairs of its current platform (its pooled
+    session stays warm). When that platform runs dry it claims a
+    platform no node holds yet; only once every pending platform is
+    held does it double up on one below its cap, so each config gets a
+    second session only at the tail of the run. The node count (-n) is
+    the global budget, capped at BS_PARALLEL_SLOTS (or this shard's
+    share of it). Each node always holds two pending items because an
+    xdist worker needs to know its next item before it runs; a node
+    whose platform has one item left tops up from the next platform,
+    and once nothing is pending, nodes holding a single item are shut
+    down so they run it.
+    """
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.ledger        = MatrixScheduler(slots=min(self.numnodes, getattr(config, "bs_slots", PARALLEL_SLOTS)))
+        self.node2platform = {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            return self._fill_idle_nodes()
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+        self.collection = next(iter(self.node2collection.values()))
+        self.pending    = PlatformQueues(self.collection, range(len(self.collection)))
+        self.ledger.note_queue_depth(len(self.pending))
+        self._fill_idle_nodes()
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+        self._assign(node)
+        self._fill_idle_nodes()
+
+    def remove_node(self, node):
+        self._drop_platform(node)
+        crashitem = super().remove_node(node)
+        self._fill_idle_nodes()
+        return crashitem
+
+    # ── helpers ──────────────────────────────────────────────
+    def _fill_idle_nodes(self):
+        for node in self.nodes:
+            if not node.shutting_down and len(self.node2pending[node]) < 2:
+                self._assign(node)
+
+    def _drop_platform(self, node):
+        platform = self.node2platform.pop(node, None)
+        if platform is not None:
+            self.ledger.release({"id": platform})
+
+    def _claim_platform(self, node) -> bool:
+        """Give `node` the first pending platform nobody holds, else the first one below its cap."""
+        platforms = self.pending.platforms()
+        held      = {platform: self.ledger.held({"id": platform}) for platform in platforms}
+        for platform in sorted(platforms, key=lambda p: held[p] > 0):     # stable: unclaimed first
+            if self.ledger.try_acquire({"id": platform}):
+                self.node2platform[node] = platform
+                return True
+        return False
+
+    def _assign(self, node):
+        node_pending = self.node2pending[node]
+        want = 2 - len(node_pending)
+        if not self.pending:
+            self._drop_platform(node)
+            node.shutdown()
+            return
+        if want <= 0:
+            return
+
+        current = self.node2platform.get(node)
+        batch   = self.pending.take(current, want) if current is not None else []
+        while len(batch) < want and self.pending:
+            # Current platform exhausted: top up from the next platforms with
+            # room, or the worker would sit on its last item forever.
+            self._drop_platform(node)
+            if not self._claim_platform(node):
+                break
+            batch += self.pending.take(self.node2platform[node], want - len(batch))
+        if batch:
+            node_pending.extend(batch)
+            node.send_runtest_some(batch)
+        if not self.pending:
+            # Nothing left to hand out: let workers holding a single item run it.
+            for other in self.nodes:
+                if not other.shutting_down and len(self.node2pending[other]) < 2:
+                    self._drop_platform(other)
+                    other.shutdown()
+        self.log("scheduler metrics:", self.metrics())
+
+    def metrics(self) -> dict:
+        return {**self.ledger.metrics(), "queue_depth": len(self.pending)}
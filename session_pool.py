@@ -0,0 +1,328 @@
+"""
+============================================================
+  session_pool.py
+  Warm WebDriver session pool — one small pool per config
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Spinning up a remote session costs 10–60 s on BrowserStack, so
+instead of one session per (test, config) pair the `browser`
+fixture borrows a warm session from this pool:
+
+  acquire()  → reuse an idle session for the config (state reset)
+               or open a new one on TARGET_URL
+  release()  → annotate the test result on the session, then keep
+               it warm or recycle it (N uses, failure, idle TTL)
+  close()    → quit every idle session at the end of the run
+
+Annotations go through a TeardownQueue inline; statuses and quits
+run in the background, and the slot of a retired session is
+released once its quit has actually completed.
+
+prewarm() opens sessions for the configs coming up next on
+background threads, already loaded on TARGET_URL, while the current
+test runs. Cost is bounded: at most `lookahead` sessions warm at a
+time, only into free slots (never evicting), and an unused warm
+session is retired once it passes the idle TTL. "Coming up next" is
+this process's own schedule (scheduled_items): under xdist, the
+item the controller has queued on this worker.
+
+When given a `slots` ledger (scheduler.MatrixScheduler) the pool
+never holds more live sessions than the ledger allows: opening a
+session for a new config first retires the least recently used
+idle session of another config.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.common.exceptions import WebDriverException
+
+from teardown import TEARDOWN
+from run_timeline import TIMELINE
+from browserstack_config import (
+    create_driver, TARGET_URL,
+    SESSION_MAX_USES, SESSION_POOL_SIZE, SESSION_IDLE_TTL, PREWARM_DEPTH,
+)
+
+# Storage is origin-scoped, so this runs while still on the target page.
+RESET_STORAGE_SCRIPT = "window.localStorage.clear(); window.sessionStorage.clear();"
+
+
+class PooledSession:
+    """One live remote session plus the bookkeeping the pool needs."""
+
+    def __init__(self, driver, config: dict, opened: float = None):
+        self.driver    = driver
+        self.config    = config
+        self.opened    = opened if opened is not None else time.time()   # wall clock, for the run timeline
+        self.uses      = 0
+        self.failed    = []      # node ids of tests that failed on this session
+        self.last_used = time.monotonic()
+
+    @property
+    def session_id(self) -> str:
+        return self.driver.session_id
+
+
+class SessionPool:
+    """
+    Keeps up to `size` idle sessions per pool_key(config): the config id,
+    plus the capture level when a test asks for a non-default one.
+
+    Thread-safe so the same pool can serve several worker threads; with
+    pytest-xdist each worker process simply gets its own pool.
+    """
+
+    def __init__(self, factory=create_driver, max_uses=SESSION_MAX_USES,
+                 size=SESSION_POOL_SIZE, idle_ttl=SESSION_IDLE_TTL, slots=None,
+                 lookahead=PREWARM_DEPTH, teardown=TEARDOWN):
+        self._factory  = factory
+        self.slots     = slots
+        self.teardown  = teardown
+        self.max_uses  = max_uses
+        self.size      = size
+        self.idle_ttl  = idle_ttl
+        self.lookahead = lookahead
+        self._idle     = {}      # pool_key → [PooledSession, ...]
+        self._warming  = {}      # pool_key → Future of a session being pre-warmed
+        self._lock     = threading.Lock()
+        self._warmers  = ThreadPoolExecutor(max_workers=lookahead, thread_name_prefix="prewarm") if lookahead else None
+        self.stats     = {"created": 0, "reused": 0, "retired": 0, "prewarmed": 0, "prewarm_unused": 0}
+
+    # ── Borrowing ────────────────────────────────────────────
+    def acquire(self, config: dict) -> PooledSession:
+        """Return a clean session sitting on TARGET_URL for this config."""
+        with self._lock:
+            warming = self._warming.get(pool_key(config))
+        if warming is not None:
+            warming.result()   # a pre-warm for this config is in flight: wait for it
+        while True:
+            with self._lock:
+                idle = self._idle.get(pool_key(config), [])
+                session = idle.pop() if idle else None
+            if session is None:
+                break
+            if time.monotonic() - session.last_used > self.idle_ttl:
+                self._retire(session)   # likely reaped by the grid already
+                continue
+            if session.uses:            # pre-warmed sessions are already clean
+                try:
+                    self.reset(session.driver)
+                except WebDriverException:
+                    self._retire(session)
+                    continue
+                with self._lock:
+                    self.stats["reused"] += 1
+            session.uses += 1
+            return session
+
+        session = self.open(config)
+        session.uses += 1
+        return session
+
+    def open(self, config: dict) -> PooledSession:
+        """Start a brand new session and load the target page."""
+        self._claim_slot(config)
+        return self._start(config)
+
+    def _start(self, config: dict) -> PooledSession:
+        """Create the remote session on an already claimed slot."""
+        opened = time.time()
+        try:
+            driver = self._factory(config)
+        except Exception:
+            self._release_slot(config)
+            raise
+        try:
+            driver.get(TARGET_URL)
+        except WebDriverException:
+            driver.quit()
+            self._release_slot(config)
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        return PooledSession(driver, config, opened)
+
+    # ── Pre-warming ──────────────────────────────────────────
+    def prewarm(self, configs):
+        """Open sessions for upcoming configs in the background (bounded by lookahead)."""
+        if self._warmers is None:
+            return
+        for config in configs:
+            with self._lock:
+                if self._idle.get(pool_key(config)) or pool_key(config) in self._warming:
+                    continue
+                if len(self._warming) >= self.lookahead:
+                    return
+                if self.slots is not None and not self.slots.try_acquire(config):
+                    return   # only ever use free slots: never evict, never queue
+                self._warming[pool_key(config)] = self._warmers.submit(self._warm, config)
+
+    def _warm(self, config: dict):
+        try:
+            session = self._start(config)
+        except Exception:
+            session = None    # acquire() will simply open one itself
+        with self._lock:
+            self._warming.pop(pool_key(config), None)
+            if session is not None:
+                self._idle.setdefault(pool_key(config), []).append(session)
+                self.stats["prewarmed"] += 1
+
+    # ── Slot accounting ──────────────────────────────────────
+    def _claim_slot(self, config: dict):
+        """Free a slot by retiring LRU idle sessions, or wait for one."""
+        if self.slots is None:
+            return
+        while not self.slots.try_acquire(config):
+            with self._lock:
+                idle = [s for sessions in self._idle.values() for s in sessions]
+                victim = min(idle, key=lambda s: s.last_used) if idle else None
+                if victim is not None:
+                    self._idle[pool_key(victim.config)].remove(victim)
+            if victim is None:
+                with TIMELINE.timed("slot wait", "queue", config["id"]):
+                    self.slots.acquire(config)
+                return
+            self._retire(victim)
+
+    def _release_slot(self, config: dict):
+        if self.slots is not None:
+            self.slots.release(config)
+
+    @staticmethod
+    def reset(driver):
+        """Wipe cookies and web storage, then go back to the login page."""
+        driver.delete_all_cookies()
+        driver.execute_script(RESET_STORAGE_SCRIPT)
+        driver.get(TARGET_URL)
+
+    # ── Returning ────────────────────────────────────────────
+    def release(self, session: PooledSession, nodeid: str, passed: bool, reason: str = "",
+                keep: bool = True):
+        """
+        Record the test outcome on the remote session and either keep the
+        session warm or recycle it. Failed tests always recycle the session
+        so a broken page/browser state never leaks into the next test;
+        keep=False (no more tests for this config) frees its slot at once.
+        """
+        session.last_used = time.monotonic()
+        self.teardown.annotate(
+            session.driver,
+            f"{'PASSED' if passed else 'FAILED'}: {nodeid}" + (f" — {reason}" if reason else ""),
+            level="info" if passed else "error",
+        )
+
+        if not passed:
+            session.failed.append(nodeid)
+
+        if not passed or not keep or session.uses >= self.max_uses:
+            self._retire(session)
+            return
+
+        with self._lock:
+            idle = self._idle.setdefault(pool_key(session.config), [])
+            if len(idle) < self.size:
+                idle.append(session)
+                return
+        self._retire(session)
+
+    def _retire(self, session: PooledSession):
+        """Queue the aggregate BrowserStack status and the quit; free the slot afterwards."""
+        with self._lock:
+            self.stats["retired"] += 1
+            if not session.uses:
+                self.stats["prewarm_unused"] += 1
+        if session.failed:
+            status = "failed"
+            reason = f"{len(session.failed)}/{session.uses} tests failed: " + ", ".join(session.failed)
+        else:
+            status = "passed"
+            reason = f"{session.uses} tests passed"
+        session_id = session.session_id
+
+        def done():
+            self._release_slot(session.config)
+            TIMELINE.span("session", "session", session.config["id"], session.opened, time.time(),
+                          session=session_id, uses=session.uses, status=status)
+        self.teardown.finish_session(session.driver, status, reason, on_done=done)
+
+    def close(self):
+        """Queue the quit of every idle session (drained by TeardownQueue.flush)."""
+        if self._warmers is not None:
+            self._warmers.shutdown(wait=True)
+        with self._lock:
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for session in sessions:
+            self._retire(session)
+
+
+def pool_key(config: dict) -> str:
+    """Sessions are only shared between tests wanting the same capabilities."""
+    return f"{config['id']}@{config['capture']}" if config.get("capture") else config["id"]
+
+
+def scheduled_items(item) -> list:
+    """
+    The items this process runs from `item` on, as far as it knows: the
+    whole collection in a serial run. Under xdist a worker only knows
+    `item` and the next item the controller has sent it (conftest_bs.py
+    records it as `bs_nextitem`), never the items of other workers.
+    """
+    if not hasattr(item.config, "workerinput"):
+        return item.session.items
+    nextitem = getattr(item, "bs_nextitem", None)
+    return [item] if nextitem is None else [item, nextitem]
+
+
+_positions = (None, None, {}, {})   # (items, config_for, {id(item): index}, {pool key: last index})
+
+
+def _run_order(items, config_for):
+    global _positions
+    if _positions[0] is not items or _positions[1] is not config_for:
+        index, last = {}, {}
+        for i, item in enumerate(items):
+            index[id(item)] = i
+            cfg = config_for(item)
+            if cfg is not None:
+                last[pool_key(cfg)] = i
+        _positions = (items, config_for, index, last)
+    return _positions[2], _positions[3]
+
+
+def _item_config(item):
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("browser") if callspec else None
+
+
+def needed_later(items, current, config_for=_item_config) -> bool:
+    """Whether another item after `current` runs on a session of the same pool key."""
+    index, last = _run_order(items, config_for)
+    cfg = config_for(current)
+    return cfg is not None and last.get(pool_key(cfg), -1) > index.get(id(current), -1)
+
+
+def upcoming_configs(items, current, depth: int, config_for=_item_config) -> list:
+    """
+    The next `depth` distinct configs (by pool key) after `current` in run
+    order, skipping the current item's own (its session is already live).
+    `config_for(item)` gives the config an item's session is opened with.
+    """
+    position = _run_order(items, config_for)[0].get(id(current))
+    if position is None or not depth:
+        return []
+    current_cfg = config_for(current)
+    seen, configs = {pool_key(current_cfg) if current_cfg else None}, []
+    for item in items[position + 1:]:
+        cfg = config_for(item)
+        if cfg is None or pool_key(cfg) in seen:
+            continue
+        seen.add(pool_key(cfg))
+        configs.append(cfg)
+        if len(configs) >= depth:
+            break
+    return configs
@@ -0,0 +1,70 @@
+"""
+============================================================
+  sharding.py
+  Duration-balanced `--shard i/N` partitioning of the matrix
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Every CI machine collects the full matrix and keeps only its own
+shard, so the partition must be a pure function of what all
+machines share: the collected node ids, N, and the results
+history (durations.py; share reports/results.db between jobs to
+balance on real durations, otherwise the defaults are used).
+The stream header records the history's fingerprint, and
+merge_shards.py refuses shards that partitioned on different ones.
+
+Units are config groups (a shard then reuses one warm session per
+config). A group estimated above the ideal per-shard load is split
+into single tests. Units are placed longest first on the least
+loaded shard, ties broken by shard number and unit name, so the
+result is identical on every machine and across reruns.
+
+Each shard also gets its share of the account's parallel slots.
+"""
+
+import heapq
+
+from durations import DurationModel, split_nodeid
+
+
+def parse_shard(text: str) -> tuple:
+    """'2/4' → (2, 4); raises ValueError unless 1 <= i <= N."""
+    try:
+        index, total = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"--shard expects i/N (e.g. 2/4), got {text!r}") from None
+    if not 1 <= index <= total:
+        raise ValueError(f"--shard index must be between 1 and {total}, got {index}")
+    return index, total
+
+
+def shard_slots(total_slots: int, index: int, total: int) -> int:
+    """Split the parallel allowance across shards; the remainder goes to the first shards."""
+    share, extra = divmod(total_slots, total)
+    return max(1, share + (1 if index <= extra else 0))
+
+
+def partition(nodeids, total: int, model: DurationModel) -> dict:
+    """{nodeid: shard number (1-based)} balancing estimated durations."""
+    groups = {}
+    for nodeid in nodeids:
+        groups.setdefault(split_nodeid(nodeid)[1], []).append(nodeid)
+    estimates = {nodeid: model.estimate(nodeid) for members in groups.values() for nodeid in members}
+    ideal     = sum(estimates.values()) / total
+
+    units = []   # (seconds, name, [nodeids])
+    for config, members in groups.items():
+        seconds = sum(estimates[n] for n in members)
+        if seconds > ideal and len(members) > 1:
+            units.extend((estimates[n], n, [n]) for n in members)
+        else:
+            units.append((seconds, config, members))
+
+    loads  = [(0.0, shard) for shard in range(1, total + 1)]
+    shards = {}
+    for seconds, _, members in sorted(units, key=lambda unit: (-unit[0], unit[1])):
+        load, shard = heapq.heappop(loads)
+        for nodeid in members:
+            shards[nodeid] = shard
+        heapq.heappush(loads, (load + seconds, shard))
+    return shards
@@ -0,0 +1,166 @@
+"""
+============================================================
+  skip_cache.py
+  Content-fingerprint skip cache for unchanged (test, config) pairs
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+A (test, config) pair is fingerprinted from four inputs:
+
+  page    the served login page HTML plus every script and
+          stylesheet it links (fetched once per process)
+  suite   the source of every local module the test module or
+          conftest_bs imports, directly or through another local
+          module (browserstack_config, teardown, local_grid, ...),
+          and the data files tests read: DATA_FILES plus every
+          file under VISUAL_BASELINES (once per test module)
+  test    the test function's source
+  caps    build_capabilities(config), minus the buildName
+
+A change to a helper module or data file invalidates every
+cached pass of the test modules using it.
+
+When the same fingerprint passed within SKIP_CACHE_TTL hours, the
+pair is skipped as a cached pass; its browser session is never
+opened. A failure evicts the test's entries. If the page cannot
+be fetched, nothing is skipped.
+
+`browserVersion: latest` is hashed as the label, not the version
+it resolves to; the TTL bounds how long a browser update can go
+unnoticed.
+
+Passes are kept in SQLite (SKIP_CACHE_DB, WAL mode so xdist
+workers can write concurrently). `--no-cache` runs everything
+but still records the passes.
+"""
+
+import re
+import ast
+import time
+import json
+import inspect
+import sqlite3
+import hashlib
+from pathlib import Path
+from functools import lru_cache
+from urllib.parse import urljoin
+
+import urllib3
+
+from browserstack_config import TARGET_URL, build_capabilities, PERF_BASELINE, CORPUS_FILE, VISUAL_BASELINES
+
+DATA_FILES    = (CORPUS_FILE, PERF_BASELINE)
+HARNESS_ROOTS = ("conftest_bs.py",)       # plugins loaded from pytest.ini, beside the test modules
+
+ASSET_PATTERN = re.compile(
+    r"""<script[^>]+src=["']([^"']+)["']|<link[^>]+rel=["']stylesheet["'][^>]+href=["']([^"']+)["']""",
+    re.IGNORECASE,
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS passes (
+    nodeid      TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    passed      REAL NOT NULL,
+    PRIMARY KEY (nodeid, fingerprint)
+) WITHOUT ROWID;
+"""
+
+
+def page_fingerprint(url: str = TARGET_URL, timeout: float = 10.0):
+    """sha256 of the page HTML and its linked JS/CSS, or None if any of it can't be fetched."""
+    http   = urllib3.PoolManager(timeout=timeout, retries=urllib3.Retry(total=2, backoff_factor=0.2))
+    digest = hashlib.sha256()
+    try:
+        page = http.request("GET", url)
+        if page.status >= 400:
+            return None
+        digest.update(page.data)
+        html = page.data.decode("utf-8", "replace")
+        for script, stylesheet in ASSET_PATTERN.findall(html):
+            asset = http.request("GET", urljoin(url, script or stylesheet))
+            if asset.status >= 400:
+                return None
+            digest.update(asset.data)
+    except urllib3.exceptions.HTTPError:
+        return None
+    finally:
+        http.clear()
+    return digest.hexdigest()
+
+
+def local_imports(path: Path) -> set:
+    """Local *.py files `path` imports anywhere in its body (function-level imports included)."""
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            names.add(node.module.split(".")[0])
+    return {path.parent / f"{name}.py" for name in names if (path.parent / f"{name}.py").is_file()}
+
+
+def harness_modules(module_path: Path) -> list:
+    """Every local module reachable by import from the test module and HARNESS_ROOTS (the test module excluded)."""
+    here    = module_path.parent
+    pending = [module_path] + [here / name for name in HARNESS_ROOTS if (here / name).is_file()]
+    found   = set(pending)
+    while pending:
+        for path in local_imports(pending.pop()) - found:
+            found.add(path)
+            pending.append(path)
+    return sorted(found - {module_path})
+
+
+@lru_cache(maxsize=None)
+def suite_fingerprint(module) -> str:
+    """sha256 of the harness modules behind `module` and of the data files tests read."""
+    files   = harness_modules(Path(module.__file__).resolve())
+    files  += [Path(name) for name in DATA_FILES if name]
+    files  += sorted(p for p in Path(VISUAL_BASELINES).rglob("*") if p.is_file())
+    digest  = hashlib.sha256()
+    for path in files:
+        digest.update(str(path.name).encode())
+        digest.update(path.read_bytes() if path.is_file() else b"<missing>")
+    return digest.hexdigest()
+
+
+def pair_fingerprint(item, config: dict, page: str) -> str:
+    """Fingerprint of one (test, config) pair given the page fingerprint."""
+    caps = build_capabilities(config)
+    caps["bstack:options"].pop("buildName", None)
+    digest = hashlib.sha256(page.encode())
+    digest.update(suite_fingerprint(item.module).encode())
+    digest.update(inspect.getsource(item.function).encode())
+    digest.update(json.dumps(caps, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+class SkipCache:
+    """Passing fingerprints per node id, with a TTL."""
+
+    def __init__(self, path: str, ttl_hours: float):
+        self.ttl = ttl_hours * 3600
+        self.db  = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def hit(self, nodeid: str, fingerprint: str) -> bool:
+        row = self.db.execute(
+            "SELECT 1 FROM passes WHERE nodeid = ? AND fingerprint = ? AND passed >= ?",
+            (nodeid, fingerprint, time.time() - self.ttl),
+        ).fetchone()
+        return row is not None
+
+    def record(self, nodeid: str, fingerprint: str, passed: bool):
+        if passed:
+            self.db.execute("INSERT OR REPLACE INTO passes VALUES (?, ?, ?)", (nodeid, fingerprint, time.time()))
+        else:
+            self.db.execute("DELETE FROM passes WHERE nodeid = ?", (nodeid,))
+
+    def prune(self):
+        """Drop entries past the TTL."""
+        self.db.execute("DELETE FROM passes WHERE passed < ?", (time.time() - self.ttl,))
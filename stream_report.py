@@ -0,0 +1,229 @@
+"""
+============================================================
+  stream_report.py
+  Browser × test grid rendered from the JSONL result stream
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+Reads result_stream.py's JSONL (complete or still growing) and
+writes one self-contained HTML page:
+
+  • summary counts and per-config pass rates
+  • one section per test class, rendered only when scrolled
+    into view, PAGE_SIZE rows at a time ("show more")
+  • click a red cell for the failure text
+
+Results are shipped to the page as a compact JSON payload (one
+character per cell), so 10k+ results stay a few hundred KB and
+render in well under a second. While the run has no `end`
+record the page refreshes itself every REFRESH_SECONDS.
+
+Usage:
+    python stream_report.py reports/results.jsonl -o reports/stream_report.html
+    python stream_report.py reports/results.jsonl --watch 5   # re-render until the run ends
+"""
+
+import os
+import json
+import time
+import argparse
+
+from result_stream import read_stream
+
+PAGE_SIZE       = 50
+REFRESH_SECONDS = 10
+
+OUTCOME_CODES = {"passed": "P", "failed": "F", "error": "E", "skipped": "S"}
+
+
+def fold(records) -> dict:
+    """Collapse the stream into run metadata + the final outcome of every (test, config)."""
+    run, end, configs, cells = {}, None, [], {}
+    for record in records:
+        kind = record.get("type")
+        if kind == "run":
+            run, end, cells = record, None, {}     # a new run restarts the grid
+            configs = list(record.get("configs", []))
+        elif kind == "end":
+            end = record
+        elif kind == "result":
+            key  = (record["cls"], record["test"], record["config"])
+            cell = cells.setdefault(key, {"outcome": "passed", "duration": 0.0, "detail": ""})
+            cell["duration"] += record["duration"]
+            if record["outcome"] == "failed":
+                cell["outcome"] = "failed" if record["when"] == "call" else "error"
+                cell["detail"]  = record["detail"]
+            elif record["outcome"] == "skipped" and cell["outcome"] == "passed":
+                cell["outcome"] = "skipped"
+                cell["detail"]  = record["detail"]
+            if record["config"] not in configs:
+                configs.append(record["config"])
+    return {"run": run, "end": end, "configs": configs, "cells": cells}
+
+
+def build_payload(folded: dict) -> dict:
+    """Compact page data: per row one character per config, details only for non-passes."""
+    col      = {cfg: i for i, cfg in enumerate(folded["configs"])}
+    sections = {}
+    details  = {}
+    passed   = [0] * len(col)
+    ran      = [0] * len(col)
+    for (cls, test, cfg), cell in folded["cells"].items():
+        name = cls or "(module)"
+        rows = sections.setdefault(name, {})
+        if test not in rows:
+            rows[test] = ["-"] * len(col)
+        rows[test][col[cfg]] = OUTCOME_CODES[cell["outcome"]]
+        if cell["detail"]:
+            details[f"{name}::{test}::{cfg}"] = cell["detail"]
+        if cell["outcome"] != "skipped":
+            ran[col[cfg]]    += 1
+            passed[col[cfg]] += cell["outcome"] == "passed"
+    return {
+        "configs" : folded["configs"],
+        "rates"   : [round(100 * p / r) if r else None for p, r in zip(passed, ran)],
+        "sections": [{"name": name, "rows": [[test, "".join(codes)] for test, codes in rows.items()]}
+                     for name, rows in sections.items()],
+        "details" : details,
+        "pageSize": PAGE_SIZE,
+    }
+
+
+def render(stream_path: str, out_path: str) -> dict:
+    """Render the HTML page atomically; returns the folded stream."""
+    folded  = fold(read_stream(stream_path))
+    payload = build_payload(folded)
+    counts  = {name: 0 for name in OUTCOME_CODES}
+    for cell in folded["cells"].values():
+        counts[cell["outcome"]] += 1
+    finished = folded["end"] is not None
+    status   = "finished" if finished else "in progress"
+    refresh  = "" if finished else f'<meta http-equiv="refresh" content="{REFRESH_SECONDS}">'
+    started  = folded["run"].get("started")
+    page = PAGE_TEMPLATE.format(
+        refresh = refresh,
+        status  = status,
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)) if started else "—",
+        total   = len(folded["cells"]),
+        passed  = counts["passed"],
+        failed  = counts["failed"] + counts["error"],
+        skipped = counts["skipped"],
+        data    = json.dumps(payload, separators=(",", ":")).replace("</", "<\\/"),
+    )
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(page)
+    os.replace(tmp_path, out_path)      # viewers never see a half-written page
+    return folded
+
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+{refresh}
+<title>Cross-Browser Results ({status}) · Prodigy Infotech Task-04</title>
+<style>
+:root {{ --bg:#05080f; --card:#0f1929; --border:#1c2d47; --text:#e2eeff; --muted:#5e7a99;
+        --pass:#22d3a0; --fail:#f04f5a; --warn:#f5a623; --info:#4da6f5; }}
+body {{ font-family: system-ui, sans-serif; background: var(--bg); color: var(--text); margin: 0; padding: 24px; }}
+h1 {{ font-size: 20px; margin: 0 0 4px; }}
+.meta {{ color: var(--muted); font-size: 13px; margin-bottom: 16px; }}
+.pills span {{ display: inline-block; padding: 4px 10px; margin-right: 8px; border-radius: 12px; background: var(--card); font-size: 13px; }}
+section {{ background: var(--card); border: 1px solid var(--border); border-radius: 8px; margin: 16px 0; min-height: 40px; }}
+section h2 {{ font-size: 14px; margin: 0; padding: 10px 14px; border-bottom: 1px solid var(--border); }}
+table {{ border-collapse: collapse; font-size: 12px; width: 100%; }}
+th, td {{ padding: 3px 6px; text-align: center; white-space: nowrap; }}
+th {{ color: var(--muted); font-weight: 500; }}
+th.v {{ writing-mode: vertical-rl; transform: rotate(180deg); height: 110px; vertical-align: bottom; }}
+td.t {{ text-align: left; font-family: monospace; }}
+td.c {{ width: 18px; }}
+td.c i {{ display: inline-block; width: 14px; height: 14px; border-radius: 3px; background: var(--border); }}
+td.P i {{ background: var(--pass); }} td.F i, td.E i {{ background: var(--fail); cursor: pointer; }}
+td.S i {{ background: var(--warn); }}
+button {{ margin: 8px 14px; background: none; color: var(--info); border: 1px solid var(--border); border-radius: 6px; padding: 4px 10px; cursor: pointer; }}
+#detail {{ position: fixed; right: 16px; bottom: 16px; width: 50%; max-height: 40%; overflow: auto; background: #000;
+          border: 1px solid var(--fail); border-radius: 8px; padding: 12px; font-size: 12px; white-space: pre-wrap; display: none; }}
+</style>
+</head>
+<body>
+<h1>Cross-Browser Login Suite — live results</h1>
+<div class="meta">Run {status} · started {started} · {total} results</div>
+<div class="pills"><span>✅ {passed} passed</span><span>❌ {failed} failed</span><span>⏭ {skipped} skipped</span></div>
+<div id="sections"></div>
+<pre id="detail" title="click to close"></pre>
+<script id="data" type="application/json">{data}</script>
+<script>
+(function () {{
+  var data = JSON.parse(document.getElementById("data").textContent);
+  var root = document.getElementById("sections"), detail = document.getElementById("detail");
+  var header = "<tr><th></th>" + data.configs.map(function (c) {{ return "<th class='v'>" + c + "</th>"; }}).join("") + "</tr>"
+             + "<tr><th>pass rate</th>" + data.rates.map(function (r) {{ return "<th>" + (r === null ? "—" : r + "%") + "</th>"; }}).join("") + "</tr>";
+
+  function rowHtml(section, row) {{
+    var cells = "";
+    for (var i = 0; i < row[1].length; i++) {{
+      var code = row[1][i];
+      cells += "<td class='c " + code + "' data-k='" + section + "::" + row[0] + "::" + data.configs[i] + "' title='" + data.configs[i] + "'><i></i></td>";
+    }}
+    return "<tr><td class='t'>" + row[0] + "</td>" + cells + "</tr>";
+  }}
+
+  function showPage(el, section) {{
+    var shown = +el.dataset.shown, rows = section.rows.slice(shown, shown + data.pageSize);
+    el.querySelector("tbody").insertAdjacentHTML("beforeend", rows.map(function (r) {{ return rowHtml(section.name, r); }}).join(""));
+    el.dataset.shown = shown + rows.length;
+    var more = el.querySelector("button"), left = section.rows.length - shown - rows.length;
+    more.style.display = left > 0 ? "" : "none";
+    more.textContent = "show " + Math.min(left, data.pageSize) + " more (" + left + " left)";
+  }}
+
+  var observer = "IntersectionObserver" in window ? new IntersectionObserver(function (entries) {{
+    entries.forEach(function (entry) {{
+      if (entry.isIntersecting) {{ observer.unobserve(entry.target); entry.target.render(); }}
+    }});
+  }}, {{rootMargin: "400px"}}) : null;
+
+  data.sections.forEach(function (section) {{
+    var fails = section.rows.reduce(function (n, r) {{ return n + (r[1].match(/[FE]/g) || []).length; }}, 0);
+    var el = document.createElement("section");
+    el.innerHTML = "<h2>" + section.name + " · " + section.rows.length + " tests" + (fails ? " · " + fails + " failed" : "") + "</h2>";
+    el.dataset.shown = 0;
+    el.render = function () {{
+      el.insertAdjacentHTML("beforeend", "<table><thead>" + header + "</thead><tbody></tbody></table><button></button>");
+      el.querySelector("button").onclick = function () {{ showPage(el, section); }};
+      showPage(el, section);
+    }};
+    root.appendChild(el);
+    if (observer) {{ observer.observe(el); }} else {{ el.render(); }}
+  }});
+
+  root.addEventListener("click", function (event) {{
+    var td = event.target.closest("td.F, td.E, td.S");
+    if (!td) {{ return; }}
+    detail.textContent = td.dataset.k + "\\n\\n" + (data.details[td.dataset.k] || "(no details)");
+    detail.style.display = "block";
+  }});
+  detail.onclick = function () {{ detail.style.display = "none"; }};
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the browser × test grid from a JSONL result stream.")
+    parser.add_argument("stream", nargs="?", default="reports/results.jsonl")
+    parser.add_argument("-o", "--output", default="reports/stream_report.html")
+    parser.add_argument("--watch", type=float, default=0,
+                        help="re-render every N seconds until the run's end record appears")
+    args = parser.parse_args()
+    while True:
+        started = time.perf_counter()
+        folded  = render(args.stream, args.output)
+        print(f"{len(folded['cells'])} results → {args.output} in {time.perf_counter() - started:.2f}s")
+        if not args.watch or folded["end"] is not None:
+            break
+        time.sleep(args.watch)
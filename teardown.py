@@ -0,0 +1,164 @@
+"""
+============================================================
+  teardown.py
+  Background teardown & batched session-status reporting
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+`setSessionStatus` and `driver.quit()` are two slow remote calls
+that the next test used to wait behind. TeardownQueue drains them
+on a small thread pool instead. Per-test annotations are sent
+inline, on the test's own thread: they are small, and running them
+in the background let them race the next test's commands on the
+same session, arrive out of order, or land after the quit.
+
+
+  BS_STATUS_MODE=executor  (default) status is set through the
+      `browserstack_executor` channel on the session, then it quits
+  BS_STATUS_MODE=rest      sessions just quit; their statuses are
+      sent at the end of the run as REST calls
+      (PUT /automate/sessions/<id>.json) over one pooled,
+      keep-alive HTTP client
+  BS_STATUS_MODE=defer     like rest, but the statuses are
+      appended to BS_STATUS_FILE instead of being sent;
+      merge_shards.py sends every shard's file in one batch
+
+flush() waits for everything queued and sends the REST batch; it is
+called from `pytest_sessionfinish`, so nothing is lost when the run
+ends. All payloads are JSON-encoded (quotes/newlines in reasons are
+safe).
+"""
+
+import os
+import json
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import urllib3
+
+from browserstack_config import (
+    bs_executor, BS_API_URL, BS_USERNAME, BS_ACCESS_KEY, STATUS_MODE, STATUS_FILE, TEARDOWN_WORKERS,
+)
+
+
+class TeardownQueue:
+    """Thread-pool completion queue for session statuses and quits (annotations go inline)."""
+
+    def __init__(self, workers=TEARDOWN_WORKERS, mode=STATUS_MODE, api_url=BS_API_URL,
+                 username=BS_USERNAME, access_key=BS_ACCESS_KEY, status_file=STATUS_FILE):
+        self.mode      = mode
+        self.batched   = mode in ("rest", "defer")    # statuses collected, not set per session
+        self.status_file = status_file
+        self.api_url   = api_url.rstrip("/")
+        self.workers   = workers
+        self._auth     = urllib3.make_headers(basic_auth=f"{username}:{access_key}")
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="teardown")
+        self._http     = None
+        self._lock     = threading.Lock()
+        self._pending  = []
+        self._statuses = {}       # session id → {"status": ..., "reason": ...}
+        self.errors    = []       # (what, exception) — reported, never raised mid-run
+
+    # ── Queueing ─────────────────────────────────────────────
+    def submit(self, what: str, fn, *args):
+        def guarded():
+            try:
+                fn(*args)
+            except Exception as exc:
+                with self._lock:
+                    self.errors.append((what, exc))
+        future = self._executor.submit(guarded)
+        with self._lock:
+            self._pending.append(future)
+        return future
+
+    def annotate(self, driver, data: str, level: str = "info"):
+        """Per-test annotation, sent now; in batched modes results are summarised in the session reason instead."""
+        if self.batched:
+            return
+        try:
+            bs_executor(driver, "annotate", data=data, level=level)
+        except Exception as exc:
+            with self._lock:
+                self.errors.append(("annotate", exc))
+
+    def finish_session(self, driver, status: str, reason: str, on_done=None):
+        """Set the session status and quit it in the background; `on_done` runs after the quit."""
+        reason = reason[:255]
+        if self.batched:
+            with self._lock:
+                self._statuses[driver.session_id] = {"status": status, "reason": reason}
+
+        def finish():
+            try:
+                if not self.batched:
+                    try:
+                        bs_executor(driver, "setSessionStatus", status=status, reason=reason)
+                    finally:
+                        driver.quit()
+                else:
+                    driver.quit()
+            finally:
+                if on_done is not None:
+                    on_done()
+        self.submit(f"finish {driver.session_id}", finish)
+
+    # ── Draining ─────────────────────────────────────────────
+    def flush(self, timeout=None):
+        """Wait for queued work, then send (or, in defer mode, export) batched statuses. Safe to call repeatedly."""
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if not pending:
+                break
+            wait(pending, timeout=timeout)
+
+        with self._lock:
+            statuses, self._statuses = self._statuses, {}
+        if statuses and self.mode == "defer":
+            self.export_statuses(statuses)
+        elif statuses:
+            self.send_statuses(statuses, timeout)
+
+    def export_statuses(self, statuses: dict):
+        """Append statuses to the status file, one JSON line per session (workers share the file)."""
+        path = Path(self.status_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps({"session": sid, **body}) + "\n" for sid, body in statuses.items())
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, lines.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def send_statuses(self, statuses: dict, timeout=None):
+        """PUT {session id: {status, reason}} over the pooled REST client."""
+        if statuses:
+            if self._http is None:
+                self._http = urllib3.PoolManager(maxsize=self.workers, block=True)
+            wait([self._executor.submit(self._put_status, sid, body) for sid, body in statuses.items()],
+                 timeout=timeout)
+
+    def _put_status(self, session_id: str, body: dict):
+        try:
+            response = self._http.request(
+                "PUT", f"{self.api_url}/automate/sessions/{session_id}.json",
+                body=json.dumps(body),
+                headers={**self._auth, "Content-Type": "application/json"},
+                retries=urllib3.Retry(total=3, backoff_factor=0.5, allowed_methods=None),
+            )
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}: {response.data[:200]!r}")
+        except Exception as exc:
+            with self._lock:
+                self.errors.append((f"status {session_id}", exc))
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+        if self._http is not None:
+            self._http.clear()
+
+
+TEARDOWN = TeardownQueue()
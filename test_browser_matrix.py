@@ -0,0 +1,95 @@
+"""
+============================================================
+  test_browser_matrix.py
+  Unit tests for the browserstack.yml matrix expansion
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import pytest
+
+from browser_matrix import expand, expand_versions
+
+SPEC = {"browsers": [
+    {"browser": "chrome", "browser_version": "latest", "os": "Windows", "os_version": "11"},
+    {"browser": "safari", "browser_version": "17.0", "os": "OS X", "os_version": "Sonoma"},
+    {"device": "iPhone 15", "os_version": "17", "browser": "safari", "real_mobile": True},
+]}
+HARNESS = {
+    "overrides": {"iphone_15": {"id": "iphone15", "label": "Safari · iPhone 15"}},
+    "matrices" : [
+        {"name": "desktop", "browser": ["chrome", "edge"], "browser_version": "latest..latest-1",
+         "os": {"Windows": ["11"], "OS X": ["Ventura"]},
+         "exclude": [{"browser": "edge", "os": "OS X"}]},
+        {"name": "phones", "device": {"Samsung Galaxy S24": "14.0"}, "browser": ["safari", "chrome"],
+         "exclude": [{"device": "Samsung*", "browser": "safari"}]},
+    ],
+}
+
+
+def ids(configs) -> list:
+    return [cfg["id"] for cfg in configs]
+
+
+# ── Version ranges ───────────────────────────────────────────
+def test_latest_range_expands_in_order():
+    assert expand_versions("latest..latest-2") == ["latest", "latest-1", "latest-2"]
+
+
+def test_numeric_range_expands_newest_first():
+    assert expand_versions("118..120") == ["120.0", "119.0", "118.0"]
+    assert expand_versions(["17.0", "latest..latest-1"]) == ["17.0", "latest", "latest-1"]
+
+
+def test_mixed_range_is_rejected():
+    with pytest.raises(ValueError, match="unsupported version range"):
+        expand_versions("latest..118")
+
+
+# ── browsers: entries ────────────────────────────────────────
+def test_ids_and_labels_are_derived():
+    chrome, safari, iphone = expand(SPEC)
+    assert chrome["id"] == "chrome_win11" and chrome["label"] == "Chrome (Latest) · Windows 11"
+    assert safari["id"] == "safari_sonoma" and safari["label"] == "Safari 17 · macOS Sonoma"
+    assert iphone["id"] == "iphone_15" and iphone["real_mobile"]
+
+
+def test_harness_overrides_replace_the_derived_id_and_label():
+    iphone = list(expand(SPEC, harness=HARNESS))[-1]
+    assert iphone["id"] == "iphone15" and iphone["label"] == "Safari · iPhone 15"
+    assert iphone["device"] == "iPhone 15"
+
+
+# ── matrices: blocks ─────────────────────────────────────────
+def test_blocks_are_only_expanded_when_selected():
+    assert len(list(expand(SPEC, harness=HARNESS))) == 3
+    assert ids(expand(SPEC, sets="desktop", harness=HARNESS))[3:] == [
+        "chrome_ventura_latest", "chrome_win11_latest-1", "chrome_ventura_latest-1",
+        "edge_win11_latest", "edge_win11_latest-1",
+    ]                                                   # chrome / latest / Windows 11 is already listed
+
+
+def test_exclusions_take_fnmatch_patterns():
+    phones = ids(expand(SPEC, sets="phones", harness=HARNESS))[3:]
+    assert phones == ["samsung_galaxy_s24_14_0_chrome"]
+
+
+def test_a_combination_already_listed_is_yielded_once():
+    harness = {"matrices": [{"name": "dupe", "browser": "chrome", "browser_version": "latest",
+                             "os": {"Windows": ["11"]}}]}
+    assert len(list(expand(SPEC, sets="dupe", harness=harness))) == 3
+
+
+def test_unknown_set_names_the_defined_ones():
+    with pytest.raises(ValueError, match=r"unknown matrix set\(s\) \['nope'\]; defined: \['desktop', 'phones'\]"):
+        list(expand(SPEC, sets="nope", harness=HARNESS))
+
+
+# ── Filters ──────────────────────────────────────────────────
+def test_filters_apply_across_entries_and_blocks():
+    assert ids(expand(SPEC, sets="all", browsers="edge", harness=HARNESS)) == [
+        "edge_win11_latest", "edge_win11_latest-1"]
+    assert ids(expand(SPEC, sets="all", oses="ventura", harness=HARNESS)) == [
+        "chrome_ventura_latest", "chrome_ventura_latest-1"]
+    assert ids(expand(SPEC, sets="all", mobile_only=True, harness=HARNESS)) == [
+        "iphone15", "samsung_galaxy_s24_14_0_chrome"]
@@ -0,0 +1,86 @@
+"""
+============================================================
+  test_capture_policy.py
+  Unit tests for capture level precedence and rerun outcomes
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from _pytest.reports import TestReport
+
+import capture_policy
+from capture_policy import capture_level, capture_config, marker_levels
+from conftest_bs import keep_first_failure
+
+
+def item(*markers, capture=None, execution_count=1):
+    marks = {name: SimpleNamespace(args=()) for name in markers}
+    if capture is not None:
+        marks["capture"] = SimpleNamespace(args=(capture,))
+    return SimpleNamespace(get_closest_marker=marks.get, execution_count=execution_count)
+
+
+def report(when, outcome, longrepr=None):
+    return TestReport("t::a[x]", ("t.py", 1, "a"), {}, outcome, longrepr, when)
+
+
+# ── Levels ───────────────────────────────────────────────────
+def test_marker_spec_is_parsed_and_checked():
+    assert marker_levels("ui=video, visual=full,,smoke") == {"ui": "video", "visual": "full", "smoke": "full"}
+    with pytest.raises(ValueError):
+        marker_levels("ui=everything")
+
+
+def test_level_precedence(monkeypatch):
+    monkeypatch.setattr(capture_policy, "CAPTURE_RERUN", True)
+    markers = {"ui": "video", "visual": "full"}
+    assert capture_level(item(), "lean", markers) == "lean"                                   # CAPTURE_MODE
+    assert capture_level(item("ui"), "lean", markers) == "video"                              # mapped marker
+    assert capture_level(item("ui", "visual"), "lean", markers) == "full"                     # richest mapped
+    assert capture_level(item("ui"), "full", markers) == "full"                               # never below the mode
+    assert capture_level(item("visual", capture="lean"), "video", markers) == "lean"          # explicit marker wins
+    assert capture_level(item(capture="lean", execution_count=2), "lean", markers) == "full"  # rerun wins
+
+
+def test_reruns_keep_their_level_without_capture_rerun(monkeypatch):
+    monkeypatch.setattr(capture_policy, "CAPTURE_RERUN", False)
+    assert capture_level(item("ui", execution_count=2), "lean", {"ui": "video"}) == "video"
+
+
+def test_only_non_default_levels_tag_the_config():
+    config = {"id": "chrome"}
+    assert capture_config(config, capture_policy.CAPTURE_MODE) is config
+    other = next(level for level in capture_policy.LEVEL_ORDER if level != capture_policy.CAPTURE_MODE)
+    assert capture_config(config, other) == {"id": "chrome", "capture": other}
+
+
+# ── Rerun outcomes ───────────────────────────────────────────
+def test_a_passing_rerun_keeps_the_first_failure():
+    test = item()
+    keep_first_failure(test, report("call", "failed", "AssertionError: first attempt"))
+    test.execution_count = 2                               # pytest-rerunfailures reruns the same item
+    passed = report("call", "passed")
+    keep_first_failure(test, passed)
+    assert passed.failed and passed.longrepr == "AssertionError: first attempt"
+    assert passed.bs_kept_failure
+    assert passed.sections[-1][0] == "full-capture rerun"
+
+
+def test_setup_and_teardown_of_the_rerun_are_left_alone():
+    test = item()
+    keep_first_failure(test, report("call", "failed", "boom"))
+    test.execution_count = 2
+    for when in ("setup", "teardown"):
+        rep = report(when, "passed")
+        keep_first_failure(test, rep)
+        assert rep.passed
+
+
+def test_a_first_attempt_that_passes_is_untouched():
+    test = item()
+    rep  = report("call", "passed")
+    keep_first_failure(test, rep)
+    assert rep.passed and not hasattr(test, "bs_first_failure")
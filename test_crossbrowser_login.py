@@ -11,6 +11,8 @@ Test Categories:
   [NEG] Negative — invalid credential / empty field flows
   [UI]  UI/UX    — layout, element visibility, responsiveness
   [FORM] Form    — submission behaviour, field validation
+  [VIS]  Visual  — screenshots vs per-config baselines (BS_VISUAL_MODE=1)
+  [SEC]  Security — payload corpus batched inside one session (CORPUS_FILE)
 ============================================================
 """
 
@@ -18,11 +20,23 @@ import time
 import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
-from browserstack_config import create_driver, BROWSER_MATRIX, TARGET_URL
+from browserstack_config import (
+    BROWSER_MATRIX, TARGET_URL, AUTH_INJECTION,
+    PERF_MODE, PERF_REPEATS, PERF_BASELINE, PERF_THRESHOLD,
+    VISUAL_MODE, VISUAL_UPDATE_BASELINE, CORPUS_MODE, CORPUS_FILE,
+)
+from session_pool import SessionPool, scheduled_items, upcoming_configs, needed_later
+from dom_snapshot import take_snapshot, PageSnapshot
+from waits import wait_engine, WaitResult
+from auth_state import AuthStateCache
+from instrumentation import tag_test
+from login_perf import mark_click, collect_timing, latency_stats, PerfBaseline, INVENTORY_SELECTOR
+from visual_diff import check_capture, PIXEL_RATIO_SCRIPT
+from login_page import LoginPage, element_cache
+from capture_policy import capture_level, capture_config, session_config, is_rerun, session_url
+from payload_corpus import load_corpus, run_corpus, summarise
 
 # ─────────────────────────────────────────────────────────────
 #  CONSTANTS
@@ -38,80 +52,157 @@ TIMEOUT        = 15   # seconds
 # ─────────────────────────────────────────────────────────────
 #  PYTEST PARAMETRIZE — run every test on every browser config
 # ─────────────────────────────────────────────────────────────
+@pytest.fixture(scope="session")
+def session_pool(request):
+    """
+    Fixture: one warm-session pool for the whole run (per xdist worker).
+    Live sessions are capped by the run's slot ledger (conftest_bs.py).
+    Idle sessions are quit and marked pass/fail when the run ends.
+    """
+    pool = SessionPool(slots=request.config.bs_scheduler)
+    yield pool
+    pool.close()
+    for key, value in pool.stats.items():
+        request.config.bs_pool_stats[key] = request.config.bs_pool_stats.get(key, 0) + value
+
+
 @pytest.fixture(params=BROWSER_MATRIX, ids=lambda c: c["id"])
-def browser(request):
+def browser(request, session_pool):
     """
-    Fixture: spins up one BrowserStack remote session per config entry.
-    Marks the BrowserStack session pass/fail on teardown.
+    Fixture: borrows a warm BrowserStack session for this config entry.
+    Sessions for the next configs this process runs are pre-warmed meanwhile.
+    Each test result is annotated on the session on teardown; the session
+    is recycled after SESSION_MAX_USES tests or as soon as a test fails.
+    The test's element-cache hit counts are recorded as `element_cache`.
+
+    The session's artifact capture level comes from capture_policy.py. A
+    rerun of a failed test gets a fresh full-capture session, annotated
+    with and recorded (`capture` property) next to the failed attempt.
     """
-    config = request.param
-    driver = create_driver(config)
-    driver.get(TARGET_URL)
-    yield driver, config
+    level    = capture_level(request.node)
+    config   = capture_config(request.param, level)
+    session  = session_pool.acquire(config)
+    attempts = getattr(request.node, "bs_capture_attempts", [])
+    schedule = scheduled_items(request.node)
+    session_pool.prewarm(upcoming_configs(schedule, request.node, session_pool.lookahead, session_config))
+    if attempts:
+        session_pool.teardown.annotate(
+            session.driver, f"Full-capture rerun of {request.node.nodeid}; "
+                            f"attempt {len(attempts)} failed on {attempts[-1]['url']}", level="warn")
+    tag_test(session.driver, request.node.nodeid)
+    cache = element_cache(session.driver)
+    cache.reset_stats()
+    yield session.driver, config
+    tag_test(session.driver, "")
+    request.node.user_properties.append(("element_cache", dict(cache.stats)))
 
     # ── Report result back to BrowserStack dashboard ──────────
-    test_passed = not hasattr(request.node, "rep_call") or request.node.rep_call.passed
-    status  = "passed" if test_passed else "failed"
-    reason  = "Test passed" if test_passed else str(getattr(request.node, "rep_call", ""))
-    driver.execute_script(
-        f'browserstack_executor: {{"action":"setSessionStatus","arguments":{{"status":"{status}","reason":"{reason}"}}}}'
+    #    (a passing full-capture rerun passed on this session, even
+    #    though the test keeps its first attempt's failure)
+    reports = [getattr(request.node, f"rep_{when}", None) for when in ("setup", "call")]
+    failed  = [rep for rep in reports if rep is not None and rep.failed and not getattr(rep, "bs_kept_failure", False)]
+    reason  = failed[0].longreprtext.strip().splitlines()[-1] if failed and failed[0].longreprtext else ""
+    request.node.bs_capture_attempts = attempts + [{
+        "attempt": len(attempts) + 1, "capture": level, "outcome": "failed" if failed else "passed",
+        "session": session.session_id, "url": session_url(session.session_id),
+    }]
+    if attempts:
+        request.node.user_properties.append(("capture", {"config": config["id"],
+                                                         "attempts": request.node.bs_capture_attempts}))
+    session_pool.release(session, request.node.nodeid, passed=not failed, reason=reason,
+                         keep=needed_later(schedule, request.node, session_config) and not is_rerun(request.node))
+
+
+@pytest.fixture(scope="session")
+def auth_state():
+    """Fixture: authenticated cookie/storage state captured once per config."""
+    return AuthStateCache(TARGET_URL, DASHBOARD_PATH)
+
+
+@pytest.fixture
+def logged_in_browser(browser, auth_state):
+    """
+    Fixture: `browser`, already on /inventory.html as VALID_USER.
+    Injects the captured state when there is one; otherwise (or if the
+    site rejects it) logs in through the UI and captures the state.
+    """
+    driver, cfg = browser
+    if AUTH_INJECTION and auth_state.inject(driver, cfg):
+        return browser
+    # A rejected injection lands back on the login page, so this works either way.
+    fill_login(driver, VALID_USER, VALID_PASS)
+    submit_login(driver)
+    assert wait_for_dashboard(driver), (
+        f"[{cfg['label']}] Login failed while preparing a post-login test. URL: {driver.current_url}"
     )
-    driver.quit()
-
-
-@pytest.hookimpl(tryfirst=True, hookwrapper=True)
-def pytest_runtest_makereport(item, call):
-    outcome = yield
-    rep = outcome.get_result()
-    setattr(item, f"rep_{rep.when}", rep)
+    if AUTH_INJECTION:
+        auth_state.capture(driver, cfg)
+    return browser
 
 
 # ─────────────────────────────────────────────────────────────
 #  SHARED HELPERS
 # ─────────────────────────────────────────────────────────────
 def fill_login(driver, username: str, password: str):
-    """Clear and populate both login fields."""
-    u = driver.find_element(By.ID, "user-name")
-    p = driver.find_element(By.ID, "password")
-    u.clear(); u.send_keys(username)
-    p.clear(); p.send_keys(password)
+    """Clear and populate both login fields (elements come from the page's cache)."""
+    LoginPage(driver).fill(username, password)
 
 
 def submit_login(driver):
-    driver.find_element(By.ID, "login-button").click()
+    LoginPage(driver).submit()
 
 
-def get_error(driver) -> str:
-    try:
-        el = driver.find_element(By.CSS_SELECTOR, "[data-test='error']")
-        return el.text.strip()
-    except NoSuchElementException:
-        return ""
+def error_text(driver) -> str:
+    """Current error banner text, without waiting ('' if none)."""
+    return LoginPage(driver).error_text()
 
 
 def on_dashboard(driver) -> bool:
     return DASHBOARD_PATH in driver.current_url
 
 
+def login_outcome(driver, timeout=TIMEOUT) -> WaitResult:
+    """After a submit: 'dashboard' or 'error', whichever shows up first."""
+    return wait_engine(driver).until_any(
+        driver, {"dashboard": on_dashboard, "error": error_text}, timeout
+    )
+
+
+def get_error(driver, timeout=TIMEOUT) -> str:
+    result = login_outcome(driver, timeout)
+    return result.value if result.outcome == "error" else ""
+
+
 def wait_for_dashboard(driver, timeout=TIMEOUT) -> bool:
-    try:
-        WebDriverWait(driver, timeout).until(EC.url_contains("inventory"))
-        return True
-    except TimeoutException:
-        return False
+    return login_outcome(driver, timeout).outcome == "dashboard"
+
 
+def element_visible(driver, by, locator, timeout=0) -> bool:
+    def visible(d):
+        return LoginPage(d).visible(by, locator)
+    if not timeout:
+        return visible(driver)
+    return bool(wait_engine(driver).until_any(driver, {f"{locator} visible": visible}, timeout))
 
-def element_visible(driver, by, locator) -> bool:
-    try:
-        return driver.find_element(by, locator).is_displayed()
-    except NoSuchElementException:
-        return False
+
+def snapshot(driver, **locators) -> PageSnapshot:
+    """Visibility, attributes, styles, focus and viewport for all locators in one round trip."""
+    return take_snapshot(driver, locators)
+
+
+LOGIN_FORM = {
+    "username": LoginPage.USERNAME,
+    "password": LoginPage.PASSWORD,
+    "button"  : LoginPage.BUTTON,
+    "logo"    : (By.CLASS_NAME, "login_logo"),
+}
 
 
 # ─────────────────────────────────────────────────────────────
 #  POSITIVE TEST CASES
 # ─────────────────────────────────────────────────────────────
 
+@pytest.mark.positive
 class TestPositiveCrossBrowser:
 
     def test_valid_login_redirects_to_dashboard(self, browser):
@@ -126,28 +217,22 @@ class TestPositiveCrossBrowser:
             f"[{cfg['label']}] Expected redirect to dashboard. URL: {driver.current_url}"
         )
 
-    def test_inventory_list_visible_after_login(self, browser):
+    def test_inventory_list_visible_after_login(self, logged_in_browser):
         """
         [POS-02] After login the products grid should be visible.
         Validates that the DOM renders the inventory correctly across all browsers.
         """
-        driver, cfg = browser
-        fill_login(driver, VALID_USER, VALID_PASS)
-        submit_login(driver)
-        wait_for_dashboard(driver)
-        assert element_visible(driver, By.CLASS_NAME, "inventory_list"), (
+        driver, cfg = logged_in_browser
+        assert element_visible(driver, By.CLASS_NAME, "inventory_list", timeout=TIMEOUT), (
             f"[{cfg['label']}] Inventory list not displayed after login."
         )
 
-    def test_page_title_post_login(self, browser):
+    def test_page_title_post_login(self, logged_in_browser):
         """
         [POS-03] Browser tab title should read 'Swag Labs' after login.
         Catches browsers that might strip or mangle the <title> tag.
         """
-        driver, cfg = browser
-        fill_login(driver, VALID_USER, VALID_PASS)
-        submit_login(driver)
-        wait_for_dashboard(driver)
+        driver, cfg = logged_in_browser
         assert "Swag Labs" in driver.title, (
             f"[{cfg['label']}] Unexpected title: '{driver.title}'"
         )
@@ -159,7 +244,7 @@ class TestPositiveCrossBrowser:
         """
         driver, cfg = browser
         fill_login(driver, VALID_USER, VALID_PASS)
-        driver.find_element(By.ID, "password").send_keys(Keys.RETURN)
+        LoginPage(driver).press(LoginPage.PASSWORD, Keys.RETURN)
         assert wait_for_dashboard(driver), (
             f"[{cfg['label']}] Enter key did not submit the login form."
         )
@@ -167,32 +252,34 @@ class TestPositiveCrossBrowser:
     def test_no_error_on_valid_login(self, browser):
         """
         [POS-05] No error element should appear on a successful login.
+        Always goes through the login form: injected auth would skip the
+        very submit this test is about.
         """
         driver, cfg = browser
         fill_login(driver, VALID_USER, VALID_PASS)
         submit_login(driver)
-        wait_for_dashboard(driver)
-        err = get_error(driver)
+        result = login_outcome(driver)
+        assert result.outcome == "dashboard", (
+            f"[{cfg['label']}] Valid login did not reach the dashboard: {result.outcome} {result.value!r}"
+        )
+        err = error_text(driver)
         assert err == "", f"[{cfg['label']}] Unexpected error: '{err}'"
 
-    def test_logout_and_return_to_login(self, browser):
+    def test_logout_and_return_to_login(self, logged_in_browser):
         """
         [POS-06] User can log in, open the menu, log out, and is returned
         to the login page. Validates navigation across all browsers.
         """
-        driver, cfg = browser
-        fill_login(driver, VALID_USER, VALID_PASS)
-        submit_login(driver)
-        wait_for_dashboard(driver)
+        driver, cfg = logged_in_browser
 
         # Open hamburger menu → click Logout
         driver.find_element(By.ID, "react-burger-menu-btn").click()
         time.sleep(0.8)   # menu animation
-        WebDriverWait(driver, TIMEOUT).until(
-            EC.element_to_be_clickable((By.ID, "logout_sidebar_link"))
-        ).click()
+        waits = wait_engine(driver)
+        waits.until(driver, "logout link clickable",
+                    EC.element_to_be_clickable((By.ID, "logout_sidebar_link")), TIMEOUT).click()
 
-        WebDriverWait(driver, TIMEOUT).until(EC.url_to_be(TARGET_URL + "/"))
+        waits.until(driver, "login page URL", EC.url_to_be(TARGET_URL + "/"), TIMEOUT)
         assert driver.current_url.rstrip("/") == TARGET_URL, (
             f"[{cfg['label']}] Logout did not return to login page."
         )
@@ -202,6 +289,7 @@ class TestPositiveCrossBrowser:
 #  NEGATIVE TEST CASES
 # ─────────────────────────────────────────────────────────────
 
+@pytest.mark.negative
 class TestNegativeCrossBrowser:
 
     def test_wrong_password_blocked(self, browser):
@@ -229,6 +317,7 @@ class TestNegativeCrossBrowser:
         assert err != "", f"[{cfg['label']}] No error shown for unknown username."
         assert not on_dashboard(driver)
 
+    @pytest.mark.engine_sensitive
     def test_empty_username_required(self, browser):
         """
         [NEG-03] Empty username field → 'Username is required' error.
@@ -254,6 +343,7 @@ class TestNegativeCrossBrowser:
             f"[{cfg['label']}] Expected password-required error. Got: '{err}'"
         )
 
+    @pytest.mark.engine_sensitive
     def test_both_fields_empty(self, browser):
         """
         [NEG-05] Both fields empty → form refuses to submit.
@@ -285,10 +375,11 @@ class TestNegativeCrossBrowser:
         driver, cfg = browser
         fill_login(driver, "' OR 1=1 --", "' OR '1'='1")
         submit_login(driver)
-        assert not on_dashboard(driver), (
+        assert login_outcome(driver).outcome == "error", (
             f"[{cfg['label']}] SQL injection should not grant dashboard access!"
         )
 
+    @pytest.mark.engine_sensitive
     def test_xss_payload_rejected(self, browser):
         """
         [NEG-08] XSS payload in username → not executed, access denied.
@@ -296,7 +387,7 @@ class TestNegativeCrossBrowser:
         driver, cfg = browser
         fill_login(driver, "<script>alert('xss')</script>", VALID_PASS)
         submit_login(driver)
-        assert not on_dashboard(driver), (
+        assert login_outcome(driver).outcome == "error", (
             f"[{cfg['label']}] XSS payload bypassed login!"
         )
 
@@ -307,7 +398,7 @@ class TestNegativeCrossBrowser:
         driver, cfg = browser
         fill_login(driver, VALID_USER, "SECRET_SAUCE")
         submit_login(driver)
-        assert not on_dashboard(driver), (
+        assert login_outcome(driver).outcome == "error", (
             f"[{cfg['label']}] Case-insensitive password accepted — security issue!"
         )
 
@@ -318,7 +409,7 @@ class TestNegativeCrossBrowser:
         driver, cfg = browser
         fill_login(driver, "     ", VALID_PASS)
         submit_login(driver)
-        assert not on_dashboard(driver), (
+        assert login_outcome(driver).outcome == "error", (
             f"[{cfg['label']}] Whitespace-only username should not authenticate."
         )
 
@@ -327,6 +418,7 @@ class TestNegativeCrossBrowser:
 #  UI / LAYOUT / RESPONSIVENESS TESTS
 # ─────────────────────────────────────────────────────────────
 
+@pytest.mark.ui
 class TestUICrossBrowser:
 
     def test_login_form_elements_present(self, browser):
@@ -335,9 +427,10 @@ class TestUICrossBrowser:
         Catches browsers that fail to render key DOM elements.
         """
         driver, cfg = browser
-        assert element_visible(driver, By.ID, "user-name"),    f"[{cfg['label']}] Username field missing."
-        assert element_visible(driver, By.ID, "password"),     f"[{cfg['label']}] Password field missing."
-        assert element_visible(driver, By.ID, "login-button"), f"[{cfg['label']}] Login button missing."
+        snap = snapshot(driver, **LOGIN_FORM)
+        assert snap["username"].visible, f"[{cfg['label']}] Username field missing."
+        assert snap["password"].visible, f"[{cfg['label']}] Password field missing."
+        assert snap["button"].visible,   f"[{cfg['label']}] Login button missing."
 
     def test_password_field_type(self, browser):
         """
@@ -345,9 +438,9 @@ class TestUICrossBrowser:
         Safari on iOS has historically shown plain text for type mismatches.
         """
         driver, cfg = browser
-        field = driver.find_element(By.ID, "password")
-        assert field.get_attribute("type") == "password", (
-            f"[{cfg['label']}] Password field type is '{field.get_attribute('type')}', expected 'password'."
+        field_type = snapshot(driver, password=LOGIN_FORM["password"])["password"].attributes.get("type")
+        assert field_type == "password", (
+            f"[{cfg['label']}] Password field type is '{field_type}', expected 'password'."
         )
 
     def test_login_button_label(self, browser):
@@ -355,8 +448,8 @@ class TestUICrossBrowser:
         [UI-03] Login button value should be 'Login'.
         """
         driver, cfg = browser
-        btn = driver.find_element(By.ID, "login-button")
-        label = (btn.get_attribute("value") or btn.text).strip().lower()
+        btn = snapshot(driver, button=LOGIN_FORM["button"])["button"]
+        label = (btn.attributes.get("value") or btn.text).strip().lower()
         assert "login" in label, (
             f"[{cfg['label']}] Button label unexpected: '{label}'"
         )
@@ -369,14 +462,15 @@ class TestUICrossBrowser:
         driver, cfg = browser
         fill_login(driver, "", "")
         submit_login(driver)
-        try:
-            err_el = driver.find_element(By.CSS_SELECTOR, "[data-test='error']")
-            assert err_el.is_displayed(), f"[{cfg['label']}] Error element hidden."
-            assert err_el.value_of_css_property("color") != "", (
-                f"[{cfg['label']}] Error element has no color style."
-            )
-        except NoSuchElementException:
+        if not element_visible(driver, *LoginPage.ERROR, timeout=TIMEOUT):
+            pytest.fail(f"[{cfg['label']}] Error element did not appear within {TIMEOUT}s.")
+        err = snapshot(driver, error=LoginPage.ERROR)["error"]
+        if not err.present:
             pytest.fail(f"[{cfg['label']}] Error element not found in DOM.")
+        assert err.visible, f"[{cfg['label']}] Error element hidden."
+        assert err.styles.get("color", "") != "", (
+            f"[{cfg['label']}] Error element has no color style."
+        )
 
     def test_page_logo_renders(self, browser):
         """
@@ -384,7 +478,7 @@ class TestUICrossBrowser:
         Validates asset loading across browsers.
         """
         driver, cfg = browser
-        logo = element_visible(driver, By.CLASS_NAME, "login_logo")
+        logo = snapshot(driver, logo=LOGIN_FORM["logo"])["logo"].visible
         assert logo, f"[{cfg['label']}] Login logo not rendered."
 
     def test_form_field_placeholders(self, browser):
@@ -392,8 +486,9 @@ class TestUICrossBrowser:
         [UI-06] Username and password inputs must have non-empty placeholders.
         """
         driver, cfg = browser
-        u_placeholder = driver.find_element(By.ID, "user-name").get_attribute("placeholder")
-        p_placeholder = driver.find_element(By.ID, "password").get_attribute("placeholder")
+        snap = snapshot(driver, username=LOGIN_FORM["username"], password=LOGIN_FORM["password"])
+        u_placeholder = snap["username"].attributes.get("placeholder")
+        p_placeholder = snap["password"].attributes.get("placeholder")
         assert u_placeholder and len(u_placeholder) > 0, (
             f"[{cfg['label']}] Username placeholder empty."
         )
@@ -407,11 +502,10 @@ class TestUICrossBrowser:
         Critical for mobile browsers and narrow viewports.
         """
         driver, cfg = browser
-        scroll_width  = driver.execute_script("return document.documentElement.scrollWidth")
-        client_width  = driver.execute_script("return document.documentElement.clientWidth")
-        assert scroll_width <= client_width, (
+        viewport = snapshot(driver).viewport
+        assert viewport["scrollWidth"] <= viewport["clientWidth"], (
             f"[{cfg['label']}] Horizontal overflow detected: "
-            f"scrollWidth={scroll_width}, clientWidth={client_width}"
+            f"scrollWidth={viewport['scrollWidth']}, clientWidth={viewport['clientWidth']}"
         )
 
     def test_tab_key_navigation(self, browser):
@@ -420,10 +514,126 @@ class TestUICrossBrowser:
         Accessibility compliance across browsers.
         """
         driver, cfg = browser
-        username_field = driver.find_element(By.ID, "user-name")
-        username_field.click()
-        username_field.send_keys(Keys.TAB)
+        LoginPage(driver).tab_from_username()
         focused_id = driver.execute_script("return document.activeElement.id")
         assert focused_id == "password", (
             f"[{cfg['label']}] Tab did not move focus to password field. Focused: '{focused_id}'"
         )
+
+
+# ─────────────────────────────────────────────────────────────
+#  PERFORMANCE TEST CASES (BS_PERF_MODE=1)
+# ─────────────────────────────────────────────────────────────
+
+@pytest.mark.perf
+@pytest.mark.skipif(not PERF_MODE, reason="login performance mode is off (set BS_PERF_MODE=1)")
+class TestLoginPerformance:
+
+    def test_perf_user_login_latency(self, browser, record_property):
+        """
+        [PERF-01] performance_glitch_user logs in PERF_REPEATS times; the
+        click → inventory-rendered latency is measured in the page (not by
+        polling over the hub) and its p50/p95 must stay within
+        PERF_THRESHOLD of the stored baseline.
+        """
+        driver, cfg = browser
+        logins = []
+        for attempt in range(PERF_REPEATS):
+            if attempt:
+                SessionPool.reset(driver)
+            fill_login(driver, PERF_USER, VALID_PASS)
+            mark_click(driver)
+            submit_login(driver)
+            assert wait_for_dashboard(driver), (
+                f"[{cfg['label']}] {PERF_USER} did not reach the dashboard (attempt {attempt + 1})."
+            )
+            assert element_visible(driver, By.CSS_SELECTOR, INVENTORY_SELECTOR, timeout=TIMEOUT)
+            timing = collect_timing(driver)
+            assert timing.click_to_inventory_ms is not None, (
+                f"[{cfg['label']}] The page did not record the inventory render (attempt {attempt + 1})."
+            )
+            logins.append(timing)
+
+        stats       = latency_stats([t.click_to_inventory_ms for t in logins])
+        regressions = PerfBaseline(PERF_BASELINE, PERF_THRESHOLD).regressions(cfg["id"], stats)
+        record_property("login_perf", {
+            "config"     : cfg["id"],
+            "stats"      : stats,
+            "regressions": regressions,
+            "logins"     : [{"click_to_inventory_ms": t.click_to_inventory_ms,
+                             "full_navigation": t.full_navigation,
+                             "navigation": t.navigation, "paint": t.paint,
+                             "resources": len(t.resources), "resource_bytes": t.resource_bytes}
+                            for t in logins],
+        })
+        assert not regressions, (
+            f"[{cfg['label']}] Login latency regressed: " + "; ".join(regressions)
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+#  VISUAL REGRESSION (BS_VISUAL_MODE=1)
+# ─────────────────────────────────────────────────────────────
+
+def check_visual(driver, cfg, state: str, record_property):
+    """Screenshot the current page and compare it with the config's baseline."""
+    result = check_capture(driver.get_screenshot_as_png(), cfg["id"], state, update=VISUAL_UPDATE_BASELINE,
+                           pixel_ratio=driver.execute_script(PIXEL_RATIO_SCRIPT))
+    record_property("visual", vars(result))
+    if result.recorded and not VISUAL_UPDATE_BASELINE:
+        pytest.skip(f"[{cfg['label']}] {result.reason} (nothing compared; the next run compares against it)")
+    assert result.passed, (
+        f"[{cfg['label']}] {state} screenshot differs from baseline: {result.reason}"
+        + (f" (diff: {result.diff_path})" if result.diff_path else "")
+    )
+
+
+@pytest.mark.visual
+@pytest.mark.engine_sensitive
+@pytest.mark.skipif(not VISUAL_MODE, reason="visual regression mode is off (set BS_VISUAL_MODE=1)")
+class TestVisualRegression:
+
+    def test_login_page_matches_baseline(self, browser, record_property):
+        """
+        [VIS-01] The freshly loaded login page matches the config's baseline.
+        """
+        driver, cfg = browser
+        assert element_visible(driver, By.ID, "login-button", timeout=TIMEOUT)
+        check_visual(driver, cfg, "login", record_property)
+
+    def test_error_state_matches_baseline(self, browser, record_property):
+        """
+        [VIS-02] The login page showing the 'Username is required' error
+        matches the config's baseline.
+        """
+        driver, cfg = browser
+        submit_login(driver)
+        assert "Username is required" in get_error(driver)
+        check_visual(driver, cfg, "error", record_property)
+
+
+# ─────────────────────────────────────────────────────────────
+#  PAYLOAD CORPUS (BS_CORPUS_MODE=1)
+# ─────────────────────────────────────────────────────────────
+
+@pytest.mark.security
+@pytest.mark.corpus
+@pytest.mark.skipif(not (CORPUS_MODE and CORPUS_FILE), reason="payload corpus mode is off (set BS_CORPUS_MODE=1)")
+class TestPayloadCorpus:
+
+    def test_payload_corpus_rejected(self, browser, record_property):
+        """
+        [SEC-01] Every corpus payload (SQLi, XSS, injection, unicode,
+        whitespace, overflow, case variants) gets the expected outcome
+        on the login form, batched inside this one session.
+        """
+        driver, cfg = browser
+        assert element_visible(driver, By.ID, "login-button", timeout=TIMEOUT)
+        results, calls = run_corpus(driver, load_corpus(CORPUS_FILE))
+        summary = summarise(results, calls)
+        record_property("corpus", {"config": cfg["id"], "label": cfg["label"], **summary,
+                                   "failures": summary["failures"][:50]})
+        assert not summary["failures"], (
+            f"[{cfg['label']}] {len(summary['failures'])}/{summary['cases']} corpus cases failed: "
+            + "; ".join(summary["failures"][:5])
+        )
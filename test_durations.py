@@ -0,0 +1,60 @@
+"""
+============================================================
+  test_durations.py
+  Unit tests for duration estimates and LPT ordering
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from types import SimpleNamespace
+
+from browserstack_config import DEFAULT_TEST_SECONDS, MOBILE_FACTOR
+from durations import DurationModel, split_nodeid, lpt_order, predict_makespan
+
+
+def item(nodeid):
+    return SimpleNamespace(nodeid=nodeid)
+
+
+def nodeids(items) -> list:
+    return [it.nodeid for it in items]
+
+
+# ── Estimates ────────────────────────────────────────────────
+def test_split_nodeid_separates_the_config_parameter():
+    assert split_nodeid("t.py::C::test_x[chrome_win11]") == ("t.py::C::test_x", "chrome_win11")
+    assert split_nodeid("t.py::test_unit") == ("t.py::test_unit", "")
+
+
+def test_estimates_fall_back_from_node_to_test_to_config_to_default():
+    model = DurationModel({"t::a[x]": 2.0, "t::b[x]": 4.0, "t::a[y]": 6.0})
+    assert model.estimate("t::a[x]") == 2.0
+    assert model.estimate("t::b[y]") == 4.0 * (6.0 / 4.0)          # test mean scaled by the config factor
+    assert model.estimate("t::c[x]") == 3.0                         # config mean
+    assert DurationModel().estimate("t::c[chrome_win11]") == DEFAULT_TEST_SECONDS
+    assert DurationModel().estimate("t::c[iphone15]") == DEFAULT_TEST_SECONDS * MOBILE_FACTOR
+
+
+# ── LPT ordering ─────────────────────────────────────────────
+def test_lpt_order_puts_the_longest_config_group_first():
+    model = DurationModel({"t::a[x]": 1.0, "t::b[x]": 1.0, "t::a[y]": 5.0, "t::b[y]": 2.0})
+    items = [item("t::a[x]"), item("t::b[x]"), item("t::b[y]"), item("t::a[y]")]
+    assert nodeids(lpt_order(items, model)) == ["t::a[y]", "t::b[y]", "t::a[x]", "t::b[x]"]
+
+
+def test_lpt_order_keeps_collection_order_on_ties():
+    items = [item("t::b[x]"), item("t::a[x]"), item("t::c[y]")]
+    assert nodeids(lpt_order(items, DurationModel())) == ["t::b[x]", "t::a[x]", "t::c[y]"]
+
+
+def test_predicted_makespan_is_the_busiest_slot():
+    assert predict_makespan([5.0, 3.0, 3.0, 1.0], slots=2) == 6.0
+    assert predict_makespan([5.0, 3.0], slots=0) == 8.0
+
+
+# ── History fingerprint ──────────────────────────────────────
+def test_fingerprint_changes_with_the_history_only():
+    history = DurationModel({"t::a[x]": 2.0, "t::a[y]": 3.0}).fingerprint()
+    assert DurationModel({"t::a[y]": 3.0, "t::a[x]": 2.0}).fingerprint() == history
+    assert DurationModel({"t::a[x]": 2.5, "t::a[y]": 3.0}).fingerprint() != history
+    assert DurationModel().fingerprint() == ""
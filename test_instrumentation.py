@@ -0,0 +1,74 @@
+"""
+============================================================
+  test_instrumentation.py
+  Unit tests for latency percentiles and the command timer
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from instrumentation import percentile, summarise, instrument, tag_test, LatencyRecorder
+from run_timeline import TIMELINE
+
+
+class FakeDriver:
+    def execute(self, command, params=None):
+        return {"value": command}
+
+
+# ── Percentiles ──────────────────────────────────────────────
+def test_percentile_is_nearest_rank():
+    samples = [15, 20, 35, 40, 50]
+    assert percentile(samples, 30) == 20           # rank ceil(1.5) = 2
+    assert percentile(samples, 40) == 20           # rank 2, no interpolation
+    assert percentile(samples, 50) == 35
+    assert percentile(samples, 100) == 50
+    assert percentile(samples, 0) == 15            # rank never drops below 1
+
+
+def test_percentile_ignores_input_order_and_handles_empty_lists():
+    assert percentile([9, 1, 5], 50) == 5
+    assert percentile([], 95) == 0.0
+
+
+def test_p95_of_a_hundred_samples_is_the_95th_value():
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+# ── Summaries ────────────────────────────────────────────────
+def test_summary_converts_seconds_to_milliseconds_and_fills_buckets():
+    summary = summarise([0.004, 0.005, 0.012, 0.3, 7.0])
+    assert summary["count"] == 5 and summary["max_ms"] == 7000.0
+    assert summary["p50_ms"] == 12.0
+    assert summary["histogram"]["<=5ms"] == 2            # bounds are inclusive
+    assert summary["histogram"]["<=25ms"] == 1
+    assert summary["histogram"]["<=500ms"] == 1
+    assert summary["histogram"][">5000ms"] == 1
+    assert sum(summary["histogram"].values()) == 5
+
+
+def test_empty_summary_is_all_zeros():
+    summary = summarise([])
+    assert summary["count"] == 0 and summary["mean_ms"] == summary["p99_ms"] == summary["max_ms"] == 0.0
+
+
+# ── Recorder ─────────────────────────────────────────────────
+def test_timed_commands_are_grouped_by_config_command_and_test(monkeypatch):
+    monkeypatch.setattr(TIMELINE, "enabled", False)
+    recorder = LatencyRecorder()
+    driver   = instrument(FakeDriver(), {"id": "chrome"}, recorder)
+    assert driver.execute("findElement") == {"value": "findElement"}
+    tag_test(driver, "t::a[chrome]")
+    driver.execute("findElement")
+    driver.execute("clickElement")
+    report = recorder.report()
+    assert report["by_config"]["chrome"]["findElement"]["count"] == 2
+    assert report["by_command"]["clickElement"]["count"] == 1
+    assert list(report["by_test"]) == ["t::a[chrome]"]           # setup commands carry no test
+    assert report["by_test"]["t::a[chrome]"]["commands"] == 2
+
+
+def test_bottlenecks_rank_config_command_pairs_by_p95():
+    recorder = LatencyRecorder()
+    recorder.extend([("a", "", "get", 0.9), ("a", "", "click", 0.1), ("b", "", "get", 0.5)])
+    assert [(cfg, cmd) for cfg, cmd, _ in recorder.bottlenecks(top=2)] == [("a", "get"), ("b", "get")]
@@ -0,0 +1,124 @@
+"""
+============================================================
+  test_login_page.py
+  Unit tests for the per-document WebElement cache
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from instrumentation import instrument, LatencyRecorder
+from run_timeline import TIMELINE
+from login_page import LoginPage, element_cache
+
+
+class FakeElement:
+    def __init__(self, document: int, locator: tuple, driver):
+        self.document, self.locator, self.driver = document, locator, driver
+        self.keys = []
+
+    def _check(self):
+        if self.document != self.driver.document:
+            raise StaleElementReferenceException("stale element reference")
+
+    def clear(self):
+        self._check()
+
+    def send_keys(self, text):
+        self._check()
+        self.keys.append(text)
+
+    def click(self):
+        self._check()
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    @property
+    def text(self):
+        self._check()
+        return " Epic sadface: nope "
+
+
+class FakeDriver:
+    """Counts remote lookups; `document` changes on get() or when a test says so."""
+
+    def __init__(self, present=("user-name", "password", "login-button")):
+        self.document = 0
+        self.present  = set(present)
+        self.lookups  = 0
+
+    def execute(self, command, params=None):
+        if command == "get":
+            self.document += 1
+        return {"value": None}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    def find_element(self, by, value):
+        self.execute("findElement")
+        self.lookups += 1
+        if value not in self.present:
+            raise NoSuchElementException(value)
+        return FakeElement(self.document, (by, value), self)
+
+    def find_elements(self, by, value):
+        self.execute("findElements")
+        self.lookups += 1
+        return [FakeElement(self.document, (by, value), self)] if value in self.present else []
+
+
+@pytest.fixture
+def driver(monkeypatch):
+    monkeypatch.setattr(TIMELINE, "enabled", False)
+    return instrument(FakeDriver(), {"id": "fake"}, LatencyRecorder())
+
+
+# ── Hits ─────────────────────────────────────────────────────
+def test_repeated_lookups_on_one_document_are_served_from_the_cache(driver):
+    page = LoginPage(driver)
+    page.fill("standard_user", "secret_sauce")
+    page.fill("locked_out_user", "secret_sauce")
+    page.submit()
+    assert driver.lookups == 3
+    assert element_cache(driver).stats == {"hits": 2, "misses": 3, "stale": 0, "invalidations": 0}
+
+
+def test_missing_elements_are_not_cached(driver):
+    page = LoginPage(driver)
+    assert page.error_text() == ""
+    driver.present.add("[data-test='error']")
+    assert page.error_text() == "Epic sadface: nope"
+    assert element_cache(driver).stats["hits"] == 0
+
+
+# ── Invalidation ─────────────────────────────────────────────
+def test_navigation_on_the_command_stream_drops_the_cache(driver):
+    page = LoginPage(driver)
+    page.submit()
+    driver.get("https://www.saucedemo.com/")
+    page.submit()
+    assert driver.lookups == 2
+    assert element_cache(driver).stats["invalidations"] == 1
+
+
+def test_unseen_document_change_is_recovered_from_the_stale_reference(driver):
+    page = LoginPage(driver)
+    page.fill("a", "b")
+    driver.document += 1                                # e.g. a click that navigated
+    page.fill("c", "d")
+    stats = element_cache(driver).stats
+    assert stats["stale"] == 1 and stats["invalidations"] == 1
+    assert driver.lookups == 4                          # user-name and password located again
+
+
+def test_stats_reset_per_test(driver):
+    cache = element_cache(driver)
+    LoginPage(driver).submit()
+    cache.reset_stats()
+    LoginPage(driver).submit()
+    assert cache.stats == {"hits": 1, "misses": 0, "stale": 0, "invalidations": 0}
@@ -0,0 +1,80 @@
+"""
+============================================================
+  test_matrix_reduction.py
+  Unit tests for engine-equivalence matrix reduction
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from browserstack_config import BROWSER_MATRIX
+from durations import DurationModel
+from matrix_reduction import rendering_engine, engine_configs, reduce_items, coverage
+
+CONFIGS = {cfg["id"]: cfg for cfg in BROWSER_MATRIX}
+
+
+class FakeItem:
+    def __init__(self, test: str, config_id: str = None, markers=()):
+        self.nodeid    = f"t.py::{test}" + (f"[{config_id}]" if config_id else "")
+        self.config_id = config_id
+        self.markers   = set(markers)
+
+    def get_closest_marker(self, name):
+        return name if name in self.markers else None
+
+
+def config_of(item):
+    return CONFIGS.get(item.config_id)
+
+
+def across_matrix(test: str, markers=()) -> list:
+    return [FakeItem(test, cfg_id, markers) for cfg_id in CONFIGS]
+
+
+def kept_ids(kept) -> list:
+    return [item.config_id for item in kept]
+
+
+# ── Engines ──────────────────────────────────────────────────
+def test_ios_browsers_are_webkit_and_desktop_configs_come_first():
+    assert rendering_engine({"device": "iPhone 15", "browser": "chrome"}) == "webkit"
+    assert rendering_engine({"browser": "Edge"}) == "blink"
+    engines = engine_configs()
+    assert {"blink", "gecko", "webkit"} <= set(engines)
+    assert all(not CONFIGS[ids[0]].get("real_mobile") for ids in engines.values())
+
+
+# ── reduce_items() ───────────────────────────────────────────
+def test_agnostic_tests_keep_the_first_desktop_config_per_engine():
+    kept, dropped = reduce_items(across_matrix("test_negative", {"negative"}), "engine", 0, config_of)
+    assert sorted(kept_ids(kept)) == sorted(ids[0] for ids in engine_configs().values())
+    assert len(kept) + len(dropped) == len(CONFIGS)
+
+
+def test_engine_sensitive_and_unmarked_tests_keep_the_full_matrix():
+    for markers in ((), ("negative", "engine_sensitive")):
+        kept, dropped = reduce_items(across_matrix("test_ui", markers), "engine", 0, config_of)
+        assert len(kept) == len(CONFIGS) and dropped == []
+
+
+def test_items_without_a_config_are_always_kept():
+    unit = FakeItem("test_unit", markers={"engine_agnostic"})
+    assert reduce_items([unit], "engine", 0, config_of) == ([unit], [])
+
+
+def test_rotate_keeps_one_config_per_engine_and_moves_with_the_seed():
+    picks = set()
+    for seed in range(10):
+        kept, _ = reduce_items(across_matrix("test_negative", {"engine_agnostic"}), "rotate", seed, config_of)
+        assert sorted(rendering_engine(config_of(item)) for item in kept) == sorted(engine_configs())
+        picks.update(kept_ids(kept))
+    assert picks == set(CONFIGS)
+
+
+# ── coverage() ───────────────────────────────────────────────
+def test_coverage_reports_pairs_seconds_and_engines_hit():
+    kept, dropped = reduce_items(across_matrix("test_negative", {"negative"}), "engine", 0, config_of)
+    summary = coverage(kept, dropped, config_of, DurationModel(), "engine", 0)
+    assert summary["pairs_full"] == len(CONFIGS) and summary["pairs_run"] == len(kept)
+    assert summary["seconds_saved"] < summary["seconds_full"]
+    assert summary["reduced_tests"]["t.py::test_negative"]["engines"] == sorted(engine_configs())
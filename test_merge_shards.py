@@ -0,0 +1,119 @@
+"""
+============================================================
+  test_merge_shards.py
+  Unit tests for merging --shard runs into one build
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from browserstack_config import RESULTS_STREAM, STATUS_FILE
+from durations import DurationModel
+from merge_shards import merge, merged_exitstatus
+from result_stream import ResultStream, read_stream
+from results_store import ResultsStore
+from teardown import TeardownQueue
+
+HISTORY = DurationModel({"t::a[chrome]": 2.0, "t::a[safari]": 3.0}).fingerprint()
+
+
+class FakeHttp:
+    """Stands in for the pooled urllib3 client behind TeardownQueue.send_statuses."""
+
+    def __init__(self):
+        self.puts = {}
+
+    def request(self, method, url, body=None, headers=None, retries=None):
+        self.puts[url.rsplit("/", 1)[1]] = json.loads(body)
+        return SimpleNamespace(status=200, data=b"")
+
+
+def shard(tmp_path, index: int, total: int, results: dict, exitstatus=0, history=HISTORY, statuses=None):
+    """A shard's reports directory: its stream (`results` nodeid → outcome) and deferred statuses."""
+    directory = tmp_path / f"shard-{index}"
+    stream    = ResultStream(str(directory / os.path.basename(RESULTS_STREAM)), worker="main")
+    stream.start_run(["chrome", "safari"], shard=(index, total), history=history)
+    for nodeid, outcome in results.items():
+        config = nodeid[nodeid.index("[") + 1:-1]
+        test   = nodeid.split("::")[1].split("[")[0]
+        item   = SimpleNamespace(originalname=test, name=test, cls=None)
+        report = SimpleNamespace(nodeid=nodeid, when="call", outcome=outcome, duration=1.0,
+                                 passed=outcome == "passed", failed=outcome == "failed", skipped=False,
+                                 longrepr=None, longreprtext="boom")
+        stream.record(item, report, {"id": config})
+    stream.end_run(exitstatus)
+    stream.close()
+    if statuses:
+        (directory / os.path.basename(STATUS_FILE)).write_text(
+            "".join(json.dumps({"session": sid, "status": status, "reason": ""}) + "\n"
+                    for sid, status in statuses.items()))
+    return str(directory)
+
+
+def outputs(tmp_path) -> dict:
+    return {"output": str(tmp_path / "merged" / "results.jsonl"), "report": str(tmp_path / "merged" / "report.html"),
+            "db": str(tmp_path / "merged" / "results.db")}
+
+
+# ── Merging ──────────────────────────────────────────────────
+def test_shards_merge_into_one_stream_report_build_and_status_batch(tmp_path):
+    dirs = [shard(tmp_path, 1, 2, {"t::a[chrome]": "passed", "t::b[chrome]": "failed"}, exitstatus=1,
+                  statuses={"s1": "passed", "s2": "failed"}),
+            shard(tmp_path, 2, 2, {"t::a[safari]": "passed"}, statuses={"s3": "passed"})]
+    queue = TeardownQueue(mode="rest")
+    queue._http = http = FakeHttp()
+    summary = merge(dirs, **outputs(tmp_path), build="nightly", queue=queue)
+
+    assert (summary["shards"], summary["results"], summary["missing"], summary["finished"]) == (2, 3, [], True)
+    records = list(read_stream(outputs(tmp_path)["output"]))
+    assert [r["type"] for r in records] == ["run", "result", "result", "result", "end"]
+    assert records[0]["shards"] == [[1, 2], [2, 2]] and records[0]["configs"] == ["chrome", "safari"]
+    assert records[-1]["exitstatus"] == 1
+    assert "3 results" in open(outputs(tmp_path)["report"], encoding="utf-8").read()
+
+    assert summary["statuses"] == 3 and summary["status_errors"] == []
+    assert http.puts == {"s1.json": {"status": "passed", "reason": ""}, "s2.json": {"status": "failed", "reason": ""},
+                         "s3.json": {"status": "passed", "reason": ""}}
+
+
+def test_merging_again_replaces_the_build(tmp_path):
+    dirs = [shard(tmp_path, 1, 2, {"t::a[chrome]": "passed"}), shard(tmp_path, 2, 2, {"t::a[safari]": "passed"})]
+    merge(dirs, **outputs(tmp_path))
+    merge(dirs, **outputs(tmp_path))
+    store = ResultsStore(outputs(tmp_path)["db"])
+    assert store.db.execute("SELECT COUNT(*) FROM builds").fetchone()[0] == 1
+    assert store.db.execute("SELECT COUNT(*) FROM results").fetchone()[0] == 2      # one row per test
+    store.close()
+
+
+def test_missing_shards_are_reported_and_statuses_wait_for_a_queue(tmp_path):
+    dirs    = [shard(tmp_path, 1, 3, {"t::a[chrome]": "passed"}, statuses={"s1": "passed"})]
+    summary = merge(dirs, **outputs(tmp_path))
+    assert summary["missing"] == [2, 3]
+    assert summary["statuses"] == 1                      # read, but not sent without a queue (--no-statuses)
+
+
+# ── Refusals ─────────────────────────────────────────────────
+def test_shards_partitioned_on_different_histories_are_refused(tmp_path):
+    dirs = [shard(tmp_path, 1, 2, {"t::a[chrome]": "passed"}),
+            shard(tmp_path, 2, 2, {"t::a[safari]": "passed"}, history="")]
+    with pytest.raises(ValueError, match="different duration histories"):
+        merge(dirs, **outputs(tmp_path))
+    assert not os.path.exists(outputs(tmp_path)["db"])
+
+
+def test_a_shard_without_a_stream_is_refused(tmp_path):
+    with pytest.raises(ValueError, match="no result stream"):
+        merge([str(tmp_path / "shard-1")], **outputs(tmp_path))
+
+
+def test_exit_status_is_the_worst_real_failure():
+    assert merged_exitstatus([0, 1, 5]) == 1
+    assert merged_exitstatus([5, 5]) == 5
+    assert merged_exitstatus([0, 5]) == 0
+
@@ -0,0 +1,118 @@
+"""
+============================================================
+  test_payload_corpus.py
+  Runs CORPUS_SCRIPT as real JavaScript (Node.js) on a mock
+  login form, plus unit tests for the result bookkeeping
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+local_grid.py only emulates CORPUS_SCRIPT in Python, keyed on its
+/* loginCorpus */ tag, so the script text itself is executed here.
+The mock page behaves like SauceDemo's React form where it matters:
+assigning `field.value` directly is swallowed by React's value
+tracker, and the form state only changes on an `input` event.
+"""
+
+import json
+import shutil
+import subprocess
+
+import pytest
+
+from payload_corpus import CORPUS_SCRIPT, CorpusCase, CaseResult, summarise
+
+NODE = shutil.which("node")
+
+# A minimal DOM: only what CORPUS_SCRIPT touches. A submission whose
+# username is "ok" logs in; anything else shows an error banner.
+MOCK_PAGE = r"""
+class Event { constructor(type, init) { this.type = type; this.bubbles = !!(init && init.bubbles); } }
+class HTMLInputElement {
+  constructor(id) {
+    this.id = id; this.listeners = [];
+    // React's value tracker: a plain assignment never reaches the form state.
+    Object.defineProperty(this, "value", {get() { return this._native; }, set(v) { this._tracked = v; }});
+  }
+  addEventListener(type, fn) { if (type === "input") this.listeners.push(fn); }
+  dispatchEvent(event) { if (event.type === "input") this.listeners.forEach(fn => fn(event)); return true; }
+}
+Object.defineProperty(HTMLInputElement.prototype, "value", {
+  get() { return this._native; }, set(v) { this._native = String(v); }, configurable: true,
+});
+class Button { constructor(id, onclick) { this.id = id; this.click = onclick; } }
+
+const state = {"user-name": "", "password": ""}, submissions = [];
+const window = {HTMLInputElement, location: {href: "https://www.saucedemo.com/"}};
+const elements = {}, byTest = {};
+for (const id of ["user-name", "password"]) {
+  const field = elements[id] = new HTMLInputElement(id);
+  field._native = "";
+  field.addEventListener("input", () => { state[id] = field._native; });
+}
+elements["login-button"] = new Button("login-button", () => {
+  submissions.push([state["user-name"], state["password"]]);
+  if (state["user-name"] === "ok") {
+    window.location.href = "https://www.saucedemo.com/inventory.html";
+    for (const key of Object.keys(elements)) delete elements[key];
+    delete byTest.error;
+    return;
+  }
+  byTest.error = {textContent: "rejected " + state["user-name"] + "/" + state["password"]};
+  byTest["error-button"] = new Button("error-button", () => { delete byTest.error; delete byTest["error-button"]; });
+});
+const document = {
+  getElementById: id => elements[id] || null,
+  querySelector: sel => byTest[(sel.match(/\[data-test='([^']+)'\]/) || [])[1]] || null,
+};
+Object.assign(globalThis, {window, document, Event});
+const cases = JSON.parse(process.argv[process.argv.length - 1]);
+const script = new Function(require("fs").readFileSync(0, "utf8"));   // as execute_async_script wraps it
+script(cases, results => {
+  console.log(JSON.stringify({results, submissions, state}));
+});
+"""
+
+
+def run_in_node(cases: list) -> dict:
+    proc = subprocess.run([NODE, "-e", MOCK_PAGE, "--", json.dumps(cases)], input=CORPUS_SCRIPT,
+                          capture_output=True, text=True, timeout=30)
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout)
+
+
+# ── CORPUS_SCRIPT in a JavaScript engine ─────────────────────
+@pytest.mark.skipif(NODE is None, reason="Node.js not installed")
+def test_script_fills_through_the_native_setter_and_records_each_case():
+    cases = [["admin'--", "x"], ["<script>", ""], ["  ", "pw"]]
+    out   = run_in_node(cases)
+    assert out["submissions"] == cases                              # React saw every value
+    assert out["results"] == [[f"rejected {u}/{p}", "https://www.saucedemo.com/"] for u, p in cases]
+    assert out["state"] == {"user-name": "", "password": ""}       # form cleared after the last case
+
+
+@pytest.mark.skipif(NODE is None, reason="Node.js not installed")
+def test_script_stops_the_batch_at_a_case_that_logs_in():
+    out = run_in_node([["a", "1"], ["ok", "2"], ["b", "3"]])
+    assert out["submissions"] == [["a", "1"], ["ok", "2"]]
+    assert out["results"][-1] == ["", "https://www.saucedemo.com/inventory.html"]
+
+
+# ── Results ──────────────────────────────────────────────────
+def test_outcome_and_expectation():
+    rejected = CaseResult(CorpusCase("x", "y", "sqli", message="do not match"), "Epic sadface: do not match", "/")
+    leaked   = CaseResult(CorpusCase("x", "y", "sqli"), "", "https://www.saucedemo.com/inventory.html?a=1")
+    assert rejected.outcome == "error" and rejected.passed
+    assert leaked.outcome == "dashboard" and not leaked.passed
+
+
+def test_summary_counts_per_category():
+    results = [
+        CaseResult(CorpusCase("a", "b", "sqli"), "error", "/"),
+        CaseResult(CorpusCase("c", "d", "sqli"), "", "/"),
+        CaseResult(CorpusCase("e", "f", "xss", expect="dashboard"), "", "/inventory.html"),
+    ]
+    summary = summarise(results, calls=1)
+    assert summary["cases"] == 3 and summary["passed"] == 2 and summary["script_calls"] == 1
+    assert summary["categories"] == {"sqli": {"cases": 2, "passed": 1, "logged_in": 0},
+                                     "xss" : {"cases": 1, "passed": 1, "logged_in": 1}}
+    assert len(summary["failures"]) == 1
@@ -0,0 +1,132 @@
+"""
+============================================================
+  test_result_stream.py
+  Unit tests for the JSONL result stream and its HTML report
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import json
+import re
+from types import SimpleNamespace
+
+from result_stream import ResultStream, read_stream
+from stream_report import fold, build_payload, render, PAGE_SIZE
+
+
+def item(test, cls="TestLogin", setup=0.0):
+    return SimpleNamespace(originalname=test, name=test, cls=type(cls, (), {}) if cls else None,
+                           rep_setup=SimpleNamespace(duration=setup))
+
+
+def report(nodeid, when="call", outcome="passed", duration=1.0, text=""):
+    return SimpleNamespace(nodeid=nodeid, when=when, outcome=outcome, duration=duration,
+                           passed=outcome == "passed", failed=outcome == "failed",
+                           skipped=outcome == "skipped", longrepr=None, longreprtext=text)
+
+
+def page_data(html: str) -> dict:
+    return json.loads(re.search(r'<script id="data" type="application/json">(.*?)</script>', html).group(1))
+
+
+# ── Stream ───────────────────────────────────────────────────
+def test_workers_append_to_one_stream(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    ResultStream(path).start_run(["chrome", "firefox"], shard=(1, 2))
+    for worker, cfg in (("gw0", "chrome"), ("gw1", "firefox")):
+        stream = ResultStream(path, worker)
+        stream.record(item("test_a", setup=0.5), report(f"t::test_a[{cfg}]"), {"id": cfg})
+        stream.record(item("test_a"), report(f"t::test_a[{cfg}]", when="setup"), {"id": cfg})   # passed setup: dropped
+        stream.close()
+    records = list(read_stream(path))
+    assert [r["type"] for r in records] == ["run", "result", "result"]
+    assert records[0]["configs"] == ["chrome", "firefox"] and records[0]["shard"] == [1, 2]
+    assert [(r["worker"], r["config"], r["setup"]) for r in records[1:]] == [("gw0", "chrome", 0.5),
+                                                                             ("gw1", "firefox", 0.5)]
+
+
+def test_start_run_truncates_and_end_run_closes(tmp_path):
+    path   = str(tmp_path / "results.jsonl")
+    stream = ResultStream(path)
+    stream.start_run(["chrome"])
+    stream.record(item("test_a"), report("t::test_a[chrome]"), {"id": "chrome"})
+    stream.close()
+    stream = ResultStream(path)
+    stream.start_run(["chrome"])
+    stream.end_run(1)
+    stream.close()
+    assert [r["type"] for r in read_stream(path)] == ["run", "end"]
+
+
+def test_reader_ignores_a_partially_written_last_line(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text('{"type":"run","configs":[]}\nnot json\n{"type":"end","exitst')
+    assert list(read_stream(str(path))) == [{"type": "run", "configs": []}]
+
+
+# ── Folding ──────────────────────────────────────────────────
+def test_fold_keeps_the_worst_outcome_per_cell():
+    records = [
+        {"type": "run", "configs": ["chrome"]},
+        {"type": "result", "cls": "T", "test": "a", "config": "chrome", "when": "call",
+         "outcome": "passed", "duration": 1.0, "detail": ""},
+        {"type": "result", "cls": "T", "test": "a", "config": "chrome", "when": "teardown",
+         "outcome": "failed", "duration": 0.5, "detail": "quit failed"},
+        {"type": "result", "cls": "T", "test": "b", "config": "safari", "when": "setup",
+         "outcome": "skipped", "duration": 0.0, "detail": "no device"},
+    ]
+    folded = fold(records)
+    assert folded["configs"] == ["chrome", "safari"]                 # unseen configs are added
+    assert folded["cells"][("T", "a", "chrome")] == {"outcome": "error", "duration": 1.5, "detail": "quit failed"}
+    assert folded["cells"][("T", "b", "safari")]["outcome"] == "skipped"
+    assert folded["end"] is None
+
+
+# ── Report ───────────────────────────────────────────────────
+def test_payload_has_one_character_per_config_and_pass_rates():
+    folded = fold([
+        {"type": "run", "configs": ["x", "y"]},
+        {"type": "result", "cls": "", "test": "a", "config": "x", "when": "call",
+         "outcome": "passed", "duration": 1.0, "detail": ""},
+        {"type": "result", "cls": "", "test": "a", "config": "y", "when": "call",
+         "outcome": "failed", "duration": 1.0, "detail": "boom"},
+    ])
+    payload = build_payload(folded)
+    assert payload["sections"] == [{"name": "(module)", "rows": [["a", "PF"]]}]
+    assert payload["rates"] == [100, 0]
+    assert payload["details"] == {"(module)::a::y": "boom"}
+
+
+def test_render_ships_every_row_and_pages_them_in_the_browser(tmp_path):
+    path   = str(tmp_path / "results.jsonl")
+    out    = str(tmp_path / "report.html")
+    stream = ResultStream(path)
+    stream.start_run(["chrome"])
+    rows = PAGE_SIZE * 2 + 7
+    for n in range(rows):
+        stream.record(item(f"test_{n:03d}"), report(f"t::test_{n:03d}[chrome]"), {"id": "chrome"})
+    render(path, out)
+    html = open(out, encoding="utf-8").read()
+    assert "(in progress)" in html and 'http-equiv="refresh"' in html
+    data = page_data(html)
+    assert data["pageSize"] == PAGE_SIZE
+    assert len(data["sections"][0]["rows"]) == rows
+
+    stream.end_run(0)
+    stream.close()
+    render(path, out)
+    html = open(out, encoding="utf-8").read()
+    assert "(finished)" in html and 'http-equiv="refresh"' not in html
+    assert f"{rows} results" in html
+
+
+def test_failure_text_cannot_close_the_data_script(tmp_path):
+    path   = str(tmp_path / "results.jsonl")
+    stream = ResultStream(path)
+    stream.start_run(["chrome"])
+    stream.record(item("test_a"), report("t::test_a[chrome]", outcome="failed", text="</script><b>"),
+                  {"id": "chrome"})
+    stream.close()
+    render(path, str(tmp_path / "report.html"))
+    html = (tmp_path / "report.html").read_text(encoding="utf-8")
+    assert page_data(html)["details"] == {"TestLogin::test_a::chrome": "</script><b>"}
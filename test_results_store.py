@@ -0,0 +1,98 @@
+"""
+============================================================
+  test_results_store.py
+  Unit tests for the historical results store queries
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import json
+
+import pytest
+
+from results_store import ResultsStore
+
+
+def build(store, tmp_path, run_id: str, results: dict) -> int:
+    """Ingest one build; `results` maps nodeid → outcome(s) in stream order and duration."""
+    path  = tmp_path / f"{run_id}.jsonl"
+    lines = [{"type": "run", "run_id": run_id, "started": 0.0, "configs": ["x"]}]
+    for nodeid, (outcomes, duration) in results.items():
+        for outcome in outcomes.split(","):
+            lines.append({"type": "result", "nodeid": nodeid, "test": nodeid.split("[")[0], "config": "x",
+                          "when": "call", "outcome": outcome, "duration": duration, "setup": 0.0})
+    lines.append({"type": "end", "finished": 1.0, "exitstatus": 0})
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    return store.ingest_stream(str(path), build_name="nightly")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    yield store
+    store.close()
+
+
+# ── Ingest ───────────────────────────────────────────────────
+def test_reruns_fold_into_one_row_with_attempts(store, tmp_path):
+    build_id = build(store, tmp_path, "r1", {"t::a[x]": ("rerun,passed", 2.0), "t::b[x]": ("failed", 1.0)})
+    rows = {r["nodeid"]: r for r in store.db.execute("SELECT * FROM results WHERE build_id = ?", (build_id,))}
+    assert (rows["t::a[x]"]["outcome"], rows["t::a[x]"]["attempts"], rows["t::a[x]"]["duration"]) == ("passed", 2, 4.0)
+    assert rows["t::b[x]"]["outcome"] == "failed"
+
+
+def test_reingesting_a_run_replaces_its_build(store, tmp_path):
+    build(store, tmp_path, "r1", {"t::a[x]": ("failed", 1.0)})
+    build(store, tmp_path, "r1", {"t::a[x]": ("passed", 1.0)})
+    assert [tuple(r) for r in store.db.execute("SELECT nodeid, outcome FROM results")] == [("t::a[x]", "passed")]
+    assert store.db.execute("SELECT COUNT(*) FROM builds").fetchone()[0] == 1
+
+
+# ── Flakiest ─────────────────────────────────────────────────
+def test_flake_rate_counts_flips_and_rerun_passes(store, tmp_path):
+    history = [
+        {"t::flip[x]": ("passed", 1.0), "t::rerun[x]": ("passed", 1.0),        "t::solid[x]": ("passed", 1.0)},
+        {"t::flip[x]": ("failed", 1.0), "t::rerun[x]": ("rerun,passed", 1.0),  "t::solid[x]": ("passed", 1.0)},
+        {"t::flip[x]": ("passed", 1.0), "t::rerun[x]": ("passed", 1.0),        "t::solid[x]": ("passed", 1.0)},
+        {"t::flip[x]": ("failed", 1.0), "t::rerun[x]": ("passed", 1.0),        "t::solid[x]": ("passed", 1.0)},
+    ]
+    for n, results in enumerate(history):
+        build(store, tmp_path, f"r{n}", results)
+    rows = [dict(r) for r in store.flakiest_tests(last=4, min_runs=3)]
+    assert [(r["nodeid"], r["flips"], r["rerun_passes"], r["flake_rate"]) for r in rows] == [
+        ("t::flip[x]", 3, 0, 0.75),
+        ("t::rerun[x]", 0, 1, 0.25),
+    ]
+
+
+def test_flakiest_only_looks_at_the_last_builds(store, tmp_path):
+    build(store, tmp_path, "r0", {"t::a[x]": ("failed", 1.0)})
+    for n in range(1, 4):
+        build(store, tmp_path, f"r{n}", {"t::a[x]": ("passed", 1.0)})
+    assert store.flakiest_tests(last=3) == []
+    assert [r["nodeid"] for r in store.flakiest_tests(last=4)] == ["t::a[x]"]
+
+
+# ── Regressions ──────────────────────────────────────────────
+def test_regressions_report_new_failures_and_real_slowdowns(store, tmp_path):
+    base = build(store, tmp_path, "r1", {
+        "t::breaks[x]": ("passed", 1.0), "t::slower[x]": ("passed", 2.0),
+        "t::noise[x]": ("passed", 0.2), "t::was_failing[x]": ("failed", 1.0),
+    })
+    build(store, tmp_path, "r2", {
+        "t::breaks[x]": ("failed", 1.0), "t::slower[x]": ("passed", 5.0),
+        "t::noise[x]": ("passed", 0.5), "t::was_failing[x]": ("failed", 1.0),
+    })
+    found = store.regressions_since(base)
+    assert [tuple(r) for r in found["failing"]] == [("t::breaks[x]", "passed", "failed")]
+    assert [(r["nodeid"], r["factor"]) for r in found["slower"]] == [("t::slower[x]", 2.5)]   # 0.3 s is noise
+
+
+def test_builds_resolve_by_id_run_id_or_name(store, tmp_path):
+    first  = build(store, tmp_path, "r1", {"t::a[x]": ("passed", 1.0)})
+    second = build(store, tmp_path, "r2", {"t::a[x]": ("passed", 1.0)})
+    assert store.resolve_build(first) == first
+    assert store.resolve_build("r1") == first
+    assert store.resolve_build("nightly") == second                  # a name means its latest build
+    with pytest.raises(LookupError):
+        store.resolve_build("missing")
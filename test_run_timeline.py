@@ -0,0 +1,77 @@
+"""
+============================================================
+  test_run_timeline.py
+  Unit tests for slot utilisation and the critical path
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import json
+
+from run_timeline import summarise, exclusive_times, peak_concurrency, pack, export
+
+
+def span(kind, start, end, worker="gw0", config="", name=None, main=True):
+    return {"name": name or kind, "kind": kind, "config": config, "worker": worker, "main": main,
+            "start": start, "end": end, "args": {}}
+
+
+# ── Building blocks ──────────────────────────────────────────
+def test_exclusive_times_subtract_nested_children():
+    lane = [span("test", 0, 10), span("wait", 2, 5), span("command", 3, 4), span("command", 6, 7)]
+    assert exclusive_times(lane) == {"test": 6.0, "wait": 2.0, "command": 2.0}
+
+
+def test_peak_and_mean_concurrency():
+    assert peak_concurrency([(0, 10), (5, 10)]) == (2, 1.5)
+    assert peak_concurrency([]) == (0, 0.0)
+
+
+def test_pack_moves_overlapping_spans_to_sub_lanes():
+    placed = pack([span("session", 0, 10), span("session", 5, 15), span("newSession", 0, 2)])
+    assert sorted((lane, s["start"], s["end"]) for lane, s in placed) == [(0, 0, 2), (0, 0, 10), (1, 5, 15)]
+
+
+# ── Summary ──────────────────────────────────────────────────
+def run_spans():
+    """Two slots over 10 s: gw0 busy 8 s (two tests), gw1 busy 4 s and done at 4 s."""
+    return [
+        span("setup", 0, 1, "gw0", "chrome"), span("test", 1, 5, "gw0", "chrome", "test_a"),
+        span("test", 6, 9, "gw0", "chrome", "test_b"),
+        span("session", 0, 10, "gw0", "chrome", main=False),
+        span("test", 0, 4, "gw1", "safari", "test_a"),
+        span("session", 0, 4, "gw1", "safari", main=False),
+        span("newSession", 0, 0.5, "gw1", "safari", main=False),
+    ]
+
+
+def test_utilisation_and_idle_time_per_slot():
+    summary = summarise(run_spans())
+    assert summary["wall_s"] == 10.0 and summary["slot_lanes"] == 2
+    assert summary["by_slot"]["gw0"]["busy_s"] == 8.0 and summary["by_slot"]["gw0"]["tests"] == 2
+    assert summary["by_slot"]["gw1"]["idle_s"] == 6.0
+    assert summary["utilisation"] == 0.6                           # 12 busy of 2 × 10 slot-seconds
+    assert summary["sessions"]["peak_live"] == 2 and summary["sessions"]["count"] == 2
+
+
+def test_utilisation_is_measured_against_the_configured_slots():
+    summary = summarise(run_spans(), slots=4)
+    assert summary["slots"] == 4 and summary["utilisation"] == 0.3
+    assert summary["idle_slot_s"] == 28.0
+
+
+def test_critical_path_is_the_last_slot_and_the_longest_config():
+    path = summarise(run_spans())["critical_path"]
+    assert path["slot"] == "gw0" and path["finished_at_s"] == 9.0
+    assert [t["test"] for t in path["longest_tests"]] == ["test_a", "test_b"]
+    assert (path["longest_config"], path["longest_config_s"]) == ("chrome", 8.0)
+
+
+def test_export_writes_the_trace_with_its_summary(tmp_path):
+    out     = tmp_path / "trace.json"
+    summary = export(out, run_spans())
+    trace   = json.loads(out.read_text())
+    assert trace["summary"] == summary
+    lanes = {e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "thread_name"}
+    assert lanes == {"gw0", "gw1", "chrome", "safari"}
+    assert max(e["args"]["sessions"] for e in trace["traceEvents"] if e["ph"] == "C") == 2
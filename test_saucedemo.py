@@ -0,0 +1,27 @@
+"""
+============================================================
+  test_saucedemo.py
+  Unit tests for SauceDemo's login rules
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import pytest
+
+from saucedemo import (
+    login_error, login_accepted, ERR_USERNAME_REQUIRED, ERR_PASSWORD_REQUIRED, ERR_NO_MATCH, ERR_LOCKED_OUT,
+)
+
+
+@pytest.mark.parametrize("username, password, error", [
+    ("standard_user",   "secret_sauce",  ""),
+    ("",                "secret_sauce",  ERR_USERNAME_REQUIRED),
+    ("standard_user",   "",              ERR_PASSWORD_REQUIRED),
+    ("standard_user",   "bad_password!", ERR_NO_MATCH),
+    ("' OR 1=1 --",     "' OR '1'='1",   ERR_NO_MATCH),
+    ("locked_out_user", "secret_sauce",  ERR_LOCKED_OUT),
+    ("locked_out_user", "bad_password!", ERR_NO_MATCH),       # credentials are checked before the lock
+])
+def test_login_error_matches_saucedemo(username, password, error):
+    assert login_error(username, password) == error
+    assert login_accepted(username, password) is (error == "")
@@ -0,0 +1,149 @@
+"""
+============================================================
+  test_scheduler.py
+  Unit tests for the slot ledger and the xdist claim order
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from scheduler import MatrixScheduler, PlatformQueues, SlotScheduling
+
+
+class FakeConfig:
+    def __init__(self, nodes: int, slots: int):
+        self.nodes    = nodes
+        self.bs_slots = slots
+
+    def getvalue(self, name):
+        return [f"{self.nodes}*popen"] if name == "tx" else None
+
+    def getoption(self, name):
+        return None
+
+
+class FakeNode:
+    def __init__(self, name: str):
+        self.name          = name
+        self.gateway       = SimpleNamespace(id=name)
+        self.shutting_down = False
+        self.sent          = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+def collection(platforms: dict) -> list:
+    """{"a": 3, "b": 1} → ['t.py::test_0[a]', 't.py::test_1[a]', 't.py::test_2[a]', 't.py::test_0[b]']"""
+    return [f"t.py::test_{n}[{platform}]" for platform, count in platforms.items() for n in range(count)]
+
+
+def start(nodes: int, platforms: dict, slots: int = 10):
+    sched = SlotScheduling(FakeConfig(nodes, slots))
+    items = collection(platforms)
+    workers = [FakeNode(f"gw{i}") for i in range(nodes)]
+    for node in workers:
+        sched.add_node(node)
+        sched.add_node_collection(node, items)
+    sched.schedule()
+    return sched, workers, items
+
+
+def platforms_of(sched, node) -> set:
+    return {sched.pending.platform[i] for i in node.sent}
+
+
+# ── MatrixScheduler ledger ───────────────────────────────────
+def test_ledger_enforces_global_and_per_platform_caps():
+    ledger = MatrixScheduler(slots=3, per_platform=2)
+    assert ledger.try_acquire({"id": "a"}) and ledger.try_acquire({"id": "a"})
+    assert not ledger.try_acquire({"id": "a"})
+    assert ledger.held({"id": "a"}) == 2
+    assert ledger.try_acquire({"id": "b"})
+    assert not ledger.try_acquire({"id": "c"})          # global budget spent
+    ledger.release({"id": "a"})
+    assert ledger.try_acquire({"id": "c"})
+
+
+def test_run_never_exceeds_platform_cap():
+    ledger, live, peak = MatrixScheduler(slots=4, per_platform=1), {}, {}
+
+    def work(test, config):
+        live[config["id"]] = live.get(config["id"], 0) + 1
+        peak[config["id"]] = max(peak.get(config["id"], 0), live[config["id"]])
+        live[config["id"]] -= 1
+
+    results = ledger.run([(n, {"id": p}) for n in range(5) for p in "abc"], work)
+    assert len(results) == 15 and set(peak.values()) == {1}
+
+
+def test_peak_queue_depth_counts_the_xdist_pending_list():
+    sched, _, items = start(2, {"a": 3, "b": 3})
+    assert sched.metrics()["peak_queue_depth"] == len(items)
+    sched.ledger.note_queue_depth(2)                    # a lower depth never lowers the peak
+    assert sched.ledger.metrics()["peak_queue_depth"] == len(items)
+
+
+# ── PlatformQueues ───────────────────────────────────────────
+def test_platform_queues_keep_collection_order_per_platform():
+    items  = collection({"a": 2, "b": 2})
+    queues = PlatformQueues(items, range(len(items)))
+    assert queues.platforms() == ["a", "b"] and len(queues) == 4
+    assert queues.take("a", 5) == [0, 1]
+    assert queues.platforms() == ["b"] and queues.take("b", 1) == [2]
+    queues.insert(0, 1)                                 # re-queued: front of its platform
+    queues.insert(0, 0)
+    queues.extend([2])                                  # appended: back of its platform
+    assert list(queues) == [3, 2, 0, 1]
+    assert queues.take("a", 1) == [0] and queues.take("b", 3) == [3, 2] and len(queues) == 1
+
+
+# ── SlotScheduling claim order ───────────────────────────────
+def test_each_node_claims_a_distinct_platform_first():
+    sched, workers, _ = start(3, {"a": 4, "b": 4, "c": 4})
+    assert [platforms_of(sched, node) for node in workers] == [{"a"}, {"b"}, {"c"}]
+    assert all(len(node.sent) == 2 for node in workers)
+
+
+def test_unclaimed_platforms_come_before_doubling_up():
+    sched, workers, _ = start(2, {"a": 6, "b": 2, "c": 2})
+    first, second = workers
+    # gw1 drains b, then moves to the unclaimed c rather than joining gw0 on a.
+    for index in list(second.sent):
+        sched.mark_test_complete(second, index)
+    assert platforms_of(sched, second) == {"b", "c"}
+    assert sched.node2platform[second] == "c"
+
+
+def test_nodes_double_up_only_when_every_platform_is_held():
+    sched, workers, _ = start(3, {"a": 8, "b": 2})
+    third = workers[2]
+    assert sched.node2platform[third] == "a"            # a and b both held: join a (cap 2)
+    assert sched.ledger.held({"id": "a"}) == 2
+
+
+def test_single_item_platform_does_not_strand_a_node():
+    sched, workers, _ = start(1, {"a": 1, "b": 1, "c": 1})
+    node = workers[0]
+    assert len(node.sent) == 2                          # topped up across platforms
+    for index in list(node.sent):
+        sched.mark_test_complete(node, index)
+    assert len(node.sent) == 3 and not sched.pending
+    assert node.shutting_down
+
+
+@pytest.mark.parametrize("nodes", [1, 3, 5])
+def test_every_item_is_sent_exactly_once(nodes):
+    sched, workers, items = start(nodes, {f"p{i}": 1 + i % 4 for i in range(11)})
+    while any(sched.node2pending[node] for node in workers):
+        for node in workers:
+            if sched.node2pending[node]:
+                sched.mark_test_complete(node, sched.node2pending[node][0])
+    sent = sorted(index for node in workers for index in node.sent)
+    assert sent == list(range(len(items)))
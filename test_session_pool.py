@@ -0,0 +1,124 @@
+"""
+============================================================
+  test_session_pool.py
+  Unit tests for pool slot accounting and run-order lookahead
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+from scheduler import MatrixScheduler
+from session_pool import SessionPool, upcoming_configs, needed_later
+
+
+class FakeDriver:
+    def __init__(self, config: dict):
+        self.config     = config
+        self.session_id = f"{config['id']}-session"
+        self.quit_calls = 0
+
+    def get(self, url):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute_script(self, script, *args):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class InlineTeardown:
+    """TeardownQueue stand-in: everything runs at once, in order."""
+
+    def __init__(self):
+        self.finished = []
+
+    def annotate(self, driver, data: str, level: str = "info"):
+        pass
+
+    def finish_session(self, driver, status: str, reason: str, on_done=None):
+        self.finished.append(driver.config["id"])
+        if on_done is not None:
+            on_done()
+
+
+def make_pool(slots: int, lookahead: int = 0) -> SessionPool:
+    return SessionPool(factory=FakeDriver, slots=MatrixScheduler(slots=slots), lookahead=lookahead,
+                       teardown=InlineTeardown())
+
+
+# ── Slot accounting ──────────────────────────────────────────
+def test_new_config_evicts_the_least_recently_used_idle_session():
+    pool = make_pool(slots=2)
+    a, b = pool.acquire({"id": "a"}), pool.acquire({"id": "b"})
+    pool.release(a, "t::a", passed=True)
+    pool.release(b, "t::b", passed=True)                # b used last, a is the LRU
+    pool.acquire({"id": "c"})
+    assert pool.teardown.finished == ["a"]
+    assert pool.slots.held({"id": "b"}) == 1 and pool.slots.held({"id": "a"}) == 0
+
+
+def test_idle_session_is_reused_without_a_new_slot():
+    pool = make_pool(slots=1)
+    first = pool.acquire({"id": "a"})
+    pool.release(first, "t::one", passed=True)
+    assert pool.acquire({"id": "a"}) is first
+    assert pool.stats["created"] == 1 and pool.stats["reused"] == 1
+
+
+def test_prewarm_only_uses_free_slots():
+    pool = make_pool(slots=1, lookahead=1)
+    pool.acquire({"id": "a"})
+    pool.prewarm([{"id": "b"}])                         # ledger full: nothing is evicted or queued
+    pool.close()
+    assert pool.stats["prewarmed"] == 0
+
+
+def test_prewarmed_session_is_handed_out_clean():
+    pool = make_pool(slots=2, lookahead=1)
+    pool.acquire({"id": "a"})
+    pool.prewarm([{"id": "b"}])
+    session = pool.acquire({"id": "b"})
+    assert session.uses == 1
+    assert pool.stats["created"] == 2 and pool.stats["prewarmed"] == 1 and pool.stats["reused"] == 0
+
+
+def test_stats_add_up_under_concurrent_borrowers():
+    pool = make_pool(slots=8)
+
+    def borrow(n):
+        for _ in range(50):
+            session = pool.acquire({"id": f"c{n % 4}"})
+            pool.release(session, "t::x", passed=True)
+
+    with ThreadPoolExecutor(max_workers=8) as threads:
+        list(threads.map(borrow, range(8)))
+    assert pool.stats["created"] + pool.stats["reused"] == 8 * 50
+
+
+# ── Run-order lookahead ──────────────────────────────────────
+def item(config_id):
+    return SimpleNamespace(config_id=config_id)
+
+
+def config_for(it):
+    return {"id": it.config_id} if it.config_id else None
+
+
+def test_upcoming_configs_skips_the_current_config_and_duplicates():
+    items = [item("a"), item("a"), item(None), item("b"), item("a"), item("c"), item("b")]
+    assert upcoming_configs(items, items[0], 2, config_for) == [{"id": "b"}, {"id": "c"}]
+    assert upcoming_configs(items, items[5], 2, config_for) == [{"id": "b"}]
+    assert upcoming_configs(items, items[0], 0, config_for) == []
+
+
+def test_needed_later_looks_only_after_the_current_item():
+    items = [item("a"), item("b"), item("a")]
+    assert needed_later(items, items[0], config_for)
+    assert not needed_later(items, items[1], config_for)
+    assert not needed_later(items, items[2], config_for)
@@ -0,0 +1,61 @@
+"""
+============================================================
+  test_sharding.py
+  Unit tests for --shard parsing and duration-balanced partitions
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import pytest
+
+from durations import DurationModel
+from sharding import parse_shard, shard_slots, partition
+
+
+def loads(shards: dict, model: DurationModel, total: int) -> list:
+    totals = [0.0] * total
+    for nodeid, shard in shards.items():
+        totals[shard - 1] += model.estimate(nodeid)
+    return totals
+
+
+# ── --shard i/N ──────────────────────────────────────────────
+def test_parse_shard_accepts_i_of_n():
+    assert parse_shard("2/4") == (2, 4)
+
+
+@pytest.mark.parametrize("text", ["2", "a/4", "0/4", "5/4"])
+def test_parse_shard_rejects_malformed_or_out_of_range(text):
+    with pytest.raises(ValueError, match="--shard"):
+        parse_shard(text)
+
+
+def test_slots_are_split_with_the_remainder_on_the_first_shards():
+    assert [shard_slots(5, index, 3) for index in (1, 2, 3)] == [2, 2, 1]
+    assert shard_slots(2, 3, 3) == 1                     # every shard keeps at least one slot
+
+
+# ── partition() ──────────────────────────────────────────────
+def test_every_nodeid_lands_on_exactly_one_shard():
+    ids    = [f"t::test_{n}[{cfg}]" for n in range(4) for cfg in ("a", "b", "c")]
+    shards = partition(ids, 3, DurationModel())
+    assert sorted(shards) == sorted(ids) and set(shards.values()) == {1, 2, 3}
+
+
+def test_config_groups_stay_together_when_they_fit():
+    model  = DurationModel({"t::x[a]": 3.0, "t::y[a]": 3.0, "t::x[b]": 4.0, "t::y[b]": 2.0})
+    shards = partition(list(model.by_nodeid), 2, model)
+    assert shards["t::x[a]"] == shards["t::y[a]"] and shards["t::x[b]"] == shards["t::y[b]"]
+    assert loads(shards, model, 2) == [6.0, 6.0]
+
+
+def test_a_group_longer_than_a_shard_is_split_by_test():
+    model  = DurationModel({"t::x[a]": 5.0, "t::y[a]": 5.0, "t::z[a]": 4.0, "t::x[b]": 2.0})
+    shards = partition(list(model.by_nodeid), 2, model)
+    assert shards["t::x[a]"] != shards["t::y[a]"]
+    assert sorted(loads(shards, model, 2)) == [7.0, 9.0]
+
+
+def test_partition_is_deterministic():
+    ids = [f"t::test_{n}[{cfg}]" for n in range(5) for cfg in ("a", "b")]
+    assert partition(ids, 2, DurationModel()) == partition(list(reversed(ids)), 2, DurationModel())
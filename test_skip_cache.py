@@ -0,0 +1,67 @@
+"""
+============================================================
+  test_skip_cache.py
+  Unit tests for the skip cache store and suite fingerprint
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+from pathlib import Path
+
+from skip_cache import SkipCache, harness_modules
+
+TEST_MODULE = Path(__file__).resolve().parent / "test_crossbrowser_login.py"
+
+
+def age(cache: SkipCache, nodeid: str, seconds: float):
+    """Pretend the pass of `nodeid` was recorded `seconds` earlier."""
+    cache.db.execute("UPDATE passes SET passed = passed - ? WHERE nodeid = ?", (seconds, nodeid))
+
+
+# ── SkipCache ────────────────────────────────────────────────
+def test_pass_is_a_hit_until_the_ttl_runs_out(tmp_path):
+    cache = SkipCache(str(tmp_path / "skip.db"), ttl_hours=1)
+    cache.record("t::a[x]", "fp1", passed=True)
+    age(cache, "t::a[x]", 3500)
+    assert cache.hit("t::a[x]", "fp1")
+    assert not cache.hit("t::a[x]", "fp2")              # a changed fingerprint never hits
+    age(cache, "t::a[x]", 200)
+    assert not cache.hit("t::a[x]", "fp1")
+    cache.close()
+
+
+def test_failure_evicts_every_fingerprint_of_the_test(tmp_path):
+    cache = SkipCache(str(tmp_path / "skip.db"), ttl_hours=1)
+    cache.record("t::a[x]", "fp1", passed=True)
+    cache.record("t::a[x]", "fp2", passed=True)
+    cache.record("t::b[x]", "fp1", passed=True)
+    cache.record("t::a[x]", "fp3", passed=False)
+    assert not cache.hit("t::a[x]", "fp1") and not cache.hit("t::a[x]", "fp2")
+    assert cache.hit("t::b[x]", "fp1")
+    cache.close()
+
+
+def test_prune_drops_only_expired_entries(tmp_path):
+    cache = SkipCache(str(tmp_path / "skip.db"), ttl_hours=1)
+    cache.record("t::old[x]", "fp", passed=True)
+    cache.record("t::new[x]", "fp", passed=True)
+    age(cache, "t::old[x]", 3700)
+    cache.prune()
+    assert [row[0] for row in cache.db.execute("SELECT nodeid FROM passes")] == ["t::new[x]"]
+    cache.close()
+
+
+# ── Suite fingerprint inputs ─────────────────────────────────
+def test_harness_modules_cover_driver_creation_hooks_and_teardown():
+    names = {path.name for path in harness_modules(TEST_MODULE)}
+    assert {"browserstack_config.py", "conftest_bs.py", "teardown.py", "local_grid.py",
+            "login_page.py", "session_pool.py"} <= names
+    assert TEST_MODULE.name not in names
+
+
+def test_transitive_local_imports_are_followed(tmp_path):
+    (tmp_path / "test_mod.py").write_text("from helper import x\nimport os\n")
+    (tmp_path / "helper.py").write_text("def x():\n    import deep\n")
+    (tmp_path / "deep.py").write_text("")
+    (tmp_path / "unused.py").write_text("")
+    assert [p.name for p in harness_modules(tmp_path / "test_mod.py")] == ["deep.py", "helper.py"]
@@ -0,0 +1,119 @@
+"""
+============================================================
+  test_teardown.py
+  Unit tests for background teardown and batched statuses
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import json
+from types import SimpleNamespace
+
+from teardown import TeardownQueue
+
+
+class FakeDriver:
+    """Records executor commands and quits, in order."""
+
+    def __init__(self, session_id, log):
+        self.session_id = session_id
+        self.log = log
+
+    def execute_script(self, script):
+        prefix, _, payload = script.partition(": ")
+        assert prefix == "browserstack_executor"
+        self.log.append((self.session_id, json.loads(payload)))
+
+    def quit(self):
+        self.log.append((self.session_id, "quit"))
+
+
+class FakeHttp:
+    """Stands in for the pooled urllib3 client; answers `status` to every PUT."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.puts   = {}
+
+    def request(self, method, url, body=None, headers=None, retries=None):
+        assert method == "PUT" and headers["Content-Type"] == "application/json"
+        self.puts[url] = json.loads(body)
+        return SimpleNamespace(status=self.status, data=b"nope")
+
+    def clear(self):
+        pass
+
+
+def queue(mode, tmp_path=None):
+    return TeardownQueue(workers=2, mode=mode, api_url="https://api.test/", username="u", access_key="k",
+                         status_file=str(tmp_path / "statuses.jsonl") if tmp_path else "unused")
+
+
+# ── executor mode ────────────────────────────────────────────
+def test_executor_mode_sets_the_status_then_quits():
+    log, done = [], []
+    teardown  = queue("executor")
+    teardown.annotate(FakeDriver("s1", log), "step 1")
+    teardown.finish_session(FakeDriver("s1", log), "failed", 'say "x"\n' + "r" * 300,
+                            on_done=lambda: done.append("s1"))
+    teardown.close()
+    annotate, status, quit_ = log
+    assert annotate[1] == {"action": "annotate", "arguments": {"data": "step 1", "level": "info"}}
+    assert status[1]["action"] == "setSessionStatus"
+    assert status[1]["arguments"]["status"] == "failed"
+    assert len(status[1]["arguments"]["reason"]) == 255
+    assert quit_ == ("s1", "quit") and done == ["s1"]
+    assert teardown.errors == []
+
+
+def test_errors_are_collected_and_on_done_still_runs():
+    class Broken(FakeDriver):
+        def quit(self):
+            raise RuntimeError("gone")
+    done     = []
+    teardown = queue("executor")
+    teardown.finish_session(Broken("s1", []), "passed", "", on_done=lambda: done.append(1))
+    teardown.close()
+    assert done == [1]
+    assert [(what, str(exc)) for what, exc in teardown.errors] == [("finish s1", "gone")]
+
+
+# ── rest mode ────────────────────────────────────────────────
+def test_rest_mode_quits_now_and_puts_every_status_at_flush():
+    log      = []
+    teardown = queue("rest")
+    teardown._http = http = FakeHttp()
+    teardown.annotate(FakeDriver("s1", log), "skipped in batched modes")
+    teardown.finish_session(FakeDriver("s1", log), "passed", "ok")
+    teardown.finish_session(FakeDriver("s2", log), "failed", "boom")
+    teardown.flush()
+    assert sorted(log) == [("s1", "quit"), ("s2", "quit")]
+    assert http.puts == {
+        "https://api.test/automate/sessions/s1.json": {"status": "passed", "reason": "ok"},
+        "https://api.test/automate/sessions/s2.json": {"status": "failed", "reason": "boom"},
+    }
+    http.puts.clear()
+    teardown.flush()                                     # already sent: nothing twice
+    assert http.puts == {}
+    teardown.close()
+
+
+def test_rest_mode_records_http_errors():
+    teardown = queue("rest")
+    teardown._http = FakeHttp(status=500)
+    teardown.finish_session(FakeDriver("s1", []), "passed", "ok")
+    teardown.close()
+    assert [what for what, _ in teardown.errors] == ["status s1"]
+
+
+# ── defer mode ───────────────────────────────────────────────
+def test_defer_mode_appends_statuses_to_the_status_file(tmp_path):
+    for sid in ("s1", "s2"):                             # two workers sharing the file
+        teardown = queue("defer", tmp_path)
+        teardown.finish_session(FakeDriver(sid, []), "passed", f"reason {sid}")
+        teardown.close()
+    lines = (tmp_path / "statuses.jsonl").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"session": "s1", "status": "passed", "reason": "reason s1"},
+        {"session": "s2", "status": "passed", "reason": "reason s2"},
+    ]
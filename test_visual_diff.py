@@ -0,0 +1,82 @@
+"""
+============================================================
+  test_visual_diff.py
+  Unit tests for the YIQ screenshot diff and baseline handling
+  PRODIGY INFOTECH — Task-04
+============================================================
+"""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+from browserstack_config import BROWSER_MATRIX
+from visual_diff import STATUS_BAR_PX, perceptual_delta, compare, ignore_regions, check_capture
+
+MOBILE  = next(cfg["id"] for cfg in BROWSER_MATRIX if cfg.get("real_mobile"))
+DESKTOP = next(cfg["id"] for cfg in BROWSER_MATRIX if not cfg.get("real_mobile"))
+
+
+def canvas(height=60, width=80, colour=(255, 255, 255)) -> np.ndarray:
+    return np.full((height, width, 3), colour, dtype=np.uint8)
+
+
+def png(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+# ── Perceptual distance ──────────────────────────────────────
+def test_yiq_delta_is_normalised_by_the_pixelmatch_maximum():
+    pixels = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0]], dtype=np.uint8)
+    delta  = perceptual_delta(pixels[[0, 0, 0]], pixels[[0, 1, 2]])
+    assert delta[0] == 0.0
+    assert abs(delta[1] - 0.5053 * 255 ** 2 / 35215) < 1e-3       # luma only: ~0.933
+    assert 0.0 < delta[2] < delta[1]
+
+
+# ── compare() ────────────────────────────────────────────────
+def test_slight_shade_change_stays_under_the_threshold():
+    baseline, actual = canvas(), canvas()
+    actual[10:20, 10:20] = (250, 250, 250)
+    result = compare(actual, baseline, DESKTOP, "login", threshold=0.1, max_diff=0.0, regions=[])
+    assert result.passed and result.differing == 0
+
+
+def test_differing_pixels_are_counted_and_fail_above_max_diff():
+    baseline, actual = canvas(), canvas()
+    actual[0:2, 0:5] = (0, 0, 0)
+    result = compare(actual, baseline, DESKTOP, "login", threshold=0.1, max_diff=0.001, regions=[])
+    assert not result.passed and result.differing == 10 and result.compared == 60 * 80
+    assert "x 0-4, y 0-1" in result.reason
+
+
+def test_ignored_regions_are_not_compared():
+    baseline, actual = canvas(), canvas()
+    actual[0:10, :] = (0, 0, 0)
+    result = compare(actual, baseline, DESKTOP, "login", max_diff=0.0, regions=[(0, 0, 80, 10)])
+    assert result.passed and result.compared == 50 * 80
+
+
+def test_size_mismatch_fails():
+    result = compare(canvas(width=81), canvas(), DESKTOP, "login", regions=[])
+    assert not result.passed and result.reason.startswith("size 81x60")
+
+
+# ── Ignore regions ───────────────────────────────────────────
+def test_status_bar_scales_with_device_pixel_ratio(tmp_path):
+    assert ignore_regions(MOBILE, "login", tmp_path) == [(0, 0, 10 ** 6, STATUS_BAR_PX)]
+    assert ignore_regions(MOBILE, "login", tmp_path, pixel_ratio=3) == [(0, 0, 10 ** 6, 3 * STATUS_BAR_PX)]
+    assert ignore_regions(DESKTOP, "login", tmp_path, pixel_ratio=2) == []
+
+
+# ── check_capture() ──────────────────────────────────────────
+def test_missing_baseline_is_recorded_not_passed(tmp_path):
+    args   = dict(baselines=str(tmp_path / "base"), output=str(tmp_path / "out"))
+    first  = check_capture(png(canvas()), DESKTOP, "login", **args)
+    assert first.recorded and first.compared == 0
+    assert (tmp_path / "base" / DESKTOP / "login.png").exists()
+    second = check_capture(png(canvas()), DESKTOP, "login", **args)
+    assert not second.recorded and second.passed and second.compared == 60 * 80
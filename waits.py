@@ -0,0 +1,163 @@
+"""
+============================================================
+  waits.py
+  Adaptive explicit-wait engine (replaces the implicit wait)
+  PRODIGY INFOTECH — Task-04
+============================================================
+
+A global implicit wait makes every *negative* lookup (no error
+shown, element absent) burn the full timeout. Here each wait
+names the condition(s) it is waiting for instead:
+
+  until(driver, "logout link", cond, timeout)
+  until_any(driver, {"dashboard": ..., "error": ...}, timeout)
+      → whichever condition holds first wins
+
+The polling interval is tuned per browser config from the
+observed round-trip time of the condition checks themselves
+(no point polling a 600 ms real device every 50 ms), and every
+resolved wait is recorded so slow conditions show up per config.
+"""
+
+import time
+import threading
+from weakref import WeakKeyDictionary
+
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, TimeoutException,
+)
+
+from run_timeline import TIMELINE
+
+MIN_POLL      = 0.05    # seconds
+MAX_POLL      = 1.0
+INITIAL_POLL  = 0.25
+LATENCY_ALPHA = 0.3     # EWMA weight of the newest round-trip sample
+
+IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+
+class WaitResult:
+    """Which condition won (None on timeout), its value, and how long it took."""
+
+    def __init__(self, outcome, value, elapsed: float):
+        self.outcome = outcome
+        self.value   = value
+        self.elapsed = elapsed
+
+    def __bool__(self):
+        return self.outcome is not None
+
+    def __repr__(self):
+        return f"WaitResult(outcome={self.outcome!r}, elapsed={self.elapsed:.3f}s)"
+
+
+class WaitEngine:
+    """Explicit waits for one browser config, with latency-tuned polling."""
+
+    def __init__(self, config_id: str):
+        self.config_id = config_id
+        self.latency   = None     # EWMA of one condition check, seconds
+        self.timings   = {}       # condition label → [elapsed, ...]
+        self._lock     = threading.Lock()
+
+    @property
+    def poll_interval(self) -> float:
+        if self.latency is None:
+            return INITIAL_POLL
+        return min(MAX_POLL, max(MIN_POLL, self.latency))
+
+    def observe(self, seconds: float):
+        with self._lock:
+            if self.latency is None:
+                self.latency = seconds
+            else:
+                self.latency += LATENCY_ALPHA * (seconds - self.latency)
+
+    def record(self, label: str, elapsed: float):
+        with self._lock:
+            self.timings.setdefault(label, []).append(elapsed)
+
+    def until_any(self, driver, conditions: dict, timeout: float) -> WaitResult:
+        """
+        Poll every condition (callables taking the driver) until one returns
+        a truthy value or `timeout` expires. Never raises on timeout.
+        """
+        with TIMELINE.timed(" | ".join(conditions), "wait", self.config_id):
+            return self._poll(driver, conditions, timeout)
+
+    def _poll(self, driver, conditions: dict, timeout: float) -> WaitResult:
+        start    = time.monotonic()
+        deadline = start + timeout
+        label    = " | ".join(conditions)
+        while True:
+            for name, condition in conditions.items():
+                check_start = time.monotonic()
+                try:
+                    value = condition(driver)
+                except IGNORED_EXCEPTIONS:
+                    value = None
+                self.observe(time.monotonic() - check_start)
+                if value:
+                    elapsed = time.monotonic() - start
+                    self.record(label if len(conditions) == 1 else f"{label} → {name}", elapsed)
+                    return WaitResult(name, value, elapsed)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                elapsed = time.monotonic() - start
+                self.record(f"{label} → timeout", elapsed)
+                return WaitResult(None, None, elapsed)
+            time.sleep(min(self.poll_interval, remaining))
+
+    def until(self, driver, name: str, condition, timeout: float):
+        """Single-condition wait; returns the condition's value or raises TimeoutException."""
+        result = self.until_any(driver, {name: condition}, timeout)
+        if not result:
+            raise TimeoutException(f"[{self.config_id}] Timed out after {timeout}s waiting for {name}")
+        return result.value
+
+
+# ─────────────────────────────────────────────────────────────
+#  ENGINE REGISTRY — one engine per config, bound to its drivers
+# ─────────────────────────────────────────────────────────────
+_ENGINES = {}
+_BOUND   = WeakKeyDictionary()
+_LOCK    = threading.Lock()
+
+
+def engine_for(config: dict) -> WaitEngine:
+    """Engines live per config id, so learned latency survives session recycling."""
+    with _LOCK:
+        if config["id"] not in _ENGINES:
+            _ENGINES[config["id"]] = WaitEngine(config["id"])
+        return _ENGINES[config["id"]]
+
+
+def bind_engine(driver, config: dict) -> WaitEngine:
+    engine = engine_for(config)
+    _BOUND[driver] = engine
+    return engine
+
+
+def wait_engine(driver) -> WaitEngine:
+    """The engine bound to this driver by create_driver (a default one otherwise)."""
+    engine = _BOUND.get(driver)
+    if engine is None:
+        engine = bind_engine(driver, {"id": "unbound"})
+    return engine
+
+
+def wait_stats() -> dict:
+    """{config id: {condition label: {count, mean, max}}} for every recorded wait."""
+    stats = {}
+    with _LOCK:
+        engines = list(_ENGINES.values())
+    for engine in engines:
+        with engine._lock:
+            stats[engine.config_id] = {
+                label: {"count": len(samples),
+                        "mean" : round(sum(samples) / len(samples), 3),
+                        "max"  : round(max(samples), 3)}
+                for label, samples in engine.timings.items()
+            }
+    return stats